@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark indexed fuzzy matching against the linear SequenceMatcher scan.
+
+Replays the two database lookups used while scanning a book:
+  - word correction  (ContinuousScanner._fuzzy_correct_with_databases)
+  - author detection (BookCoverParser._matches_author_database)
+on the bundled author/publisher/imprint databases, and checks that the
+index returns the same matches as the full scan.
+
+Usage:
+    python3 benchmark_fuzzy.py              # 200 queries
+    python3 benchmark_fuzzy.py --queries 50 # fewer queries (linear scan is slow)
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from difflib import SequenceMatcher
+
+# Databases are loaded relative to the script directory
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, '.')
+
+from scan_books import BookCoverParser  # noqa: E402
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+# Typical OCR confusions (letter -> misread)
+OCR_NOISE = {
+    'O': '0Q', 'I': '1L|', 'S': '5', 'T': '7', 'B': '8', 'A': '4', 'C': 'E',
+    'E': 'C', 'N': 'M', 'M': 'N', 'R': 'P', 'D': 'O',
+}
+
+
+def corrupt(word, rng):
+    """Apply one OCR-style substitution or deletion"""
+    positions = [i for i, c in enumerate(word) if c in OCR_NOISE]
+    if positions and rng.random() < 0.8:
+        i = rng.choice(positions)
+        return word[:i] + rng.choice(OCR_NOISE[word[i]]) + word[i + 1:]
+    i = rng.randrange(len(word))
+    return word[:i] + word[i + 1:]
+
+
+def build_queries(parser, count, seed=0):
+    """Mix of exact, corrupted and unrelated words, like real OCR boxes"""
+    rng = random.Random(seed)
+    surnames = sorted(w for a in parser.known_authors for w in a.split() if len(w) >= 5)
+    publishers = sorted(parser.known_publishers)
+    imprints = sorted(parser.publisher_imprints)
+    noise_words = ['UNBEARHLY', 'BCAURLFUL', 'DOORS', 'JANUARY', 'NETTUNO', 'MOSJHO',
+                   'BESTSELLERS', 'ROMANZO', 'EDIZIONE', 'THOUSAND', 'TEN', 'OLMRQ']
+
+    queries = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            queries.append(corrupt(rng.choice(surnames), rng))
+        elif kind == 1:
+            queries.append(corrupt(rng.choice(publishers + imprints), rng))
+        elif kind == 2:
+            queries.append(rng.choice(noise_words))
+        else:
+            queries.append(rng.choice(surnames))
+    return queries
+
+
+# ============================================================================
+# LINEAR REFERENCE (previous implementation)
+# ============================================================================
+
+def linear_correct(parser, word):
+    """Best match over imprints, authors, publishers by full scan"""
+    best_match, best_ratio = None, 0.80
+    for entries in (parser.publisher_imprints.keys(), parser.known_authors,
+                    parser.known_publishers):
+        for entry in sorted(entries, key=lambda e: (len(e), e)):
+            ratio = SequenceMatcher(None, word, entry).ratio()
+            if ratio > best_ratio:
+                best_match, best_ratio = entry, ratio
+    return best_match, best_ratio
+
+
+def linear_author_match(parser, text):
+    """Fuzzy author detection by full scan"""
+    for known in parser.known_authors:
+        if len(known) < 4 or abs(len(text) - len(known)) > 2:
+            continue
+        if SequenceMatcher(None, text, known).ratio() > 0.85:
+            return True
+    return False
+
+
+# ============================================================================
+# INDEXED
+# ============================================================================
+
+def indexed_correct(parser, word):
+    best_match, best_ratio = None, 0.80
+    for index in (parser.imprint_index, parser.author_index, parser.publisher_index):
+        match, ratio = index.best_match(word, best_ratio)
+        if match:
+            best_match, best_ratio = match, ratio
+    return best_match, best_ratio
+
+
+def indexed_author_match(parser, text):
+    return parser.author_index.has_match(text, 0.85, max_length_diff=2, min_length=4)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def bench(fn, parser, queries):
+    results = []
+    start = time.perf_counter()
+    for q in queries:
+        results.append(fn(parser, q))
+    elapsed = time.perf_counter() - start
+    return results, elapsed / len(queries) * 1000
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="Benchmark fuzzy database matching")
+    argparser.add_argument('--queries', type=int, default=200, help="Number of queries")
+    argparser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = argparser.parse_args()
+
+    print("📚 Loading databases and building indexes...", end='', flush=True)
+    start = time.perf_counter()
+    parser = BookCoverParser()
+    print(f" ✅ ({time.perf_counter() - start:.2f}s)")
+    print(f"   Authors: {len(parser.known_authors)}, publishers: {len(parser.known_publishers)}, "
+          f"imprints: {len(parser.publisher_imprints)}")
+
+    queries = build_queries(parser, args.queries, args.seed)
+
+    print("\n" + "=" * 70)
+    print("   🔍 WORD CORRECTION (imprints + authors + publishers, ratio > 0.80)")
+    print("=" * 70)
+    linear, linear_ms = bench(linear_correct, parser, queries)
+    indexed, indexed_ms = bench(indexed_correct, parser, queries)
+    # Ties may pick a different entry with the same ratio
+    mismatches = [(q, a, b) for q, a, b in zip(queries, linear, indexed)
+                  if abs(a[1] - b[1]) > 1e-9]
+    failed = bool(mismatches)
+    print(f"Linear scan:   {linear_ms:8.3f} ms/query")
+    print(f"Indexed:       {indexed_ms:8.3f} ms/query  ({linear_ms / indexed_ms:.0f}x faster)")
+    print(f"Agreement:     {len(queries) - len(mismatches)}/{len(queries)}")
+    for q, a, b in mismatches[:5]:
+        print(f"  ❌ {q}: linear={a} indexed={b}")
+
+    print("\n" + "=" * 70)
+    print("   👤 AUTHOR DETECTION (len ±2, ratio > 0.85)")
+    print("=" * 70)
+    linear, linear_ms = bench(linear_author_match, parser, queries)
+    indexed, indexed_ms = bench(indexed_author_match, parser, queries)
+    mismatches = [q for q, a, b in zip(queries, linear, indexed) if a != b]
+    failed = failed or bool(mismatches)
+    print(f"Linear scan:   {linear_ms:8.3f} ms/query")
+    print(f"Indexed:       {indexed_ms:8.3f} ms/query  ({linear_ms / indexed_ms:.0f}x faster)")
+    print(f"Agreement:     {len(queries) - len(mismatches)}/{len(queries)}")
+    for q in mismatches[:5]:
+        print(f"  ❌ {q}")
+    print("=" * 70)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled OCR text normalizer against the previous regex loops.
+
+Replays the two post-processing calls made for every book:
+  - word corrections on each raw OCR box (OCRPostProcessor._correct_words)
+  - full correction of title, author and publisher (OCRPostProcessor.correct_text)
+on texts built from the bundled databases, accented words and typical OCR
+misreads, and compares the results with the previous implementation. The
+previous correction tables are kept here verbatim, to check that
+ocr_corrections.txt reproduces them.
+
+The compiled normalizer also fixes words with several misread
+characters (5T0NE → STONE), several misread symbols (X|Y|Z) or a symbol next to
+an accented capital (N1ÑO → NIÑO), which the previous per-character regexes
+left alone; those show up as differences. A difference where the compiled
+normalizer leaves a misread symbol the regexes replaced, or any change to an
+ordinal (10TH, 101ST), is a regression.
+
+Usage:
+    python3 benchmark_normalizer.py              # 2000 texts
+    python3 benchmark_normalizer.py --texts 500
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+# Databases are loaded relative to the script directory
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, '.')
+
+from scan_books import BookCoverParser, OCRPostProcessor  # noqa: E402
+
+
+# ============================================================================
+# LEGACY REFERENCE (previous implementation)
+# ============================================================================
+
+class LegacyPostProcessor:
+    """OCRPostProcessor text correction before the compiled normalizer"""
+
+    CHAR_CORRECTIONS = {
+        '0': 'O', '1': 'I', '5': 'S', '7': 'T', '8': 'B',
+        '|': 'I', '!': 'I', '@': 'A', '©': 'C', '®': 'R',
+    }
+
+    WORD_CORRECTIONS = {
+        'OLMRQ': 'OLIMPO',
+        'OLMDQ': 'OLIMPO',
+        'OLMTQ': 'OLIMPO',
+        'OLMQ': 'OLIMPO',
+        'OL1MPO': 'OLIMPO',
+        'OLMPO': 'OLIMPO',
+        'EROL': 'EROI',
+        'EROA': 'EROI',
+        'EROX': 'EROI',
+        'ER0I': 'EROI',
+        'GLMIQ': 'GLI',
+        'GL1': 'GLI',
+        'R10RDAN': 'RIORDAN',
+        'R1ORDAN': 'RIORDAN',
+        'MONDADOR1': 'MONDADORI',
+        'MONOADORI': 'MONDADORI',
+        'PENGU1N': 'PENGUIN',
+        'BLSTSELLERS': '',
+        'BESTSELLERS': '',
+        'DELL': "DELL'",
+    }
+
+    def correct_text(self, text, text_type='title'):
+        if not text or text == '[not identified]':
+            return text
+        corrected = self._correct_words(text)
+        corrected = self._correct_characters(corrected)
+        corrected = self._apply_patterns(corrected, text_type)
+        corrected = self._normalize_capitalization(corrected, text_type)
+        return corrected
+
+    def _correct_words(self, text):
+        corrected_words = []
+        for word in text.split():
+            word_upper = word.upper()
+            if word_upper in self.WORD_CORRECTIONS:
+                replacement = self.WORD_CORRECTIONS[word_upper]
+                if replacement:
+                    corrected_words.append(replacement)
+            else:
+                corrected_words.append(word)
+        return ' '.join(corrected_words)
+
+    def _correct_characters(self, text):
+        corrected = text
+        for wrong, right in self.CHAR_CORRECTIONS.items():
+            pattern = r'\b([A-Z]*' + re.escape(wrong) + r'[A-Z]*)\b'
+
+            def replace_in_caps(match):
+                word = match.group(1)
+                letter_count = sum(c.isalpha() for c in word)
+                if letter_count > len(word) * 0.5:
+                    return word.replace(wrong, right)
+                return word
+
+            corrected = re.sub(pattern, replace_in_caps, corrected)
+        return corrected
+
+    def _apply_patterns(self, text, text_type):
+        if text_type == 'title':
+            text = re.sub(r'\s+OF\s+', ' OF ', text, flags=re.IGNORECASE)
+            text = re.sub(r'\s+THE\s+', ' THE ', text, flags=re.IGNORECASE)
+            text = re.sub(r'\s+AND\s+', ' AND ', text, flags=re.IGNORECASE)
+            text = re.sub(r'\s+', ' ', text).strip()
+        elif text_type == 'author':
+            text = re.sub(r'\s+', ' ', text).strip()
+        return text
+
+    def _normalize_capitalization(self, text, text_type):
+        if text_type == 'title' and text.isupper():
+            words = text.split()
+            lowercase_words = {'of', 'the', 'and', 'in', 'on', 'at', 'to', 'a', 'an'}
+            title_cased = []
+            for i, word in enumerate(words):
+                if i == 0 or word.lower() not in lowercase_words:
+                    title_cased.append(word.capitalize())
+                else:
+                    title_cased.append(word.lower())
+            return ' '.join(title_cased)
+        elif text_type == 'author' and (text.isupper() or text.islower()):
+            return text.title()
+        elif text_type == 'publisher' and text.islower():
+            return text.upper()
+        return text
+
+
+# ============================================================================
+# TEXTS
+# ============================================================================
+
+# Typical OCR misreads (letter -> character read instead)
+MISREADS = {'O': '0', 'I': '1|!', 'S': '5', 'T': '7', 'B': '8', 'A': '@', 'C': '©', 'R': '®'}
+
+TITLE_WORDS = ['THE', 'TEN', 'THOUSAND', 'DOORS', 'OF', 'JANUARY', 'AND', 'LIGHTNING',
+               'THIEF', 'HISTORY', 'IN', 'A', 'NIGHT', 'Il', 'nome', 'della', 'rosa',
+               'HELP!', '1984', 'Fahrenheit', '451', 'OLMRQ', 'BESTSELLERS', 'DELL',
+               'CITTÀ', 'PERCHÉ', 'ÉDITIONS', 'ARAGONÈS', 'GONZÁLEZ', 'FERNÁNDEZ',
+               'NIÑO', 'Città', 'perché', "L'ÉTÉ", 'COSÌ', 'PIÙ',
+               '10TH', '101ST', '50TH', '21ST', '2ND', '3RD', '21', 'ANNIVERSARY']
+
+ORDINAL_RE = re.compile(r'\d+(?:ST|ND|RD|TH)', re.IGNORECASE)
+
+
+def misread(word, rng):
+    """Replace one letter with a typical OCR misread"""
+    positions = [i for i, c in enumerate(word) if c in MISREADS]
+    if not positions:
+        return word
+    i = rng.choice(positions)
+    return word[:i] + rng.choice(MISREADS[word[i]]) + word[i + 1:]
+
+
+def build_texts(parser, count, seed=0):
+    """(text, field) pairs like the ones parsed from real covers"""
+    rng = random.Random(seed)
+    authors = sorted(parser.known_authors)
+    publishers = sorted(parser.known_publishers)
+
+    texts = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            words = [rng.choice(TITLE_WORDS) for _ in range(rng.randint(1, 6))]
+            field = 'title'
+        elif kind == 1:
+            words = rng.choice(authors).split()
+            field = 'author'
+        else:
+            words = rng.choice(publishers).split()
+            field = 'publisher'
+        # One misread, sometimes several in the same word
+        for _ in range(rng.choice((0, 0, 0, 1, 1, 2, 3))):
+            j = rng.randrange(len(words))
+            words[j] = misread(words[j], rng)
+        text = '  '.join(words) if rng.random() < 0.1 else ' '.join(words)
+        if rng.random() < 0.3:
+            text = text.lower() if rng.random() < 0.5 else text.title()
+        texts.append((text, field))
+    return texts
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def misread_symbols(text):
+    """Number of misread symbols left in a corrected text"""
+    return sum(text.count(c) for c in '|!@©®')
+
+
+def changed_ordinals(text, corrected):
+    """Ordinals of text that the correction altered (other than their case)"""
+    kept = corrected.upper().split()
+    return [w for w in text.split() if ORDINAL_RE.fullmatch(w) and w.upper() not in kept]
+
+
+def bench(fn, texts, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [fn(text, field) for text, field in texts]
+    elapsed = time.perf_counter() - start
+    return results, elapsed / (rounds * len(texts)) * 1e6
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="Benchmark OCR text normalization")
+    argparser.add_argument('--texts', type=int, default=2000, help="Number of texts")
+    argparser.add_argument('--rounds', type=int, default=5, help="Timed rounds")
+    argparser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = argparser.parse_args()
+
+    print("📚 Loading databases and corrections...", end='', flush=True)
+    parser = BookCoverParser()
+    compiled = OCRPostProcessor()
+    legacy = LegacyPostProcessor()
+    print(" ✅")
+    texts = build_texts(parser, args.texts, args.seed)
+
+    failed = False
+    for name, old_table, new_table in (
+        ('Word', legacy.WORD_CORRECTIONS, compiled.normalizer.words),
+        ('Character', legacy.CHAR_CORRECTIONS, compiled.normalizer.characters),
+    ):
+        if old_table != new_table:
+            failed = True
+            print(f"❌ {name} corrections in ocr_corrections.txt differ from the previous table")
+
+    print("\n" + "=" * 70)
+    print("   🔤 WORD CORRECTIONS (every raw OCR box)")
+    print("=" * 70)
+    old, old_us = bench(lambda t, f: legacy._correct_words(t), texts, args.rounds)
+    new, new_us = bench(lambda t, f: compiled._correct_words(t), texts, args.rounds)
+    mismatches = [(t, a, b) for (t, _), a, b in zip(texts, old, new) if a != b]
+    failed |= bool(mismatches)
+    print(f"Regex loops:   {old_us:8.2f} us/text")
+    print(f"Compiled:      {new_us:8.2f} us/text  ({old_us / new_us:.1f}x faster)")
+    print(f"Agreement:     {len(texts) - len(mismatches)}/{len(texts)}")
+    for t, a, b in mismatches[:5]:
+        print(f"  ❌ {t!r}: regex={a!r} compiled={b!r}")
+
+    print("\n" + "=" * 70)
+    print("   ✏️  FULL CORRECTION (title, author, publisher)")
+    print("=" * 70)
+    old, old_us = bench(legacy.correct_text, texts, args.rounds)
+    new, new_us = bench(compiled.correct_text, texts, args.rounds)
+    differences = [(t, a, b) for (t, _), a, b in zip(texts, old, new) if a != b]
+    regressions = [(t, a, b) for (t, _), a, b in zip(texts, old, new)
+                   if misread_symbols(b) > misread_symbols(a) or changed_ordinals(t, b)]
+    failed |= bool(regressions)
+    print(f"Regex loops:   {old_us:8.2f} us/text")
+    print(f"Compiled:      {new_us:8.2f} us/text  ({old_us / new_us:.1f}x faster)")
+    print(f"Agreement:     {len(texts) - len(differences)}/{len(texts)}")
+    print(f"Regressions:   {len(regressions)}")
+    for t, a, b in regressions[:5]:
+        print(f"  ❌ {t!r}: regex={a!r} compiled={b!r}")
+    for t, a, b in [d for d in differences if d not in regressions][:5]:
+        print(f"  ≠ {t!r}: regex={a!r} compiled={b!r}")
+    print("=" * 70)
+
+    # Tables and word corrections must match exactly; full corrections may
+    # differ only on words the regexes could not fix (listed above)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Benchmark speed and accuracy of the scan chain on a golden set of labelled covers.
+
+Replays a directory of cover crops with their expected title/author/publisher
+through the same preprocess → OCR → fuzzy correction → parse → postprocess
+chain as scan_books.py, once per OCR engine (or cascade) and preprocessing
+profile, and reports:
+  - throughput and per-stage latency percentiles (p50/p95/p99)
+  - startup cost and peak RSS (each configuration runs in its own process)
+  - field accuracy: exact match and edit distance against the labels
+
+The golden directory holds the crops plus a labels.csv:
+
+    image,title,author,publisher
+    book_20260131_143022.jpg,The Ten Thousand Doors of January,Alix E Harrow,Orbit Books
+
+(an empty field means the cover does not show it; "--init DIR" writes a
+template listing every image of DIR.)
+
+Results go to a JSON file; with --baseline a previous result file is compared
+and the exit code is 1 when accuracy or throughput regressed.
+
+Usage:
+    python3 benchmark_scanner.py golden/                             # easyocr, default profile
+    python3 benchmark_scanner.py golden/ --engines ppocr,tesseract,ppocr+easyocr \\
+                                         --profiles default,none
+    python3 benchmark_scanner.py golden/ --baseline bench_main.json  # catch regressions
+    python3 benchmark_scanner.py --init golden/                      # labels.csv template
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+import resource
+import multiprocessing
+import concurrent.futures
+from datetime import datetime
+
+import cv2
+
+# Paths on the command line are relative to where the script was started
+INVOKED_FROM = os.getcwd()
+
+# Databases are loaded relative to the script directory
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, '.')
+
+from scan_books import (  # noqa: E402
+    METRICS, OCR_ENGINES, BatchScanner, BookScanner, ScanJob, normalize_key)
+
+
+LABELS_FILE = 'labels.csv'
+FIELDS = ('title', 'author', 'publisher')
+
+# Preprocessing profiles: BookScanner keyword arguments
+PROFILES = {
+    'default': {'preprocessing': True},
+    'none': {'preprocessing': False},
+    'gated': {'preprocessing': True, 'top_regions': 8},
+}
+
+
+# ============================================================================
+# GOLDEN SET
+# ============================================================================
+
+def load_golden(directory):
+    """[(image path, {field: expected})] from directory/labels.csv"""
+    path = os.path.join(directory, LABELS_FILE)
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+
+    golden = []
+    for row in rows:
+        image = os.path.join(directory, row['image'])
+        if not os.path.exists(image):
+            print(f"⚠️  {row['image']} listed in {LABELS_FILE} but missing, skipped")
+            continue
+        golden.append((image, {f: (row.get(f) or '').strip() for f in FIELDS}))
+    return golden
+
+
+def write_template(directory):
+    """labels.csv listing every image of the directory, fields to fill in by hand"""
+    path = os.path.join(directory, LABELS_FILE)
+    if os.path.exists(path):
+        print(f"❌ {path} already exists")
+        return 1
+    images = [os.path.basename(p) for p in BatchScanner.collect_images([directory])]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(('image',) + FIELDS)
+        for image in images:
+            writer.writerow((image, '', '', ''))
+    print(f"✅ {path}: {len(images)} image(s), fill in title/author/publisher")
+    return 0
+
+
+# ============================================================================
+# ACCURACY
+# ============================================================================
+
+def edit_distance(a, b):
+    """Levenshtein distance"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def score_field(expected, found):
+    """(exact, distance, similarity) on normalized text ('[not identified]' is empty)"""
+    expected = normalize_key(expected)
+    found = normalize_key('' if found == '[not identified]' else found)
+    distance = edit_distance(expected, found)
+    longest = max(len(expected), len(found))
+    return expected == found, distance, 1.0 - distance / longest if longest else 1.0
+
+
+def accuracy(scores):
+    """Per-field summary of [(exact, distance, similarity)]"""
+    n = len(scores)
+    return {
+        'exact': sum(s[0] for s in scores) / n if n else 0.0,
+        'avg_distance': sum(s[1] for s in scores) / n if n else 0.0,
+        'avg_similarity': sum(s[2] for s in scores) / n if n else 0.0,
+    }
+
+
+# ============================================================================
+# RUN (one configuration, in its own process)
+# ============================================================================
+
+def run_configuration(engine, profile, golden):
+    """Scan every golden cover sequentially; runs in a fresh process"""
+    cascade = engine.split('+')
+    scanner = BookScanner(cascade=cascade, **PROFILES[profile])
+    first = cv2.imread(golden[0][0])
+    scanner._load_engine(first.shape if first is not None else (480, 640))
+
+    books = []
+    scores = {f: [] for f in FIELDS}
+    start = time.perf_counter()
+    for seq, (path, expected) in enumerate(golden):
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        job = ScanJob(seq=seq, timestamp='', image=image, path=path)
+        book_start = time.perf_counter()
+        # Same stages as the scan pipeline, one book at a time
+        scanner._stage_preprocess(job)
+        scanner._stage_ocr(job)
+        result = scanner._job_result(job)
+        latency = time.perf_counter() - book_start
+
+        book = {'image': os.path.basename(path), 'latency': latency,
+                'step': job.ocr_step or cascade[0]}
+        for f in FIELDS:
+            exact, distance, similarity = score_field(expected[f], result[f])
+            scores[f].append((exact, distance, similarity))
+            book[f] = {'expected': expected[f], 'found': result[f],
+                       'exact': exact, 'distance': distance}
+        books.append(book)
+    elapsed = time.perf_counter() - start
+    scanner._close_engines()
+
+    return {
+        'engine': engine,
+        'profile': profile,
+        'images': len(books),
+        'elapsed': elapsed,
+        'throughput': len(books) / elapsed if elapsed else 0.0,
+        'startup': {e.name: e.timing_report()['startup'] for e in scanner.engines},
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'stages': METRICS.snapshot(),
+        'cascade': dict(scanner.cascade_steps),
+        'accuracy': {f: accuracy(scores[f]) for f in FIELDS},
+        'books': books,
+    }
+
+
+def run_isolated(engine, profile, golden):
+    """run_configuration in a fresh process, so models and peak RSS do not add up"""
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_configuration, engine, profile, golden).result()
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def print_run(run):
+    print(f"Images:        {run['images']} in {run['elapsed']:.1f}s "
+          f"({run['throughput']:.2f} books/s, {run['throughput'] * 60:.1f} books/min)")
+    print("Startup:       " + ', '.join(f"{name} {t:.1f}s" for name, t in run['startup'].items()))
+    print(f"Peak RSS:      {run['peak_rss_mb']:.0f} MB")
+    print(f"{'Field':<12}{'Exact':>8}{'Avg dist':>10}{'Similarity':>12}")
+    for f in FIELDS:
+        a = run['accuracy'][f]
+        print(f"{f:<12}{a['exact']:>8.0%}{a['avg_distance']:>10.1f}{a['avg_similarity']:>12.0%}")
+    print(f"{'Timing':<18}{'p50':>11}{'p95':>11}{'p99':>11}")
+    for stage, st in run['stages'].items():
+        print(f"{stage:<18}" + ''.join(f"{st[k] * 1000:>9.1f}ms" for k in ('p50', 'p95', 'p99')))
+
+
+def compare(runs, baseline, max_accuracy_drop, max_slowdown):
+    """Regressions of runs against the baseline runs with the same engine and profile"""
+    previous = {(r['engine'], r['profile']): r for r in baseline['runs']}
+    regressions = []
+    for run in runs:
+        old = previous.get((run['engine'], run['profile']))
+        if old is None:
+            continue
+        label = f"{run['engine']}/{run['profile']}"
+        for f in FIELDS:
+            before, after = old['accuracy'][f]['exact'], run['accuracy'][f]['exact']
+            if before - after > max_accuracy_drop:
+                regressions.append(f"{label}: {f} exact {before:.0%} → {after:.0%}")
+        if old['throughput'] and run['throughput'] < old['throughput'] * (1 - max_slowdown):
+            regressions.append(f"{label}: throughput {old['throughput']:.2f} → "
+                               f"{run['throughput']:.2f} books/s")
+    return regressions
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    argparser = argparse.ArgumentParser(description="Benchmark the scan chain on labelled covers")
+    argparser.add_argument('golden', nargs='?', help=f"Directory of cover crops with {LABELS_FILE}")
+    argparser.add_argument('--engines', default='easyocr',
+                           help="Comma-separated OCR models; join models with + for a "
+                                "cascade, e.g. ppocr+easyocr (default: easyocr)")
+    argparser.add_argument('--profiles', default='default',
+                           help=f"Comma-separated preprocessing profiles: "
+                                f"{', '.join(PROFILES)} (default: default)")
+    argparser.add_argument('--limit', type=int, help="Use only the first N covers")
+    argparser.add_argument('--output', default='bench_results.json',
+                           help="JSON results file (default: bench_results.json)")
+    argparser.add_argument('--baseline', help="Previous results file to compare against")
+    argparser.add_argument('--max-accuracy-drop', type=float, default=0.0,
+                           help="Baseline: tolerated drop of exact-match rate per field "
+                                "(default: 0.0)")
+    argparser.add_argument('--max-slowdown', type=float, default=0.2,
+                           help="Baseline: tolerated throughput loss (default: 0.2 = 20%%)")
+    argparser.add_argument('--init', metavar='DIR', help=f"Write a {LABELS_FILE} template and exit")
+    args = argparser.parse_args()
+
+    def resolve(path):
+        return os.path.join(INVOKED_FROM, path) if path else path
+
+    if args.init:
+        return write_template(resolve(args.init))
+    if not args.golden:
+        argparser.error("golden directory required (or --init DIR)")
+
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+    profiles = [p.strip() for p in args.profiles.split(',') if p.strip()]
+    unknown = [m for e in engines for m in e.split('+') if m not in OCR_ENGINES]
+    if unknown:
+        argparser.error(f"unknown model(s) {', '.join(unknown)} (choose from {', '.join(OCR_ENGINES)})")
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        argparser.error(f"unknown profile(s) {', '.join(unknown)} (choose from {', '.join(PROFILES)})")
+
+    golden = load_golden(resolve(args.golden))[:args.limit]
+    if not golden:
+        print(f"❌ No labelled covers in {args.golden}")
+        return 1
+    print(f"📚 Golden set: {len(golden)} cover(s) from {args.golden}")
+
+    runs = []
+    failures = []
+    for engine in engines:
+        for profile in profiles:
+            print("\n" + "=" * 70)
+            print(f"   ⏱️  {engine} / preprocessing {profile}")
+            print("=" * 70)
+            try:
+                run = run_isolated(engine, profile, golden)
+            except BaseException as e:  # engine missing (sys.exit) or crashed
+                if isinstance(e, KeyboardInterrupt):
+                    raise
+                print(f"❌ {engine}/{profile} failed: {e!r}")
+                failures.append(f"{engine}/{profile}")
+                continue
+            print_run(run)
+            runs.append(run)
+
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'golden': args.golden,
+        'covers': len(golden),
+        'runs': runs,
+        'failed': failures,
+    }
+    output = resolve(args.output)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n📈 Results: {args.output}")
+
+    if args.baseline:
+        with open(resolve(args.baseline), encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(runs, baseline, args.max_accuracy_drop, args.max_slowdown)
+        print("\n" + "=" * 70)
+        print(f"   🔎 COMPARED WITH {args.baseline}")
+        print("=" * 70)
+        for regression in regressions:
+            print(f"  ❌ {regression}")
+        if not regressions:
+            print("  ✅ No regressions")
+        print("=" * 70)
+        if regressions:
+            return 1
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,14 +5,19 @@ Processes one book after another with automatic preprocessing and postprocessing
 
 Usage:
     python3 scan_books.py                    # Manual mode (press ENTER for each book)
-    python3 scan_books.py --auto             # Auto mode (3s delay between scans)
+    python3 scan_books.py batch test_images  # Re-process archived crops (no camera)
+    python3 scan_books.py --auto             # Auto mode (scan when a new book is placed)
     python3 scan_books.py --model tesseract  # Use specific OCR model
+    python3 scan_books.py --cascade ppocr,easyocr  # Fast model first, escalate hard covers
+    python3 scan_books.py --top-regions 8    # Recognize only the prominent text regions
     python3 scan_books.py --no-preprocessing # Skip preprocessing
+    python3 scan_books.py --metrics metrics.json --metrics-port 9464  # Stage timings
 
 OCR Models:
     - tesseract: Fast, good for clean images (~8s/book)
     - ppocr: Very fast, handles rotations (~3-5s/book)
     - easyocr: Most accurate, slow (~15-18s/book) [DEFAULT]
+    - metis-ppocr: PP-OCR det+rec on the Metis accelerator (Voyager SDK)
 
 Database-Enhanced Parsing:
     - 18,500+ known authors for accurate detection
@@ -26,14 +31,33 @@ import sys
 import time
 import os
 import re
+import glob
 import argparse
 import subprocess
+import urllib.parse
 import numpy as np
 import json
+import csv
+import sqlite3
+import unicodedata
+import bisect
+import hashlib
+import mmap
+import struct
+import queue
+import threading
+import itertools
+import collections
+import multiprocessing
+import concurrent.futures
+import http.server
+from multiprocessing import shared_memory
 from datetime import datetime
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 from difflib import SequenceMatcher
+from functools import cached_property
+from contextlib import contextmanager
 
 
 # ============================================================================
@@ -82,6 +106,208 @@ class RTSPConfig:
         return f"rtsp://{username}:{password}@{ip}:{port}{path}"
 
 
+# ============================================================================
+# METRICS
+# ============================================================================
+
+# Stages timed for every book, in processing order
+METRIC_STAGES = ('capture', 'crop', 'preprocess', 'cache', 'detection', 'recognition', 'ocr',
+                 'fuzzy_correction', 'parse', 'postprocess', 'log')
+
+
+class Timer:
+    """Elapsed time on time.perf_counter (same semantics as the Voyager SDK utils.Timer)"""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._stop = None
+
+    def reset(self):
+        self._start = time.perf_counter()
+
+    def stop(self):
+        if self._stop is None:
+            self._stop = time.perf_counter()
+
+    @property
+    def time(self):
+        return (self._stop or time.perf_counter()) - self._start
+
+
+@contextmanager
+def catchtime(task_name='It', logger=None, resolution=''):
+    """
+    Time the block like the Voyager SDK utils.catchtime, so scanner and SDK
+    logs read the same: logger gets "{task_name} took X seconds/mseconds/useconds".
+    """
+    valid = ('', 's', 'm', 'u')
+    if logger and resolution not in valid:
+        raise ValueError(f"Invalid resolution {resolution} for timer, valid are {valid}")
+    t = Timer()
+    try:
+        yield t
+    finally:
+        t.stop()
+        if logger:
+            duration = t.time
+            if not resolution:
+                resolution = 's' if duration > 1 else 'm' if duration > 0.001 else 'u'
+            if resolution == 's':
+                logger(f'{task_name} took {duration:.3f} seconds')
+            elif resolution == 'm':
+                logger(f'{task_name} took {duration * 1000:.3f} mseconds')
+            else:
+                logger(f'{task_name} took {duration * 1000000:.3f} useconds')
+
+
+class LatencyHistogram:
+    """Rolling window of the latest durations of one stage, plus lifetime count/sum"""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, window=1000):
+        self.samples = collections.deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self):
+        samples = np.fromiter(self.samples, dtype=np.float64, count=len(self.samples))
+        percentiles = (np.percentile(samples, [q * 100 for q in self.QUANTILES])
+                       if samples.size else [0.0] * len(self.QUANTILES))
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'window': int(samples.size),
+            'mean': float(samples.mean()) if samples.size else 0.0,
+            'max': float(samples.max()) if samples.size else 0.0,
+            **{f'p{round(q * 100)}': float(p) for q, p in zip(self.QUANTILES, percentiles)},
+        }
+
+
+class ScanMetrics:
+    """
+    Per-stage latency histograms shared by all scanner threads.
+
+    Stages are timed with METRICS.time(stage), which wraps catchtime; with a
+    logger set (--debug) every timing is also printed in the SDK's format.
+    Read through snapshot(), a JSON dump (--metrics) or an OpenMetrics
+    endpoint (--metrics-port). OCR worker processes (--workers) collect their
+    timings in forward and send them back with each result.
+    """
+
+    CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.logger = None
+        self.server = None
+        self.started = time.time()
+        # (stage, seconds) recorded since the last forwarded() (worker processes only)
+        self.forward = None
+
+    @contextmanager
+    def time(self, stage):
+        with catchtime(stage, self.logger) as t:
+            yield t
+        self.record(stage, t.time)
+
+    def record(self, stage, seconds):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram(self.window)
+            histogram.add(seconds)
+            if self.forward is not None:
+                self.forward.append((stage, seconds))
+
+    def forwarded(self):
+        """Timings recorded since the last call, to be recorded by another process"""
+        with self.lock:
+            timings, self.forward = self.forward or [], []
+        return timings
+
+    def snapshot(self):
+        """{stage: {count, sum, window, mean, max, p50, p95, p99}} in processing order"""
+        with self.lock:
+            summaries = {stage: h.summary() for stage, h in self.histograms.items()}
+        order = {stage: i for i, stage in enumerate(METRIC_STAGES)}
+        return dict(sorted(summaries.items(), key=lambda kv: order.get(kv[0], len(order))))
+
+    def dump(self, path, extra=None):
+        """Write the snapshot as JSON (atomically)"""
+        report = {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'uptime': time.time() - self.started,
+            'window': self.window,
+            'stages': self.snapshot(),
+        }
+        if extra:
+            report.update(extra)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp, path)
+
+    def openmetrics(self):
+        """Snapshot in the OpenMetrics text format (one summary per stage)"""
+        lines = [
+            '# TYPE scan_stage_seconds summary',
+            '# UNIT scan_stage_seconds seconds',
+            '# HELP scan_stage_seconds Book scanner stage latency (quantiles over the '
+            f'last {self.window} samples)',
+        ]
+        for stage, s in self.snapshot().items():
+            for q in LatencyHistogram.QUANTILES:
+                lines.append(f'scan_stage_seconds{{stage="{stage}",quantile="{q}"}} '
+                             f'{s[f"p{round(q * 100)}"]:.6f}')
+            lines.append(f'scan_stage_seconds_sum{{stage="{stage}"}} {s["sum"]:.6f}')
+            lines.append(f'scan_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port, host='127.0.0.1'):
+        """Serve /metrics on a local port from a daemon thread"""
+        metrics = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.openmetrics().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', metrics.CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='metrics-http',
+                         daemon=True).start()
+        return self.server.server_address
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# Process-wide registry (OCR worker processes forward their timings to the parent's)
+METRICS = ScanMetrics()
+
+
 # ============================================================================
 # IMAGE PREPROCESSING
 # ============================================================================
@@ -159,136 +385,164 @@ class BookCoverPreprocessor:
 # OCR POST-PROCESSING
 # ============================================================================
 
-class OCRPostProcessor:
-    """Post-process OCR results to fix common errors"""
-
-    # Common OCR character substitution errors
-    CHAR_CORRECTIONS = {
-        '0': 'O', '1': 'I', '5': 'S', '7': 'T', '8': 'B',
-        '|': 'I', '!': 'I', '@': 'A', '©': 'C', '®': 'R',
-    }
-
-    # Common word-level OCR errors (especially Italian)
-    WORD_CORRECTIONS = {
-        'OLMRQ': 'OLIMPO',
-        'OLMDQ': 'OLIMPO',
-        'OLMTQ': 'OLIMPO',
-        'OLMQ': 'OLIMPO',  # Yet another variant
-        'OL1MPO': 'OLIMPO',
-        'OLMPO': 'OLIMPO',
-        'EROL': 'EROI',
-        'EROA': 'EROI',
-        'EROX': 'EROI',  # New variant
-        'ER0I': 'EROI',
-        'GLMIQ': 'GLI',
-        'GL1': 'GLI',
-        'R10RDAN': 'RIORDAN',
-        'R1ORDAN': 'RIORDAN',
-        'MONDADOR1': 'MONDADORI',
-        'MONOADORI': 'MONDADORI',
-        'PENGU1N': 'PENGUIN',
-        'BLSTSELLERS': '',  # Remove series name (directly, not via BESTSELLERS)
-        'BESTSELLERS': '',  # Remove series name
-        # OSCAR not removed - needed for publisher imprint mapping (now filtered in parser)
-        'DELL': "DELL'",  # Often missing apostrophe
-    }
-
-    def __init__(self, debug=False):
-        self.debug = debug
-
-    def correct_text(self, text, text_type='title'):
-        """Correct OCR errors in text"""
-        if not text or text == '[not identified]':
-            return text
-
-        # Word-level corrections (common OCR errors)
-        corrected = self._correct_words(text)
-
-        # Character-level corrections
-        corrected = self._correct_characters(corrected)
-
-        # Pattern-based corrections (spacing)
-        corrected = self._apply_patterns(corrected, text_type)
-
-        # Capitalization normalization
-        corrected = self._normalize_capitalization(corrected, text_type)
-
-        return corrected
-
-    def _correct_words(self, text):
-        """Apply word-level corrections for common OCR mistakes"""
-        corrected = text
-
-        # Replace whole words
-        words = corrected.split()
-        corrected_words = []
+CORRECTIONS_FILE = 'ocr_corrections.txt'
 
-        for word in words:
-            word_upper = word.upper()
-            # Check direct match
-            if word_upper in self.WORD_CORRECTIONS:
-                replacement = self.WORD_CORRECTIONS[word_upper]
-                if replacement:  # Only add if not empty string
-                    corrected_words.append(replacement)
-            else:
-                corrected_words.append(word)
 
-        return ' '.join(corrected_words)
+def _read_sections(path):
+    """Read an INI-like file of [section] lines (comments skipped, uppercase)"""
+    sections = collections.defaultdict(list)
+    if not os.path.exists(path):
+        return sections  # Continue without corrections
+    current = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                current = line[1:-1].strip().lower()
+            elif current is not None:
+                sections[current].append(line.upper())
+    return sections
 
-    def _correct_characters(self, text):
-        """Apply character-level corrections"""
-        corrected = text
 
-        for wrong, right in self.CHAR_CORRECTIONS.items():
-            # Replace in all-caps words (likely titles)
-            pattern = r'\b([A-Z]*' + re.escape(wrong) + r'[A-Z]*)\b'
+class TextNormalizer:
+    """
+    Single-pass OCR text normalizer compiled from the corrections file.
 
-            def replace_in_caps(match):
-                word = match.group(1)
-                letter_count = sum(c.isalpha() for c in word)
-                if letter_count > len(word) * 0.5:
-                    return word.replace(wrong, right)
-                return word
+    The text is split into words once; each word gets its word correction and
+    its misread-character substitution from precomputed tables, then the
+    spacing and capitalization rules of the field (title/author/publisher)
+    are applied while joining the words back.
+    """
 
-            corrected = re.sub(pattern, replace_in_caps, corrected)
+    def __init__(self, words, characters, title_upper=(), title_lower=()):
+        self.words = dict(words)
+        self.characters = dict(characters)
+        self.title_upper = frozenset(title_upper)
+        self.title_lower = frozenset(w.lower() for w in title_lower)
+
+        self.confusables = frozenset(self.characters)
+        self.translation = str.maketrans(self.characters)
+        # Word characters and misread symbols form one segment ("ST@R"); other
+        # characters (spaces, apostrophes, hyphens...) separate segments
+        symbols = ''.join(re.escape(c) for c in self.characters if not re.match(r'\w', c))
+        self.segment_re = re.compile(rf'[\w{symbols}]+')
+        self.symbols = frozenset(c for c in self.characters if not re.match(r'\w', c))
+        self.ordinal_re = re.compile(r'\d+(?:ST|ND|RD|TH)', re.IGNORECASE)
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or os.path.join(DATA_DIR, CORRECTIONS_FILE)
+        sections = _read_sections(path)
+
+        def pairs(name):
+            for line in sections.get(name, []):
+                if '=' in line:
+                    key, value = line.split('=', 1)
+                    yield key.strip(), value.strip()
+
+        return cls(pairs('words'), pairs('characters'),
+                   sections.get('title_upper', []), sections.get('title_lower', []))
+
+    def correct_words(self, text):
+        """Word corrections only (used on every raw OCR box)"""
+        words = self.words
+        out = []
+        for word in text.split():
+            replacement = words.get(word.upper(), word)
+            if replacement:
+                out.append(replacement)
+        return ' '.join(out)
+
+    def _correct_characters(self, word):
+        """Replace misread characters between capitals in the segments of a word"""
+        if self.confusables.isdisjoint(word):
+            return word
+        return self.segment_re.sub(self._correct_segment, word)
+
+    def _correct_segment(self, match):
+        segment = match.group(0)
+        # Symbols at the edges are punctuation ("HELP!"), not misread letters
+        core = segment.strip(''.join(self.symbols)) if self.symbols else segment
+        # Ordinals (10TH, 21ST) are numbers, not misread words
+        if not core or self.ordinal_re.fullmatch(core):
+            return segment
+        # A misread character is replaced when at least two capitals (accented ones
+        # included) surround it; replaced characters count as capitals for their
+        # neighbours, so runs of misreads are fixed from their capital side (5T0NE).
+        # Digits next to another digit are part of a number and never replaced.
+        chars = list(core)
+        number = [c.isdigit() and (core[i - 1:i].isdigit() or core[i + 1:i + 2].isdigit())
+                  for i, c in enumerate(core)]
+        changed = True
+        while changed:
+            changed = False
+            for i, c in enumerate(chars):
+                if (c in self.confusables and not number[i]
+                        and self._capitals_around(chars, i) >= 2):
+                    chars[i] = self.characters[c]
+                    changed = True
+        start = segment.index(core)
+        return segment[:start] + ''.join(chars) + segment[start + len(core):]
 
-        return corrected
+    @staticmethod
+    def _capitals_around(chars, i):
+        """Number of consecutive uppercase letters directly before and after chars[i]"""
+        count = 0
+        for step in (-1, 1):
+            j = i + step
+            while 0 <= j < len(chars) and chars[j].isupper():
+                count += 1
+                j += step
+        return count
+
+    def normalize(self, text, text_type='title'):
+        """Correct words, characters, spacing and capitalization in one pass"""
+        words = self.words
+        out = []
+        for word in text.split():
+            replacement = words.get(word.upper(), word)
+            if replacement:
+                out.append(self._correct_characters(replacement))
 
-    def _apply_patterns(self, text, text_type):
-        """Apply pattern-based corrections"""
         if text_type == 'title':
-            text = re.sub(r'\s+OF\s+', ' OF ', text, flags=re.IGNORECASE)
-            text = re.sub(r'\s+THE\s+', ' THE ', text, flags=re.IGNORECASE)
-            text = re.sub(r'\s+AND\s+', ' AND ', text, flags=re.IGNORECASE)
-            text = re.sub(r'\s+', ' ', text).strip()
-        elif text_type == 'author':
-            text = re.sub(r'\s+', ' ', text).strip()
+            # Joining words inside the title are written uppercase
+            for i in range(1, len(out) - 1):
+                if out[i].upper() in self.title_upper:
+                    out[i] = out[i].upper()
+        text = ' '.join(out)
 
-        return text
-
-    def _normalize_capitalization(self, text, text_type):
-        """Normalize capitalization based on context"""
         if text_type == 'title' and text.isupper():
-            words = text.split()
-            lowercase_words = {'of', 'the', 'and', 'in', 'on', 'at', 'to', 'a', 'an'}
-            title_cased = []
-
-            for i, word in enumerate(words):
-                if i == 0 or word.lower() not in lowercase_words:
-                    title_cased.append(word.capitalize())
-                else:
-                    title_cased.append(word.lower())
-
-            return ' '.join(title_cased)
-
+            return ' '.join(
+                w.lower() if i > 0 and w.lower() in self.title_lower else w.capitalize()
+                for i, w in enumerate(out)
+            )
         elif text_type == 'author' and (text.isupper() or text.islower()):
             return text.title()
-
         elif text_type == 'publisher' and text.islower():
             return text.upper()
-
         return text
 
+
+class OCRPostProcessor:
+    """Post-process OCR results to fix common errors"""
+
+    def __init__(self, debug=False, normalizer: Optional[TextNormalizer] = None):
+        self.debug = debug
+        # Word/character corrections from ocr_corrections.txt
+        self.normalizer = normalizer or TextNormalizer.load()
+
+    def correct_text(self, text, text_type='title'):
+        """Correct OCR errors in text"""
+        if not text or text == '[not identified]':
+            return text
+        return self.normalizer.normalize(text, text_type)
+
+    def _correct_words(self, text):
+        """Apply word-level corrections for common OCR mistakes"""
+        return self.normalizer.correct_words(text)
+
     def improve_result(self, book_info):
         """Improve entire book information result"""
         improved = book_info.copy()
@@ -321,6 +575,459 @@ class OCRPostProcessor:
 # LLM CORRECTION
 # ============================================================================
 
+# ============================================================================
+# FUZZY MATCHING
+# ============================================================================
+
+class FuzzyIndex:
+    """
+    Indexed fuzzy matcher over a fixed set of strings.
+
+    Returns the same matches as comparing the query against every entry with
+    difflib.SequenceMatcher, without the full scan:
+      - entries are sorted by length, so only entries whose length can reach
+        the threshold are considered (ratio <= 2*min(la, lb) / (la + lb))
+      - each entry has a character-count vector; the multiset overlap with the
+        query bounds the number of matching characters (like quick_ratio()),
+        and is computed for all candidates in one numpy operation
+      - candidates are verified with SequenceMatcher in order of decreasing
+        bound, stopping as soon as no remaining candidate can win
+    """
+
+    ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 '
+
+    def __init__(self, entries):
+        self.entries = sorted(set(entries), key=lambda e: (len(e), e))
+        self.lengths = np.array([len(e) for e in self.entries], dtype=np.int32)
+        self.counts = np.zeros((len(self.entries), len(self.ALPHABET) + 1), dtype=np.uint8)
+        for i, entry in enumerate(self.entries):
+            self.counts[i] = self._char_counts(entry)
+
+    @classmethod
+    def from_arrays(cls, entries, lengths, counts):
+        """Create index from precompiled arrays (entries already in index order)"""
+        index = cls.__new__(cls)
+        index.entries = entries
+        index.lengths = lengths
+        index.counts = counts
+        return index
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def _char_counts(cls, text):
+        """Character-count vector (last column collects characters outside ALPHABET)"""
+        counts = np.zeros(len(cls.ALPHABET) + 1, dtype=np.int32)
+        other = len(cls.ALPHABET)
+        for c in text:
+            idx = cls.ALPHABET.find(c)
+            counts[idx if idx >= 0 else other] += 1
+        return np.minimum(counts, 255).astype(np.uint8)
+
+    def _candidates(self, query, threshold, max_length_diff, min_length):
+        """Candidate indices and ratio upper bounds, best bound first"""
+        la = len(query)
+        if la == 0 or not self.entries:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # Length window where 2*min(la, lb) / (la + lb) can exceed threshold
+        if threshold > 0:
+            min_len = la * threshold / (2 - threshold)
+            max_len = la * (2 - threshold) / threshold
+        else:
+            min_len, max_len = 0, np.inf
+        min_len = max(min_len - 1, min_length - 1)
+        max_len = max_len + 1
+        if max_length_diff is not None:
+            min_len = max(min_len, la - max_length_diff - 1)
+            max_len = min(max_len, la + max_length_diff + 1)
+
+        lo = int(np.searchsorted(self.lengths, min_len, side='right'))
+        hi = int(np.searchsorted(self.lengths, max_len, side='left'))
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        overlap = np.minimum(self.counts[lo:hi], self._char_counts(query)).sum(axis=1)
+        bound = 2.0 * overlap / (la + self.lengths[lo:hi])
+        keep = np.nonzero(bound > threshold)[0]
+        order = keep[np.argsort(-bound[keep], kind='stable')]
+        return order + lo, bound[order]
+
+    def best_match(self, query, threshold=0.8, max_length_diff=None, min_length=0):
+        """
+        Best entry with SequenceMatcher ratio above threshold.
+
+        Returns:
+            (entry, ratio), or (None, threshold) if nothing beats the threshold
+        """
+        best, best_ratio = None, threshold
+        indices, bounds = self._candidates(query, threshold, max_length_diff, min_length)
+        for idx, bound in zip(indices, bounds):
+            if bound <= best_ratio:
+                break
+            entry = self.entries[idx]
+            ratio = SequenceMatcher(None, query, entry).ratio()
+            if ratio > best_ratio:
+                best, best_ratio = entry, ratio
+        return best, best_ratio
+
+    def has_match(self, query, threshold=0.8, max_length_diff=None, min_length=0):
+        """Check if any entry has SequenceMatcher ratio above threshold"""
+        indices, _ = self._candidates(query, threshold, max_length_diff, min_length)
+        for idx in indices:
+            if SequenceMatcher(None, query, self.entries[idx]).ratio() > threshold:
+                return True
+        return False
+
+
+# ============================================================================
+# MULTI-PATTERN MATCHING
+# ============================================================================
+
+class AhoCorasick:
+    """
+    Aho–Corasick automaton: finds every occurrence of many keywords in one pass.
+
+    Matching costs O(len(text) + hits) however many keywords were added, so
+    checking a text box against thousands of publishers and imprints is as
+    cheap as checking it against a handful. Each keyword carries a value;
+    match() reports (start, end, value) for every occurrence, overlapping
+    ones included.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        self.built = False
+
+    def add(self, keyword, value):
+        """Add a keyword (before build)"""
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append((len(keyword), value))
+        self.built = False
+
+    def build(self):
+        """Compute failure links (breadth-first) and merge the outputs along them"""
+        pending = collections.deque(self.goto[0].values())
+        for state in pending:
+            self.fail[state] = 0
+        while pending:
+            state = pending.popleft()
+            for ch, nxt in self.goto[state].items():
+                pending.append(nxt)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(ch, 0)
+                if self.fail[nxt] == nxt:
+                    self.fail[nxt] = 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+        self.built = True
+        return self
+
+    def match(self, text) -> List[Tuple[int, int, object]]:
+        """All (start, end, value) keyword occurrences in text"""
+        goto, fail, out = self.goto, self.fail, self.out
+        hits = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                hits.extend((end - length, end, value) for length, value in out[state])
+        return hits
+
+
+# ============================================================================
+# LEXICON
+# ============================================================================
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+LEXICON_FILE = 'lexicon.bin'
+LEXICON_MAGIC = b'ABCLEX\x00\x00'
+LEXICON_VERSION = 2
+
+# Source databases compiled into the lexicon artifact
+LEXICON_SOURCES = {
+    'authors': 'known_authors.txt',
+    'publishers': 'known_publishers.txt',
+    'imprints': 'publisher_imprints.txt',
+}
+
+
+def _read_entries(path):
+    """Read one-entry-per-line database (uppercase, comments skipped)"""
+    entries = set()
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        entries.add(line.upper())
+    except Exception:
+        pass  # Continue without database if file unreadable
+    return entries
+
+
+def _read_mapping(path):
+    """Read KEY=VALUE database (uppercase, comments skipped)"""
+    mapping = {}
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#') and '=' in line:
+                        key, value = line.split('=', 1)
+                        mapping[key.strip().upper()] = value.strip().upper()
+    except Exception:
+        pass
+    return mapping
+
+
+def _file_hash(path):
+    """SHA-256 of a source file ('' if missing)"""
+    if not os.path.exists(path):
+        return ''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LexiconTable:
+    """
+    One compiled database: entries in fuzzy-index order, the fuzzy index
+    arrays and token → entry postings (for multi-word entries).
+    """
+
+    def __init__(self, index: 'FuzzyIndex', tokens: List[str], offsets, postings):
+        self.index = index
+        self.tokens = tokens
+        self.offsets = offsets
+        self.postings = postings
+
+    @property
+    def entries(self) -> List[str]:
+        return self.index.entries
+
+    @classmethod
+    def build(cls, entries):
+        index = FuzzyIndex(entries)
+        token_map = {}
+        for i, entry in enumerate(index.entries):
+            for token in set(entry.split()):
+                token_map.setdefault(token, []).append(i)
+        tokens = sorted(token_map)
+        offsets = np.zeros(len(tokens) + 1, dtype=np.int32)
+        for i, token in enumerate(tokens):
+            offsets[i + 1] = offsets[i] + len(token_map[token])
+        postings = np.array([i for token in tokens for i in token_map[token]], dtype=np.int32)
+        return cls(index, tokens, offsets, postings)
+
+    def entries_with_token(self, token) -> List[str]:
+        """All entries containing token as a whole word"""
+        i = bisect.bisect_left(self.tokens, token)
+        if i == len(self.tokens) or self.tokens[i] != token:
+            return []
+        ids = self.postings[self.offsets[i]:self.offsets[i + 1]]
+        return [self.index.entries[j] for j in ids]
+
+
+class Lexicon:
+    """
+    Author/publisher/imprint databases compiled into one binary artifact.
+
+    The artifact holds the normalized entries, the imprint → publisher map
+    (in publisher_imprints.txt order), token postings and the fuzzy index
+    arrays. Arrays are memory-mapped on
+    load, so startup does not re-parse the text files or rebuild the index.
+    It is rebuilt automatically when the hash of any source file changes.
+
+    File layout: magic, uint32 version, uint32 header size, JSON header
+    (source hashes + section offsets), then 8-byte aligned sections.
+    """
+
+    def __init__(self, authors: LexiconTable, publishers: LexiconTable,
+                 imprints: LexiconTable, imprint_publishers: List[str], imprint_order,
+                 sources=None):
+        self.authors = authors
+        self.publishers = publishers
+        self.imprints = imprints
+        # Publisher for each imprint, aligned with imprints.entries
+        self.imprint_publishers = imprint_publishers
+        # imprints.entries indexes in source file order (the fuzzy index sorts
+        # entries by length; imprint resolution needs the first listed match)
+        self.imprint_order = imprint_order
+        self.sources = sources or {}
+
+    @property
+    def imprint_map(self):
+        """Imprint → publisher, in source file order"""
+        entries = self.imprints.entries
+        return {entries[i]: self.imprint_publishers[i] for i in self.imprint_order}
+
+    @classmethod
+    def build(cls, data_dir=DATA_DIR):
+        """Compile lexicon from the text databases"""
+        paths = {name: os.path.join(data_dir, f) for name, f in LEXICON_SOURCES.items()}
+        mapping = _read_mapping(paths['imprints'])
+        imprints = LexiconTable.build(mapping.keys())
+        position = {imprint: i for i, imprint in enumerate(imprints.entries)}
+        return cls(
+            authors=LexiconTable.build(_read_entries(paths['authors'])),
+            publishers=LexiconTable.build(_read_entries(paths['publishers'])),
+            imprints=imprints,
+            imprint_publishers=[mapping[k] for k in imprints.entries],
+            imprint_order=np.array([position[k] for k in mapping], dtype=np.int32),
+            sources={name: _file_hash(p) for name, p in paths.items()},
+        )
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """Write the binary artifact (atomically)"""
+        sections = []  # (name, bytes, dtype, shape)
+
+        def add_strings(name, strings):
+            sections.append((name, '\n'.join(strings).encode('utf-8'), 'str', [len(strings)]))
+
+        def add_array(name, array):
+            array = np.ascontiguousarray(array)
+            sections.append((name, array.tobytes(), array.dtype.str, list(array.shape)))
+
+        for name in ('authors', 'publishers', 'imprints'):
+            table = getattr(self, name)
+            add_strings(f'{name}.entries', table.entries)
+            add_array(f'{name}.lengths', table.index.lengths)
+            add_array(f'{name}.counts', table.index.counts)
+            add_strings(f'{name}.tokens', table.tokens)
+            add_array(f'{name}.offsets', table.offsets)
+            add_array(f'{name}.postings', table.postings)
+        add_strings('imprints.publishers', self.imprint_publishers)
+        add_array('imprints.order', self.imprint_order)
+
+        offset = 0
+        layout = {}
+        for name, data, dtype, shape in sections:
+            layout[name] = {'offset': offset, 'size': len(data), 'dtype': dtype, 'shape': shape}
+            offset += (len(data) + 7) & ~7
+        header = json.dumps({
+            'version': LEXICON_VERSION,
+            'alphabet': FuzzyIndex.ALPHABET,
+            'sources': self.sources,
+            'sections': layout,
+        }).encode('utf-8')
+        header += b' ' * (-(len(LEXICON_MAGIC) + 8 + len(header)) % 8)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(LEXICON_MAGIC)
+            f.write(struct.pack('<II', LEXICON_VERSION, len(header)))
+            f.write(header)
+            for name, data, _, _ in sections:
+                f.write(data)
+                f.write(b'\x00' * (-len(data) % 8))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def read_header(path):
+        """Read artifact header (None if missing, foreign or other version)"""
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(LEXICON_MAGIC)) != LEXICON_MAGIC:
+                    return None
+                version, header_size = struct.unpack('<II', f.read(8))
+                if version != LEXICON_VERSION:
+                    return None
+                header = json.loads(f.read(header_size))
+                header['data_offset'] = len(LEXICON_MAGIC) + 8 + header_size
+                return header
+        except (OSError, ValueError, struct.error):
+            return None
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a compiled artifact"""
+        header = cls.read_header(path)
+        if header is None or header.get('alphabet') != FuzzyIndex.ALPHABET:
+            raise ValueError(f"Not a valid lexicon artifact (version {LEXICON_VERSION}): {path}")
+
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        base = header['data_offset']
+
+        def section(name):
+            info = header['sections'][name]
+            start = base + info['offset']
+            if info['dtype'] == 'str':
+                if info['shape'][0] == 0:
+                    return []
+                return buffer[start:start + info['size']].decode('utf-8').split('\n')
+            count = int(np.prod(info['shape']))
+            return np.frombuffer(buffer, dtype=info['dtype'], count=count,
+                                 offset=start).reshape(info['shape'])
+
+        tables = {}
+        for name in ('authors', 'publishers', 'imprints'):
+            index = FuzzyIndex.from_arrays(section(f'{name}.entries'),
+                                           section(f'{name}.lengths'),
+                                           section(f'{name}.counts'))
+            tables[name] = LexiconTable(index, section(f'{name}.tokens'),
+                                        section(f'{name}.offsets'),
+                                        section(f'{name}.postings'))
+        return cls(imprint_publishers=section('imprints.publishers'),
+                   imprint_order=section('imprints.order'),
+                   sources=header['sources'], **tables)
+
+
+def load_lexicon(data_dir=DATA_DIR, cache_path=None, rebuild=False):
+    """
+    Load compiled lexicon, (re)building the artifact if missing or stale.
+
+    The artifact is stale when the SHA-256 of any source database differs
+    from the hashes recorded at build time.
+    """
+    cache_path = cache_path or os.path.join(data_dir, LEXICON_FILE)
+    sources = {name: _file_hash(os.path.join(data_dir, f))
+               for name, f in LEXICON_SOURCES.items()}
+
+    if not rebuild:
+        header = Lexicon.read_header(cache_path)
+        if header is not None and header.get('sources') == sources:
+            try:
+                return Lexicon.load(cache_path)
+            except (OSError, ValueError):
+                pass  # Corrupt artifact: rebuild below
+
+    lexicon = Lexicon.build(data_dir)
+    try:
+        lexicon.save(cache_path)
+    except OSError as e:
+        print(f"⚠️  Cannot write lexicon cache {cache_path}: {e}")
+    return lexicon
+
+
 # ============================================================================
 # BOOK COVER PARSER
 # ============================================================================
@@ -343,6 +1050,43 @@ class BookInfo:
     raw_texts: List[TextBox] = field(default_factory=list)
 
 
+class BoxFeatures:
+    """
+    What the role phases of BookCoverParser.parse need to know about one box.
+
+    Position, prominence and quote detection are computed up front; database
+    lookups are computed on first use and memoized, so a text is looked up at
+    most once per parse however many phases and author candidates ask for it.
+    """
+
+    def __init__(self, parser: 'BookCoverParser', box: TextBox, img_h: int, img_w: int):
+        self.parser = parser
+        self.box = box
+        self.text = box.text
+        self.upper = box.text.upper()
+        self.words = box.text.split()
+        self.position_y = (box.bbox[1] + box.bbox[3]) / 2
+        self.position_y_ratio = self.position_y / img_h
+        self.prominence = parser._calculate_prominence(box, img_h, img_w)
+        # Publisher/imprint/keyword hits, one automaton pass per box
+        self.hits = parser.scan(self.upper)
+        self.is_quote = parser._is_quote_or_review(box.text, self.hits)
+        self.is_imprint = self.upper in parser.publisher_imprints
+
+    @cached_property
+    def in_author_db(self) -> bool:
+        """Matches the author database (exact, surname or fuzzy)"""
+        return self.parser._matches_author_database(self.upper.strip())
+
+    @cached_property
+    def name_part(self) -> bool:
+        """Could be one block of a split author name ("RICK" + "RIORDAN")"""
+        if self.is_imprint:
+            return False
+        return self.upper in self.parser.known_authors or \
+            self.parser._looks_like_name_part(self.text)
+
+
 class BookCoverParser:
     """Parse book cover to extract title, author, publisher"""
 
@@ -353,68 +1097,61 @@ class BookCoverParser:
         'WORLD', 'TIME', 'NIGHT', 'DAY', 'YEAR', 'HISTORY', 'CHRONICLES'
     }
 
-    # Publisher patterns
-    PUBLISHER_PATTERNS = [
-        r'^(PENGUIN|VINTAGE|HARPER|RANDOM|SIMON|MACMILLAN|HACHETTE|SCHOLASTIC)',
-        r'(BOOKS?|PRESS|PUBLISHING|PUBLISHERS?|HOUSE|EDITIONS?)$',
-    ]
-
-    # Quote patterns (to filter reviews)
-    QUOTE_PATTERNS = [
-        r"^['\"].*['\"]$",
-        r"(?i)(beautiful|brilliant|stunning|masterpiece|compelling)",
-    ]
-
-    def __init__(self):
-        # Load authors database
-        self.known_authors = self._load_authors_database()
-        # Load publishers database
-        self.known_publishers = self._load_publishers_database()
-        # Load publisher imprints mapping
-        self.publisher_imprints = self._load_imprints_mapping()
-
-    def _load_authors_database(self):
-        """Load known authors from file"""
-        authors = set()
-        try:
-            if os.path.exists('known_authors.txt'):
-                with open('known_authors.txt', 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            authors.add(line.upper())
-        except Exception:
-            pass  # Continue without database if file missing
-        return authors
-
-    def _load_publishers_database(self):
-        """Load known publishers from file"""
-        publishers = set()
-        try:
-            if os.path.exists('known_publishers.txt'):
-                with open('known_publishers.txt', 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            publishers.add(line.upper())
-        except Exception:
-            pass
-        return publishers
-
-    def _load_imprints_mapping(self):
-        """Load imprint to publisher mapping"""
-        mapping = {}
-        try:
-            if os.path.exists('publisher_imprints.txt'):
-                with open('publisher_imprints.txt', 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            imprint, publisher = line.split('=', 1)
-                            mapping[imprint.strip().upper()] = publisher.strip().upper()
-        except Exception:
-            pass
-        return mapping
+    # Publisher keywords (text starting / ending with one, any case)
+    PUBLISHER_PREFIXES = ('PENGUIN', 'VINTAGE', 'HARPER', 'RANDOM', 'SIMON', 'MACMILLAN',
+                          'HACHETTE', 'SCHOLASTIC')
+    PUBLISHER_SUFFIXES = ('BOOK', 'BOOKS', 'PRESS', 'PUBLISHING', 'PUBLISHER', 'PUBLISHERS',
+                          'HOUSE', 'EDITION', 'EDITIONS')
+
+    # Review keywords (to filter quotes): anywhere, or anywhere in longer texts
+    QUOTE_WORDS = ('BEAUTIFUL', 'BRILLIANT', 'STUNNING', 'MASTERPIECE', 'COMPELLING')
+    REVIEW_WORDS = ('GRIPPING', 'UNFORGETTABLE')
+
+    QUOTED_RE = re.compile(r"^['\"].*['\"]$")
+    DIGIT_RE = re.compile(r'\d')
+
+    def __init__(self, lexicon: Optional[Lexicon] = None):
+        # Compiled author/publisher/imprint databases (cached artifact)
+        self.lexicon = lexicon or load_lexicon()
+        self.known_authors = set(self.lexicon.authors.entries)
+        self.known_publishers = set(self.lexicon.publishers.entries)
+        self.publisher_imprints = self.lexicon.imprint_map
+        # Publisher names a parse may end with (directly or through an imprint)
+        self.resolved_publishers = self.known_publishers | set(self.publisher_imprints.values())
+
+        # Fuzzy indexes (replace full SequenceMatcher scans of the databases)
+        self.author_index = self.lexicon.authors.index
+        self.publisher_index = self.lexicon.publishers.index
+        self.imprint_index = self.lexicon.imprints.index
+
+        # One automaton for publishers, imprints and keywords (see scan())
+        self.matcher = self._build_matcher()
+        # Publishers joined in one string: "is text part of a publisher name" is a
+        # single substring search (entries never contain the separator)
+        self.publisher_blob = '\n'.join(sorted(self.known_publishers))
+
+    def _build_matcher(self) -> AhoCorasick:
+        matcher = AhoCorasick()
+        for publisher in self.known_publishers:
+            matcher.add(publisher, ('publisher', publisher))
+        # Imprints are ranked by their publisher_imprints.txt line (imprint_map keeps
+        # file order): when several match, the first one listed wins
+        for order, (imprint, publisher) in enumerate(self.publisher_imprints.items()):
+            matcher.add(imprint, ('imprint', (order, publisher)))
+        for keyword in self.PUBLISHER_PREFIXES:
+            matcher.add(keyword, ('prefix', keyword))
+        for keyword in self.PUBLISHER_SUFFIXES:
+            matcher.add(keyword, ('suffix', keyword))
+        for keyword in self.QUOTE_WORDS:
+            matcher.add(keyword, ('quote', keyword))
+        for keyword in self.REVIEW_WORDS:
+            matcher.add(keyword, ('review', keyword))
+        return matcher.build()
+
+    def scan(self, text_upper: str) -> List[Tuple[int, int, str, object]]:
+        """Every publisher/imprint/keyword hit in an uppercase text: (start, end, kind, value)"""
+        return [(start, end, kind, value)
+                for start, end, (kind, value) in self.matcher.match(text_upper)]
 
     def parse(self, text_boxes: List[TextBox], image_height: int, image_width: int) -> BookInfo:
         """Parse book cover from detected text boxes"""
@@ -426,48 +1163,34 @@ class BookCoverParser:
 
         book = BookInfo(raw_texts=text_boxes)
 
-        # Calculate scores
-        scored = []
-        for box in merged:
-            position_y = (box.bbox[1] + box.bbox[3]) / 2
-            position_y_ratio = position_y / image_height
-
-            prominence = self._calculate_prominence(box, image_height, image_width)
-
-            scored.append({
-                'box': box,
-                'text': box.text,
-                'prominence': prominence,
-                'position_y': position_y,
-                'position_y_ratio': position_y_ratio,
-                'is_quote': self._is_quote_or_review(box.text)
-            })
+        # Features of every box, computed once and shared by all phases
+        scored = [BoxFeatures(self, box, image_height, image_width) for box in merged]
 
         # Sort by prominence
-        scored.sort(key=lambda x: x['prominence'], reverse=True)
+        scored.sort(key=lambda x: x.prominence, reverse=True)
 
         used_texts = set()
 
         # Find publisher
         for item in scored:
-            if item['text'] in used_texts or item['is_quote']:
+            if item.text in used_texts or item.is_quote:
                 continue
-            if self._is_likely_publisher(item['text'], item['position_y_ratio']):
-                book.publisher = item['text']
-                used_texts.add(item['text'])
+            if self._is_likely_publisher(item.text, item.position_y_ratio, item.hits):
+                book.publisher = item.text
+                used_texts.add(item.text)
                 break
 
         # Find author (with multi-block combination)
         author_candidates = []
         for item in scored:
-            if item['text'] in used_texts or item['is_quote']:
+            if item.text in used_texts or item.is_quote:
                 continue
 
             # Skip known imprints (OSCAR, BUR, etc.) - they're for publisher, not author
-            if item['text'].upper() in self.publisher_imprints:
+            if item.is_imprint:
                 continue
 
-            if self._is_likely_author(item['text'], item['position_y_ratio']):
+            if self._is_likely_author(item):
                 author_candidates.append(item)
 
         if author_candidates:
@@ -482,35 +1205,35 @@ class BookCoverParser:
             else:
                 # Fallback: use single best candidate
                 author_candidates.sort(key=lambda x: (
-                    x['position_y_ratio'] > 0.6,
-                    x['prominence']
+                    x.position_y_ratio > 0.6,
+                    x.prominence
                 ), reverse=True)
-                book.author = author_candidates[0]['text']
+                book.author = author_candidates[0].text
                 used_texts.add(book.author)
 
         # Find title
         title_candidates = []
         for item in scored:
-            if item['text'] in used_texts or item['is_quote']:
+            if item.text in used_texts or item.is_quote:
                 continue
-            if self._is_likely_title(item['text'], item['position_y_ratio']):
+            if self._is_likely_title(item):
                 title_candidates.append(item)
 
         if title_candidates:
-            title_candidates.sort(key=lambda x: x['position_y'])
+            title_candidates.sort(key=lambda x: x.position_y)
             title_parts = title_candidates[:3]
-            book.title = " ".join(item['text'] for item in title_parts)
-            book.confidence = sum(item['prominence'] for item in title_parts) / len(title_parts) / 10
+            book.title = " ".join(item.text for item in title_parts)
+            book.confidence = sum(item.prominence for item in title_parts) / len(title_parts) / 10
 
             for item in title_parts:
-                used_texts.add(item['text'])
+                used_texts.add(item.text)
 
         # Fallback: use most prominent unused text
         if not book.title:
             for item in scored:
-                if item['text'] not in used_texts and not item['is_quote']:
-                    book.title = item['text']
-                    book.confidence = item['prominence'] / 10
+                if item.text not in used_texts and not item.is_quote:
+                    book.title = item.text
+                    book.confidence = item.prominence / 10
                     break
 
         # Resolve imprints to actual publishers
@@ -519,6 +1242,25 @@ class BookCoverParser:
 
         return book
 
+    def score(self, book: BookInfo) -> float:
+        """
+        How far a parse can be trusted, 0..1 (drives OCR engine escalation).
+
+        Mean OCR confidence of the text (up to 0.4), author found in the
+        database (0.35) and publisher resolved to a known one (0.25).
+        A cover without a title scores 0.
+        """
+        if not book.title or not book.raw_texts:
+            return 0.0
+
+        ocr_confidence = sum(b.confidence for b in book.raw_texts) / len(book.raw_texts)
+        score = 0.4 * min(max(ocr_confidence, 0.0), 1.0)
+        if book.author and self._matches_author_database(book.author):
+            score += 0.35
+        if book.publisher and book.publisher.upper() in self.resolved_publishers:
+            score += 0.25
+        return score
+
     def _resolve_imprint_to_publisher(self, publisher_text: str) -> str:
         """Resolve imprint/series name to actual publisher"""
         publisher_upper = publisher_text.upper().strip()
@@ -534,9 +1276,9 @@ class BookCoverParser:
                 return self.publisher_imprints[word]
 
         # Check multi-word imprints (e.g., "BEST SELLERS OSCAR" contains "OSCAR")
-        for imprint, real_publisher in self.publisher_imprints.items():
-            if imprint in publisher_upper:
-                return real_publisher
+        imprints = [value for _, _, kind, value in self.scan(publisher_upper) if kind == 'imprint']
+        if imprints:
+            return min(imprints)[1]
 
         # No imprint found, return as-is
         return publisher_text
@@ -623,29 +1365,30 @@ class BookCoverParser:
 
         return size_score + font_score + position_score + conf_score
 
-    def _is_quote_or_review(self, text: str) -> bool:
-        """Check if text is a quote or review"""
-        for pattern in self.QUOTE_PATTERNS:
-            if re.search(pattern, text):
-                return True
+    def _is_quote_or_review(self, text: str, hits=None) -> bool:
+        """Check if text is a quote or review (hits: scan() of the uppercase text)"""
+        if hits is None:
+            hits = self.scan(text.upper())
+        kinds = {kind for _, _, kind, _ in hits}
+
+        if self.QUOTED_RE.search(text) or 'quote' in kinds:
+            return True
 
         if text.startswith(('\"', "'", '"', '"', ''', ''')) and \
            text.endswith(('\"', "'", '"', '"', ''', ''')):
             return True
 
-        if len(text) > 20 and any(word in text.lower() for word in
-                                 ['beautiful', 'brilliant', 'stunning', 'masterpiece',
-                                  'compelling', 'gripping', 'unforgettable']):
+        if len(text) > 20 and 'review' in kinds:
             return True
 
         return False
 
-    def _is_likely_title(self, text: str, position_y_ratio: float) -> bool:
+    def _is_likely_title(self, item: BoxFeatures) -> bool:
         """Check if text is likely the title"""
-        if self._is_quote_or_review(text):
+        if item.is_quote:
             return False
 
-        words = text.split()
+        words = item.words
 
         if len(words) < 2:
             return False
@@ -654,28 +1397,28 @@ class BookCoverParser:
         if any(w in self.TITLE_WORDS for w in words_upper):
             return True
 
-        if 0.1 < position_y_ratio < 0.65:
+        if 0.1 < item.position_y_ratio < 0.65:
             if len(words) >= 2 and sum(1 for w in words if w and w[0].isupper()) >= 2:
                 return True
 
         return False
 
-    def _is_likely_author(self, text: str, position_y_ratio: float) -> bool:
+    def _is_likely_author(self, item: BoxFeatures) -> bool:
         """Check if text is likely an author name"""
-        if self._is_quote_or_review(text):
+        if item.is_quote:
             return False
 
-        text_clean = text.strip().upper()
+        text_clean = item.upper.strip()
 
         # Check database first (strongest signal)
-        if self._matches_author_database(text_clean):
+        if item.in_author_db:
             return True
 
         # Original heuristics for texts not in database
         if len(text_clean) < 6 or len(text_clean) > 40:
             return False
 
-        if re.search(r'\d', text_clean):
+        if self.DIGIT_RE.search(text_clean):
             return False
 
         words = text_clean.split()
@@ -690,6 +1433,7 @@ class BookCoverParser:
         if not all(w[0].isupper() for w in words if w):
             return False
 
+        position_y_ratio = item.position_y_ratio
         if position_y_ratio < 0.35:
             return False
 
@@ -724,17 +1468,8 @@ class BookCoverParser:
                 return True
 
         # Fuzzy match for common OCR errors
-        # Check if text is very similar to known author (edit distance ≤ 2)
-        for known in self.known_authors:
-            if len(known) < 4:  # Skip short entries for fuzzy
-                continue
-            if abs(len(text_upper) - len(known)) > 2:
-                continue
-            # Simple similarity check
-            if self._similarity(text_upper, known) > 0.85:
-                return True
-
-        return False
+        # Check if text is very similar to known author (length within 2, entries ≥4 chars)
+        return self.author_index.has_match(text_upper, 0.85, max_length_diff=2, min_length=4)
 
     def _similarity(self, s1: str, s2: str) -> float:
         """Calculate string similarity (0-1)"""
@@ -743,7 +1478,8 @@ class BookCoverParser:
         # Use SequenceMatcher from difflib (already imported)
         return SequenceMatcher(None, s1, s2).ratio()
 
-    def _combine_author_blocks(self, author_candidates: list, all_scored: list, img_height: int) -> dict:
+    def _combine_author_blocks(self, author_candidates: List[BoxFeatures],
+                               all_scored: List[BoxFeatures], img_height: int) -> dict:
         """
         Try to combine adjacent blocks that are all author parts.
         E.g., "RICK" + "RIORDAN" -> "RICK RIORDAN"
@@ -751,45 +1487,41 @@ class BookCoverParser:
         if not author_candidates:
             return None
 
+        # Blocks by vertical position (window lookups instead of a scan per candidate)
+        # and by text; indexes keep the prominence order of all_scored
+        by_y = sorted(range(len(all_scored)), key=lambda i: all_scored[i].position_y)
+        ys = [all_scored[i].position_y for i in by_y]
+        same_text = collections.defaultdict(list)
+        for i, item in enumerate(all_scored):
+            same_text[item.text].append(i)
+        y_threshold = img_height * 0.1
+
         # Look for blocks in similar vertical position that could be name parts
         for candidate in author_candidates:
             # Find nearby blocks (within 10% vertical distance)
-            y_pos = candidate['position_y']
-            y_threshold = img_height * 0.1
-
-            nearby_blocks = []
-            for item in all_scored:
-                if item['text'] == candidate['text']:
-                    nearby_blocks.append(item)
-                    continue
-
-                # Check if vertically close
-                if abs(item['position_y'] - y_pos) < y_threshold:
-                    # Check if could be author part (in database or looks like name)
-                    text_upper = item['text'].upper()
-
-                    # Skip if it's a known imprint/series (OSCAR, BUR, etc.)
-                    if text_upper in self.publisher_imprints:
-                        continue
-
-                    if (text_upper in self.known_authors or
-                        self._looks_like_name_part(item['text'])):
-                        nearby_blocks.append(item)
+            y_pos = candidate.position_y
+            lo = bisect.bisect_right(ys, y_pos - y_threshold)
+            hi = bisect.bisect_left(ys, y_pos + y_threshold)
+            # Same text anywhere, plus vertically close blocks that could be author
+            # parts (in database or looks like name, never a known imprint)
+            nearby = set(same_text[candidate.text])
+            nearby.update(i for i in by_y[lo:hi] if all_scored[i].name_part)
+            nearby_blocks = [all_scored[i] for i in sorted(nearby)]
 
             # If we found multiple nearby blocks, combine them
             if len(nearby_blocks) >= 2:
                 # Sort left to right
-                nearby_blocks.sort(key=lambda x: x['box'].bbox[0])
+                nearby_blocks.sort(key=lambda x: x.box.bbox[0])
 
                 # Combine texts
-                combined_text = " ".join(b['text'] for b in nearby_blocks)
+                combined_text = " ".join(b.text for b in nearby_blocks)
 
                 # Check if combined result makes sense
                 if self._is_valid_author_name(combined_text):
                     return {
                         'text': combined_text,
-                        'parts': [b['text'] for b in nearby_blocks],
-                        'prominence': max(b['prominence'] for b in nearby_blocks)
+                        'parts': [b.text for b in nearby_blocks],
+                        'prominence': max(b.prominence for b in nearby_blocks)
                     }
 
         return None
@@ -806,7 +1538,7 @@ class BookCoverParser:
             return False
 
         # No numbers
-        if re.search(r'\d', text_clean):
+        if self.DIGIT_RE.search(text_clean):
             return False
 
         # All letters or all caps
@@ -842,9 +1574,11 @@ class BookCoverParser:
 
         return False
 
-    def _is_likely_publisher(self, text: str, position_y_ratio: float) -> bool:
-        """Check if text is likely a publisher"""
+    def _is_likely_publisher(self, text: str, position_y_ratio: float, hits=None) -> bool:
+        """Check if text is likely a publisher (hits: scan() of the uppercase text)"""
         text_upper = text.strip().upper()
+        if hits is None:
+            hits = self.scan(text.upper())
 
         # Check database first (strongest signal)
         if text_upper in self.known_publishers:
@@ -854,14 +1588,16 @@ class BookCoverParser:
         if text_upper in self.publisher_imprints:
             return True
 
-        # Check for partial matches in database
-        for known_pub in self.known_publishers:
-            if known_pub in text_upper or text_upper in known_pub:
-                return True
+        # Check for partial matches in database (publisher in text, text in publisher)
+        if any(kind == 'publisher' for _, _, kind, _ in hits):
+            return True
+        if '\n' not in text_upper and text_upper in self.publisher_blob:
+            return True
 
-        # Original pattern matching
-        for pattern in self.PUBLISHER_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
+        # Keywords at the start or end of the text (PENGUIN ..., ... BOOKS)
+        length = len(text.upper())  # hit spans index the uppercase text
+        for start, end, kind, _ in hits:
+            if (kind == 'prefix' and start == 0) or (kind == 'suffix' and end == length):
                 return True
 
         # Position-based heuristic (bottom of cover)
@@ -876,285 +1612,1735 @@ class BookCoverParser:
 # OCR EXECUTION
 # ============================================================================
 
-def run_ocr_easyocr(image_path):
-    """Run EasyOCR on image"""
-    try:
-        import easyocr
-    except ImportError:
-        print("❌ EasyOCR not installed. Install with: pip install easyocr")
-        sys.exit(1)
+class OCREngine:
+    """
+    OCR engine kept loaded for the whole session.
 
-    reader = easyocr.Reader(['en'], gpu=False)
-    results = reader.readtext(image_path)
+    Loading the model is the expensive part of every engine, so the scanner
+    creates one engine at startup, warms it up once and reuses it for every
+    book instead of constructing a new reader per scan.
+    """
 
-    text_boxes = []
-    for (bbox, text, conf) in results:
-        # Convert bbox to x1,y1,x2,y2
-        x1 = min(p[0] for p in bbox)
-        y1 = min(p[1] for p in bbox)
-        x2 = max(p[0] for p in bbox)
-        y2 = max(p[1] for p in bbox)
+    name = 'base'
+    # Engines that can detect text regions and then recognize only some of them
+    supports_regions = False
+
+    def __init__(self, lang='en'):
+        self.lang = lang
+        self.loaded = False
+        self.load_time = 0.0
+        self.warmup_time = 0.0
+        self.recognize_times = []
+
+    def load(self):
+        """Load the model (idempotent)"""
+        if self.loaded:
+            return
+        start = time.time()
+        self._load()
+        self.load_time = time.time() - start
+        self.loaded = True
+
+    def warm_up(self, shape=(480, 640, 3)):
+        """Run one recognition on a synthetic frame so lazy initialisation is paid upfront"""
+        self.load()
+        frame = np.full(shape, 255, dtype=np.uint8)
+        h, w = shape[:2]
+        scale = max(h, w) / 600
+        cv2.putText(frame, "WARM UP", (w // 8, h // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                    scale, (0, 0, 0), max(1, int(scale * 2)))
+
+        start = time.time()
+        self._recognize(frame)
+        self.warmup_time = time.time() - start
+
+    def recognize(self, image) -> List[TextBox]:
+        """Recognize text in an image (numpy array, BGR or grayscale)"""
+        self.load()
+        start = time.time()
+        text_boxes = self._recognize(image)
+        self.recognize_times.append(time.time() - start)
+        return text_boxes
+
+    def detect(self, image) -> List['TextRegion']:
+        """Text regions found by the detector, not recognized yet (supports_regions only)"""
+        self.load()
+        with METRICS.time('detection'):
+            return self._detect(image)
+
+    def recognize_regions(self, image, regions) -> List[TextBox]:
+        """Recognize the given detected regions of an image (supports_regions only)"""
+        if not regions:
+            return []
+        self.load()
+        with METRICS.time('recognition'):
+            return self._recognize_regions(image, regions)
+
+    def close(self):
+        """Release the model"""
+        self._close()
+        self.loaded = False
+
+    def timing_report(self):
+        """Startup vs steady-state timings (seconds)"""
+        times = self.recognize_times
+        return {
+            'load': self.load_time,
+            'warmup': self.warmup_time,
+            'startup': self.load_time + self.warmup_time,
+            'first_recognize': times[0] if times else 0.0,
+            'steady_recognize': (sum(times[1:]) / len(times[1:])) if len(times) > 1 else
+                                (times[0] if times else 0.0),
+            'recognitions': len(times),
+        }
 
-        text_boxes.append(TextBox(text, (x1, y1, x2, y2), conf))
+    def _load(self):
+        raise NotImplementedError
 
-    return text_boxes
+    def _recognize(self, image) -> List[TextBox]:
+        raise NotImplementedError
 
+    def _detect(self, image) -> List['TextRegion']:
+        raise NotImplementedError
 
-def run_ocr_tesseract(image_path):
-    """Run Tesseract OCR on image"""
-    try:
-        import pytesseract
-        from PIL import Image
-    except ImportError:
-        print("❌ Tesseract not installed. Install with: pip install pytesseract pillow")
-        sys.exit(1)
-
-    img = Image.open(image_path)
-    data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
-
-    text_boxes = []
-    for i in range(len(data['text'])):
-        if int(data['conf'][i]) > 0:
-            text = data['text'][i].strip()
-            if text:
-                x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
-                conf = int(data['conf'][i]) / 100.0
-                text_boxes.append(TextBox(text, (x, y, x + w, y + h), conf))
+    def _recognize_regions(self, image, regions) -> List[TextBox]:
+        raise NotImplementedError
 
-    return text_boxes
+    def _close(self):
+        pass
 
 
-def run_ocr_ppocr(image_path):
-    """Run PP-OCR on image"""
-    try:
-        from paddleocr import PaddleOCR
-    except ImportError:
-        print("❌ PaddleOCR not installed. Install with: pip install paddlepaddle paddleocr")
-        sys.exit(1)
+@dataclass
+class TextRegion:
+    """Text region found by the detector, before recognition"""
+    bbox: Tuple[float, float, float, float]  # x1, y1, x2, y2
+    confidence: float = 1.0  # detector score (1.0 when the detector gives none)
+    shape: object = None  # engine-specific geometry handed back to recognition
 
-    ocr = PaddleOCR(use_angle_cls=True, lang='en', use_gpu=False, show_log=False)
-    results = ocr.ocr(image_path, cls=True)
 
-    text_boxes = []
-    if results and results[0]:
-        for line in results[0]:
-            bbox = line[0]
-            text = line[1][0]
-            conf = line[1][1]
+def _quad_to_bbox(quad):
+    """Convert 4-point polygon to x1,y1,x2,y2"""
+    x1 = min(p[0] for p in quad)
+    y1 = min(p[1] for p in quad)
+    x2 = max(p[0] for p in quad)
+    y2 = max(p[1] for p in quad)
+    return (x1, y1, x2, y2)
 
-            x1 = min(p[0] for p in bbox)
-            y1 = min(p[1] for p in bbox)
-            x2 = max(p[0] for p in bbox)
-            y2 = max(p[1] for p in bbox)
 
-            text_boxes.append(TextBox(text, (x1, y1, x2, y2), conf))
+def _rotate_crop(image, quad):
+    """Perspective crop of a 4-point text region, turned upright if vertical (as PaddleOCR does)"""
+    points = np.float32(quad)
+    width = int(max(np.linalg.norm(points[0] - points[1]), np.linalg.norm(points[2] - points[3])))
+    height = int(max(np.linalg.norm(points[0] - points[3]), np.linalg.norm(points[1] - points[2])))
+    target = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    matrix = cv2.getPerspectiveTransform(points, target)
+    crop = cv2.warpPerspective(image, matrix, (max(1, width), max(1, height)),
+                               borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+    if crop.shape[0] >= crop.shape[1] * 1.5:
+        crop = np.rot90(crop)
+    return crop
 
-    return text_boxes
 
+class EasyOCREngine(OCREngine):
+    """EasyOCR (most accurate, slowest)"""
 
-# ============================================================================
-# CONTINUOUS SCANNER
-# ============================================================================
+    name = 'easyocr'
+    supports_regions = True
 
-class ContinuousScanner:
-    """Continuous book OCR scanner"""
+    def _load(self):
+        try:
+            import easyocr
+        except ImportError:
+            print("❌ EasyOCR not installed. Install with: pip install easyocr")
+            sys.exit(1)
 
-    def __init__(self, model='easyocr', auto_mode=False, preprocessing=True, debug=False):
-        self.model = model
-        self.auto_mode = auto_mode
-        self.preprocessing = preprocessing
-        self.debug = debug
-        self.book_count = 0
-        self.session_start = datetime.now()
+        from easyocr.utils import reformat_input
+        self.reader = easyocr.Reader([self.lang], gpu=False)
+        self.reformat_input = reformat_input
 
-        # Cleanup old temporary files
-        self._cleanup_temp_files()
+    def _inputs(self, image):
+        """(RGB image, grayscale image) as readtext() prepares them"""
+        # EasyOCR models expect RGB
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return self.reformat_input(image)
 
-        # Load calibration
-        self.loading_area = self._load_loading_area()
-        if self.loading_area is None:
-            print("❌ Error: Loading area not calibrated!")
-            print("   Run: python3 calibrate.py")
-            sys.exit(1)
+    def _recognize(self, image):
+        # readtext() split into its two steps, so detection and recognition are timed apart
+        return self.recognize_regions(image, self.detect(image))
 
-        # Initialize processors
-        self.preprocessor = BookCoverPreprocessor(debug=debug)
-        self.postprocessor = OCRPostProcessor(debug=debug)
-        self.parser = BookCoverParser()
+    def _detect(self, image):
+        image, _ = self._inputs(image)
+        horizontal_list, free_list = self.reader.detect(image, reformat=False)
+        # Axis-aligned boxes are [x_min, x_max, y_min, y_max], free ones 4-point polygons
+        regions = [TextRegion((x1, y1, x2, y2), shape=('horizontal', [x1, x2, y1, y2]))
+                   for x1, x2, y1, y2 in horizontal_list[0]]
+        regions += [TextRegion(_quad_to_bbox(quad), shape=('free', quad)) for quad in free_list[0]]
+        return regions
 
-        # Open camera
-        self.rtsp_url = RTSPConfig.get_url()
-        self.cap = cv2.VideoCapture(self.rtsp_url)
-        if not self.cap.isOpened():
-            print(f"❌ Error: Cannot open camera: {self.rtsp_url}")
-            sys.exit(1)
+    def _recognize_regions(self, image, regions):
+        _, image_grey = self._inputs(image)
+        horizontal_list = [r.shape[1] for r in regions if r.shape[0] == 'horizontal']
+        free_list = [r.shape[1] for r in regions if r.shape[0] == 'free']
+        results = self.reader.recognize(image_grey, horizontal_list, free_list, reformat=False)
+        return [TextBox(text, _quad_to_bbox(bbox), conf) for (bbox, text, conf) in results]
 
-    def _cleanup_temp_files(self):
-        """Remove old temporary and debug files"""
-        temp_files = [
-            'temp_ocr_input.jpg',
-            'test_images/debug_preprocessed_last.jpg'
-        ]
-        for f in temp_files:
-            if os.path.exists(f):
-                os.remove(f)
+    def _close(self):
+        self.reader = None
 
-    def _fuzzy_correct_with_databases(self, text):
-        """
-        Apply fuzzy matching with databases to automatically correct OCR errors
 
-        Instead of manually maintaining WORD_CORRECTIONS for every variant (OLMRQ, OLMDQ, OLMTQ, etc.),
-        this uses fuzzy matching to find similar words in author/publisher databases.
+class TesseractEngine(OCREngine):
+    """Tesseract (fast on clean, high-contrast images)"""
 
-        Example: "RIORD4N" → fuzzy match → "RIORDAN" (from database)
-        """
-        from difflib import SequenceMatcher
+    name = 'tesseract'
 
-        words = text.split()
-        corrected_words = []
+    def _load(self):
+        try:
+            import pytesseract
+            from PIL import Image
+        except ImportError:
+            print("❌ Tesseract not installed. Install with: pip install pytesseract pillow")
+            sys.exit(1)
 
-        for word in words:
-            if len(word) < 3:  # Skip very short words
-                corrected_words.append(word)
-                continue
+        self.pytesseract = pytesseract
+        self.Image = Image
 
-            word_upper = word.upper()
+    def _recognize(self, image):
+        pytesseract = self.pytesseract
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        data = pytesseract.image_to_data(self.Image.fromarray(image),
+                                         output_type=pytesseract.Output.DICT)
 
-            # Skip if word is a known imprint (exact match - will be handled by parser)
-            if word_upper in self.parser.publisher_imprints:
-                corrected_words.append(word)
-                continue
+        text_boxes = []
+        for i in range(len(data['text'])):
+            if int(float(data['conf'][i])) > 0:
+                text = data['text'][i].strip()
+                if text:
+                    x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
+                    conf = int(float(data['conf'][i])) / 100.0
+                    text_boxes.append(TextBox(text, (x, y, x + w, y + h), conf))
 
-            best_match = None
-            best_ratio = 0.80  # Minimum similarity threshold
-
-            # First check fuzzy match with imprints (catch common OCR errors like OSEAR → OSCAR)
-            for imprint in self.parser.publisher_imprints.keys():
-                ratio = SequenceMatcher(None, word_upper, imprint).ratio()
-                if ratio > 0.80:  # 80% threshold for imprints (OSEAR → OSCAR = 4/5 = 0.80)
-                    best_ratio = ratio
-                    best_match = imprint
-
-            # Check against known authors
-            for author in self.parser.known_authors:
-                ratio = SequenceMatcher(None, word_upper, author).ratio()
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_match = author
-
-            # Check against known publishers
-            for publisher in self.parser.known_publishers:
-                ratio = SequenceMatcher(None, word_upper, publisher).ratio()
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_match = publisher
-
-            # Check against publisher imprints
-            for imprint in self.parser.publisher_imprints.keys():
-                ratio = SequenceMatcher(None, word_upper, imprint).ratio()
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_match = imprint
+        return text_boxes
 
-            # Use best match if found, otherwise keep original
-            if best_match:
-                corrected_words.append(best_match.title())  # Title case for readability
+
+class PPOCREngine(OCREngine):
+    """PaddleOCR (fast, handles rotations)"""
+
+    name = 'ppocr'
+    supports_regions = True
+    # Recognized lines below this score are dropped (PaddleOCR's own default)
+    DROP_SCORE = 0.5
+
+    def _load(self):
+        try:
+            import paddleocr
+            from paddleocr import PaddleOCR
+        except ImportError:
+            print("❌ PaddleOCR not installed. Install with: pip install paddlepaddle 'paddleocr<3'")
+            sys.exit(1)
+        # 3.x replaced the ocr(det=, rec=, cls=) API and the recognizer used below
+        if not paddleocr.__version__.startswith('2.'):
+            print(f"❌ PaddleOCR {paddleocr.__version__} not supported. "
+                  "Install with: pip install 'paddleocr<3'")
+            sys.exit(1)
+
+        self.ocr = PaddleOCR(use_angle_cls=True, lang=self.lang, use_gpu=False, show_log=False)
+
+    def _recognize(self, image):
+        results = self.ocr.ocr(image, cls=True)
+
+        text_boxes = []
+        if results and results[0]:
+            for line in results[0]:
+                bbox = line[0]
+                text = line[1][0]
+                conf = line[1][1]
+                text_boxes.append(TextBox(text, _quad_to_bbox(bbox), conf))
+
+        return text_boxes
+
+    def _detect(self, image):
+        results = self.ocr.ocr(image, rec=False)
+        quads = results[0] if results and results[0] else []
+        return [TextRegion(_quad_to_bbox(quad), shape=quad) for quad in quads]
+
+    def _recognize_regions(self, image, regions):
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        # The line crops are angle-classified and recognized as one batch. ocr(det=False)
+        # is not used: depending on the 2.x release it reads a list as pages, not lines
+        crops = [_rotate_crop(image, region.shape) for region in regions]
+        crops, _, _ = self.ocr.text_classifier(crops)
+        lines, _ = self.ocr.text_recognizer(crops)
+        return [TextBox(text, region.bbox, conf) for region, (text, conf) in zip(regions, lines)
+                if text and conf >= self.DROP_SCORE]
+
+    def _close(self):
+        self.ocr = None
+
+
+class _FrameFeed:
+    """Blocking iterator of frames, used as an InferenceStream data source"""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        frame = self.queue.get()
+        if frame is None:
+            raise StopIteration
+        return frame
+
+    def put(self, frame):
+        self.queue.put(frame)
+
+    def close(self):
+        self.queue.put(None)
+
+
+class _InferenceRunner:
+    """
+    Long-lived Voyager InferenceStream fed from memory.
+
+    Frames are pushed into the stream's data source and results are read back
+    in order by a background thread, so several frames can be in flight
+    through the accelerator pipeline at once.
+    """
+
+    def __init__(self, create_inference_stream, network):
+        self.network = network
+        self.feed = _FrameFeed()
+        self.results = queue.Queue()
+        self.lock = threading.Lock()
+        self.stream = create_inference_stream(network=network, sources=[self.feed])
+        self.thread = threading.Thread(target=self._reader, name=f'stream-{network}', daemon=True)
+        self.thread.start()
+
+    def _reader(self):
+        try:
+            for frame_result in self.stream:
+                self.results.put(frame_result)
+        finally:
+            self.results.put(None)
+
+    def run(self, frames):
+        """Run frames (BGR arrays) through the network, returns FrameResults in order"""
+        with self.lock:
+            for frame in frames:
+                self.feed.put(frame)
+            results = []
+            for _ in frames:
+                result = self.results.get()
+                if result is None:
+                    raise RuntimeError(f"Inference stream {self.network} stopped")
+                results.append(result)
+            return results
+
+    def close(self):
+        self.feed.close()
+        self.thread.join(timeout=5)
+        self.stream.stop()
+
+
+class MetisPPOCREngine(OCREngine):
+    """
+    PP-OCRv3 on the Metis accelerator (Voyager SDK).
+
+    Runs the ppocr-det-rec cascade: text lines are decoded from the detector's
+    DB map inside the pipeline, each line is cropped from the cover and
+    recognized and CTC-decoded by the recognition network, so a whole cover
+    is a single frame through the stream.
+    """
+
+    name = 'metis-ppocr'
+
+    NETWORK = 'ppocr-det-rec'
+    DET_TASK = 'text_detection'
+    REC_TASK = 'text_recognition'
+
+    def _load(self):
+        try:
+            from axelera.app.stream import create_inference_stream
+        except ImportError:
+            print("❌ Voyager SDK not found. Activate it with: source ../voyager-sdk/venv/bin/activate")
+            sys.exit(1)
+
+        self.stream = _InferenceRunner(create_inference_stream, self.NETWORK)
+
+    def _recognize(self, image):
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+        result = self.stream.run([image])[0]
+        if self.DET_TASK not in result.meta:
+            return []
+
+        text_boxes = []
+        for line in result.meta[self.DET_TASK].objects:
+            recognized = line.get_secondary_meta(self.REC_TASK)
+            text = (recognized.label or '').strip() if recognized else ''
+            if text:
+                bbox = tuple(float(v) for v in line.box)
+                text_boxes.append(TextBox(text, bbox, float(line.score)))
+
+        # Reading order: top to bottom, then left to right
+        text_boxes.sort(key=lambda b: (b.bbox[1], b.bbox[0]))
+        return text_boxes
+
+    def _close(self):
+        if getattr(self, 'stream', None):
+            self.stream.close()
+        self.stream = None
+
+
+OCR_ENGINES = {
+    'tesseract': TesseractEngine,
+    'ppocr': PPOCREngine,
+    'easyocr': EasyOCREngine,
+    'metis-ppocr': MetisPPOCREngine,
+}
+
+
+def create_ocr_engine(model, lang='en'):
+    """Create (unloaded) OCR engine by name"""
+    if model not in OCR_ENGINES:
+        raise ValueError(f"Unknown OCR model: {model} (choose from {', '.join(OCR_ENGINES)})")
+    return OCR_ENGINES[model](lang=lang)
+
+
+def _run_ocr_once(model, image):
+    """One-shot OCR on an image array or file path (loads and releases the model)"""
+    if isinstance(image, str):
+        image = cv2.imread(image)
+    engine = create_ocr_engine(model)
+    try:
+        return engine.recognize(image)
+    finally:
+        engine.close()
+
+
+def run_ocr_easyocr(image):
+    """Run EasyOCR on image (numpy array or path)"""
+    return _run_ocr_once('easyocr', image)
+
+
+def run_ocr_tesseract(image):
+    """Run Tesseract OCR on image (numpy array or path)"""
+    return _run_ocr_once('tesseract', image)
+
+
+def run_ocr_ppocr(image):
+    """Run PP-OCR on image (numpy array or path)"""
+    return _run_ocr_once('ppocr', image)
+
+
+class ArchiveWriter:
+    """
+    Asynchronous image writer.
+
+    Encoding and writing JPEGs to the SD card is slow, so archived crops are
+    queued and written by a background thread instead of blocking the scan.
+    """
+
+    def __init__(self, max_pending=16):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.written = 0
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._worker, name='archive-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, path, image):
+        """Queue image for writing (dropped if the writer is too far behind)"""
+        try:
+            self.queue.put_nowait((path, image))
+        except queue.Full:
+            self.dropped += 1
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            path, image = item
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                cv2.imwrite(path, image)
+                self.written += 1
+            except Exception as e:
+                print(f"\n⚠️  Archive write failed ({path}): {e}")
+            finally:
+                self.queue.task_done()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        self.queue.put(None)
+        self.thread.join()
+
+
+# ============================================================================
+# OCR WORKER POOL
+# ============================================================================
+
+def _attach_shared_memory(name):
+    """Attach to a segment owned (and unlinked) by the parent process"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: spawned workers share the parent's resource tracker,
+        # so the duplicate registration is harmless
+        return shared_memory.SharedMemory(name=name)
+
+
+def _ocr_worker_main(model, lang, tasks, results):
+    """OCR worker process: load engine once, then recognize crops from shared memory"""
+    engine = create_ocr_engine(model, lang)
+    engine.load()
+    results.put(('ready', None, engine.load_time))
+    # Detection/recognition timings go back with each result (see OCRProcessPool._collect)
+    METRICS.forward = []
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        job_id, shm_name, shape, dtype = task
+        try:
+            if shm_name is None:
+                # Warm-up request: shape only
+                engine.warm_up(shape)
+                results.put((job_id, [], engine.warmup_time, METRICS.forwarded()))
+                continue
+
+            shm = _attach_shared_memory(shm_name)
+            try:
+                image = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                boxes = engine.recognize(image)
+                del image
+            finally:
+                shm.close()
+            results.put((job_id, [(b.text, tuple(float(v) for v in b.bbox), float(b.confidence))
+                                  for b in boxes], engine.recognize_times[-1],
+                         METRICS.forwarded()))
+        except Exception as e:
+            results.put((job_id, None, f"{type(e).__name__}: {e}", METRICS.forwarded()))
+
+    engine.close()
+
+
+class OCRProcessPool(OCREngine):
+    """
+    OCR engine running in N worker processes, each with its own warm model.
+
+    Inference in a single process is limited by the GIL-bound scanner loop;
+    with one process per core group the engines run truly in parallel.
+    Crops are passed through reusable shared-memory slots (no pickling of
+    pixel data) and recognize() can be called from several threads at once.
+    Use map() to get results for many images in submission order.
+    """
+
+    def __init__(self, model, workers, lang='en'):
+        super().__init__(lang=lang)
+        self.model = model
+        self.workers = workers
+        self.name = f'{model}x{workers}'
+        self.processes = []
+        self.task_queues = []
+        self.in_flight = []
+        self.futures = {}
+        self.job_ids = itertools.count()
+        self.lock = threading.Lock()
+        # Two slots per worker: one being recognized, one being filled
+        self.free_slots = queue.Queue()
+        self.slots = []
+        self.results = None
+        self.dispatcher = None
+
+    def _load(self):
+        ctx = multiprocessing.get_context('spawn')
+        self.results = ctx.Queue()
+        for i in range(self.workers):
+            tasks = ctx.Queue()
+            proc = ctx.Process(target=_ocr_worker_main, name=f'ocr-worker-{i}',
+                               args=(self.model, self.lang, tasks, self.results), daemon=True)
+            proc.start()
+            self.processes.append(proc)
+            self.task_queues.append(tasks)
+            self.in_flight.append(0)
+
+        ready = 0
+        while ready < self.workers:
+            try:
+                msg = self.results.get(timeout=1.0)
+            except queue.Empty:
+                if not all(p.is_alive() for p in self.processes):
+                    self._terminate()
+                    raise RuntimeError(f"OCR worker failed to start ({self.model})")
+                continue
+            if msg[0] == 'ready':
+                ready += 1
+
+        for _ in range(2 * self.workers):
+            self.free_slots.put(len(self.slots))
+            self.slots.append(None)
+
+        self.dispatcher = threading.Thread(target=self._collect, name='ocr-pool-results',
+                                           daemon=True)
+        self.dispatcher.start()
+
+    def _collect(self):
+        """Route results from worker processes to their futures"""
+        while True:
+            msg = self.results.get()
+            if msg is None:
+                break
+            job_id, boxes, info, timings = msg
+            for stage, seconds in timings:
+                METRICS.record(stage, seconds)
+            with self.lock:
+                future, worker, slot = self.futures.pop(job_id)
+                self.in_flight[worker] -= 1
+            if slot is not None:
+                self.free_slots.put(slot)
+                if boxes is not None:
+                    self.recognize_times.append(info)
+            if boxes is None:
+                future.set_exception(RuntimeError(info))
             else:
-                corrected_words.append(word)
+                future.set_result([TextBox(text, bbox, conf) for text, bbox, conf in boxes])
+
+    def _send(self, shm_name, shape, dtype, slot=None, worker=None):
+        future = concurrent.futures.Future()
+        with self.lock:
+            if worker is None:
+                # Least busy worker
+                worker = min(range(self.workers), key=lambda w: self.in_flight[w])
+            job_id = next(self.job_ids)
+            self.futures[job_id] = (future, worker, slot)
+            self.in_flight[worker] += 1
+        self.task_queues[worker].put((job_id, shm_name, shape, dtype))
+        return future
+
+    def submit(self, image) -> concurrent.futures.Future:
+        """Queue image for recognition (blocks while all slots are busy)"""
+        self.load()
+        image = np.ascontiguousarray(image)
+        slot = self.free_slots.get()
+
+        shm = self.slots[slot]
+        if shm is None or shm.size < image.nbytes:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+            shm = shared_memory.SharedMemory(create=True, size=max(image.nbytes, 1))
+            self.slots[slot] = shm
+        np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)[...] = image
+
+        return self._send(shm.name, image.shape, image.dtype.str, slot=slot)
+
+    def map(self, images):
+        """Recognize many images in parallel, yielding results in submission order"""
+        pending = collections.deque()
+        for image in images:
+            pending.append(self.submit(image))
+            while pending and pending[0].done():
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def warm_up(self, shape=(480, 640, 3)):
+        """Warm up every worker process"""
+        self.load()
+        start = time.time()
+        futures = [self._send(None, shape, 'uint8', worker=w) for w in range(self.workers)]
+        concurrent.futures.wait(futures)
+        self.warmup_time = time.time() - start
+
+    def recognize(self, image) -> List[TextBox]:
+        """Recognize one image (callable from several threads at once)"""
+        return self.submit(image).result()
+
+    def _terminate(self):
+        for proc in self.processes:
+            if proc.is_alive():
+                proc.terminate()
+        self.processes = []
+
+    def _close(self):
+        if self.results is None:
+            return
+        for tasks in self.task_queues:
+            tasks.put(None)
+        for proc in self.processes:
+            proc.join(timeout=5.0)
+        self._terminate()
+        self.results.put(None)
+        self.dispatcher.join(timeout=2.0)
+        for shm in self.slots:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self.slots = []
+        self.free_slots = queue.Queue()
+        self.task_queues = []
+        self.in_flight = []
+        self.results = None
 
-        return ' '.join(corrected_words)
 
-    def _load_loading_area(self):
-        """Load loading area coordinates"""
-        config_file = 'test_images/loading_area.txt'
-        if not os.path.exists(config_file):
-            return None
+# ============================================================================
+# FRAME CAPTURE
+# ============================================================================
 
-        with open(config_file, 'r') as f:
-            coords = f.readline().strip()
-            return tuple(map(int, coords.split(',')))
+class BookPresenceDetector:
+    """
+    Detect when a new book has been placed in the loading area and is still.
+
+    Works on a downscaled, blurred grayscale copy of the loading area:
+      - difference to the empty-area background → is a book present?
+      - difference to the previous frame → is it still moving?
+    A trigger fires once per placement, when a book has been still for
+    stable_time seconds and differs from the last book scanned. Frames with
+    an empty area or the same book are skipped.
+    """
 
-    def capture_and_crop(self):
-        """Capture FRESH frame and crop to loading area"""
-        # Wait for camera stabilization
-        time.sleep(0.5)
+    def __init__(self, stable_time=0.5, motion_threshold=4.0, presence_threshold=12.0,
+                 change_threshold=12.0, size=96):
+        self.stable_time = stable_time
+        self.motion_threshold = motion_threshold
+        self.presence_threshold = presence_threshold
+        self.change_threshold = change_threshold
+        self.size = size
+
+        self.background = None
+        self.previous = None
+        self.still_since = None
+        self.last_scanned = None
+        self.state = 'empty'
+
+    def _signature(self, image):
+        """Small blurred grayscale thumbnail (float32)"""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        h, w = gray.shape[:2]
+        scale = self.size / max(h, w)
+        small = cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))),
+                           interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(small, (5, 5), 0).astype(np.float32)
+
+    @staticmethod
+    def _diff(a, b):
+        return float(np.mean(np.abs(a - b)))
+
+    def update(self, roi, timestamp) -> bool:
+        """Feed a loading-area frame; True when a new, still book should be scanned"""
+        sig = self._signature(roi)
+        if self.background is None:
+            # Loading area is assumed empty at startup
+            self.background = sig
+            self.previous = sig
+            return False
+
+        motion = self._diff(sig, self.previous)
+        self.previous = sig
+
+        if motion > self.motion_threshold:
+            self.still_since = None
+            self.state = 'moving'
+            return False
+        if self.still_since is None:
+            self.still_since = timestamp
+        if timestamp - self.still_since < self.stable_time:
+            return False
+
+        if self._diff(sig, self.background) < self.presence_threshold:
+            # Empty and still: follow slow lighting changes, allow re-scan of same book
+            cv2.accumulateWeighted(sig, self.background, 0.05)
+            self.last_scanned = None
+            self.state = 'empty'
+            return False
+
+        if self.last_scanned is not None and \
+                self._diff(sig, self.last_scanned) < self.change_threshold:
+            self.state = 'present'
+            return False
+
+        self.last_scanned = sig
+        self.state = 'present'
+        return True
+
+
+class FrameGrabber:
+    """
+    Background capture thread holding the latest decoded frame.
+
+    Reading continuously keeps the RTSP buffer drained, so a fresh frame is
+    always available without sleeping and flushing. With a detector, every
+    frame is checked and triggered frames are queued for scanning.
+    """
 
-        # Flush RTSP buffer (30 frames = 1 second at 30fps)
-        for _ in range(30):
+    def __init__(self, cap, loading_area, detector: Optional[BookPresenceDetector] = None,
+                 scale=1.0):
+        self.cap = cap
+        # None when the capture pipeline already delivers the (scaled) loading area
+        self.loading_area = loading_area
+        self.scale = scale
+        self.detector = detector
+        self.triggers = queue.Queue(maxsize=8)
+
+        self.condition = threading.Condition()
+        self.frame = None
+        self.frame_time = 0.0
+        self.frame_count = 0
+        self.read_failures = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, name='frame-grabber', daemon=True)
+        self.thread.start()
+
+    def crop(self, frame):
+        if self.loading_area is None:
+            return frame
+        x1, y1, x2, y2 = self.loading_area
+        roi = frame[y1:y2, x1:x2]
+        if self.scale != 1.0:
+            roi = cv2.resize(roi, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return roi
+
+    def _worker(self):
+        while self.running:
             ret, frame = self.cap.read()
+            now = time.time()
             if not ret:
-                return None, None
-            time.sleep(0.01)
+                self.read_failures += 1
+                time.sleep(0.1)
+                continue
 
-        # Get fresh frame
-        ret, frame = self.cap.read()
-        if not ret:
-            return None, None
+            with self.condition:
+                self.frame = frame
+                self.frame_time = now
+                self.frame_count += 1
+                self.condition.notify_all()
+
+            if self.detector and self.detector.update(self.crop(frame), now):
+                # Books wait here while the pipeline is full; drop the oldest if
+                # the operator is far ahead
+                if self.triggers.full():
+                    try:
+                        self.triggers.get_nowait()
+                    except queue.Empty:
+                        pass
+                self.triggers.put((frame, now))
+
+    def latest(self, newer_than=0.0, timeout=5.0):
+        """Latest frame captured after newer_than (None on timeout)"""
+        deadline = time.time() + timeout
+        with self.condition:
+            while self.frame is None or self.frame_time <= newer_than:
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self.running:
+                    return None
+                self.condition.wait(remaining)
+            return self.frame
+
+    def next_trigger(self, timeout=None):
+        """Next frame with a newly placed, still book (None on timeout)"""
+        try:
+            frame, _ = self.triggers.get(timeout=timeout)
+            return frame
+        except queue.Empty:
+            return None
 
-        # Crop to loading area
-        x1, y1, x2, y2 = self.loading_area
-        cropped = frame[y1:y2, x1:x2]
+    def stop(self):
+        self.running = False
+        self.thread.join(timeout=2.0)
 
-        return frame, cropped
 
-    def run_ocr(self, image, timestamp=None):
-        """Run OCR with preprocessing and postprocessing"""
-        # Preprocess
-        if self.preprocessing:
-            print(f"   └─ Preprocessing image...", end='', flush=True)
-            if self.model == 'tesseract':
-                preprocessed = self.preprocessor.preprocess_for_tesseract(image)
-            elif self.model == 'ppocr':
-                preprocessed = self.preprocessor.preprocess_for_ppocr(image)
-            else:  # easyocr
-                preprocessed = self.preprocessor.preprocess_for_easyocr(image)
+def gstreamer_available():
+    """True if OpenCV was built with the GStreamer backend"""
+    return bool(re.search(r'GStreamer:\s*YES', cv2.getBuildInformation()))
 
-            temp_path = 'temp_ocr_input.jpg'
-            cv2.imwrite(temp_path, preprocessed)
 
-            # Save debug image if debug mode (overwrite same file each time)
-            if self.debug:
-                debug_path = 'test_images/debug_preprocessed_last.jpg'
-                cv2.imwrite(debug_path, preprocessed)
-                print(f" ✅ (debug: {debug_path})")
+def _scaled_size(loading_area, scale):
+    """Loading area size after scaling (even, as YUV video formats need)"""
+    x1, y1, x2, y2 = loading_area
+    return (max(2, int((x2 - x1) * scale) // 2 * 2),
+            max(2, int((y2 - y1) * scale) // 2 * 2))
+
+
+def build_rtsp_pipeline(url, loading_area, scale=1.0, latency=200, protocol=''):
+    """
+    GStreamer pipeline delivering only the loading area of an RTSP camera.
+
+    Same source chain as the Voyager SDK RTSP input (rtspsrc → RTP caps →
+    decodebin, hardware decoders allowed); the crop and optional downscale
+    run in the pipeline on the decoded YUV frame, so only the loading area is
+    converted to BGR. The appsink keeps just the latest frame.
+    """
+    parts = urllib.parse.urlsplit(url)
+    location = urllib.parse.urlunsplit(
+        (parts.scheme, parts.hostname + (f':{parts.port}' if parts.port else ''),
+         parts.path, parts.query, ''))
+    source = f'rtspsrc location="{location}" latency={latency}'
+    if parts.username:
+        source += f' user-id="{urllib.parse.unquote(parts.username)}"'
+    if parts.password:
+        source += f' user-pw="{urllib.parse.unquote(parts.password)}"'
+    if protocol in ('tcp', 'udp'):
+        source += f' protocols={protocol}'
+
+    x1, y1 = loading_area[:2]
+    width, height = _scaled_size(loading_area, 1.0)
+    # right/bottom -1: videocrop takes whatever remains to match the caps after it
+    elements = [
+        source,
+        'application/x-rtp,media=video',
+        'decodebin force-sw-decoders=false',
+        f'videocrop left={x1} top={y1} right=-1 bottom=-1',
+        f'video/x-raw,width={width},height={height}',
+    ]
+    if scale != 1.0:
+        width, height = _scaled_size(loading_area, scale)
+        elements += ['videoscale', f'video/x-raw,width={width},height={height}']
+    elements += [
+        'videoconvert',
+        'video/x-raw,format=BGR',
+        'appsink max-buffers=1 drop=true sync=false',
+    ]
+    return ' ! '.join(elements)
+
+
+def open_camera(url, loading_area, scale=1.0, backend='gstreamer'):
+    """
+    Open the camera, preferring the GStreamer pipeline.
+
+    Returns (cap, cropped): cropped is True when frames are already the
+    (scaled) loading area. Falls back to OpenCV's own RTSP decoding when
+    OpenCV has no GStreamer backend or the pipeline cannot be opened.
+    """
+    if backend == 'gstreamer':
+        if not gstreamer_available():
+            print("⚠️  OpenCV built without GStreamer: decoding full frames in software")
+        else:
+            pipeline = build_rtsp_pipeline(url, loading_area, scale,
+                                           protocol=os.getenv('RTSP_PROTOCOL', '').lower())
+            cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+            if cap.isOpened():
+                return cap, True
+            cap.release()
+            print("⚠️  GStreamer capture pipeline failed to start: decoding full frames in software")
+
+    cap = cv2.VideoCapture(url)
+    return cap, False
+
+
+# ============================================================================
+# COVER CACHE
+# ============================================================================
+
+COVER_CACHE_FILE = 'cover_cache.json'
+
+
+def _hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class CoverCache:
+    """
+    Results of recently scanned covers, keyed by perceptual hash of the crop.
+
+    A cover matches a cached one when both its pHash (DCT) and dHash (gradient)
+    are within a small Hamming distance, and enough ORB features of the two
+    crops match (covers of one series share layout and colours, so the hashes
+    alone are not enough). Least recently used entries are evicted beyond
+    max_entries; the cache is saved to disk as JSON and reloaded next session.
+    """
+
+    PHASH_DISTANCE = 10
+    DHASH_DISTANCE = 12
+    ORB_FEATURES = 64
+    ORB_MAX_DISTANCE = 48
+    ORB_MIN_MATCHES = 0.35  # fraction of the smaller descriptor set
+    SAVE_EVERY = 10
+
+    def __init__(self, path=COVER_CACHE_FILE, max_entries=500):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()  # id → entry, oldest first
+        self.next_id = 0
+        self.lock = threading.Lock()
+        self.unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        self.lookup_time = 0.0
+        self.matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
+        self._load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _gray(image):
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+    @staticmethod
+    def _bits_to_int(bits):
+        return int(''.join('1' if b else '0' for b in bits.ravel()), 2)
+
+    @classmethod
+    def hashes(cls, image):
+        """64-bit (pHash, dHash) of a cover crop"""
+        gray = cls._gray(image)
+        small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+        dct = cv2.dct(small)[:8, :8]
+        phash = cls._bits_to_int(dct > np.median(dct.ravel()[1:]))  # DC term excluded
+        tiny = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        dhash = cls._bits_to_int(tiny[:, 1:] > tiny[:, :-1])
+        return phash, dhash
+
+    def fingerprint(self, image):
+        """(pHash, dHash, ORB descriptors) of a cover crop"""
+        gray = self._gray(image)
+        phash, dhash = self.hashes(gray)
+
+        # ORB on a fixed-width copy, so crops of any size compare alike
+        scale = 256 / gray.shape[1]
+        norm = cv2.resize(gray, (256, max(1, int(gray.shape[0] * scale))))
+        # (ORB detectors are not shared between preprocessing threads)
+        orb = cv2.ORB_create(nfeatures=self.ORB_FEATURES)
+        _, descriptors = orb.detectAndCompute(norm, None)
+        if descriptors is None:
+            descriptors = np.empty((0, 32), np.uint8)
+        return phash, dhash, descriptors
+
+    def _orb_match(self, a, b):
+        if len(a) == 0 or len(b) == 0:
+            return False
+        matches = self.matcher.match(a, b)
+        good = sum(1 for m in matches if m.distance < self.ORB_MAX_DISTANCE)
+        return good >= self.ORB_MIN_MATCHES * min(len(a), len(b))
+
+    def lookup(self, fingerprint) -> Optional[dict]:
+        """Cached result of a matching cover, or None"""
+        start = time.time()
+        phash, dhash, descriptors = fingerprint
+        with self.lock:
+            # Closest hashes first, ORB only for the few candidates
+            candidates = []
+            for key, entry in self.entries.items():
+                distance = _hamming(phash, entry['phash'])
+                if distance <= self.PHASH_DISTANCE and \
+                        _hamming(dhash, entry['dhash']) <= self.DHASH_DISTANCE:
+                    candidates.append((distance, key))
+            result = None
+            for _, key in sorted(candidates):
+                entry = self.entries[key]
+                if self._orb_match(descriptors, entry['orb']):
+                    self.entries.move_to_end(key)
+                    result = dict(entry['result'])
+                    break
+            if result is None:
+                self.misses += 1
             else:
-                print(" ✅")
+                self.hits += 1
+            self.lookup_time += time.time() - start
+        return result
+
+    def put(self, fingerprint, result):
+        """Store the result of a newly scanned cover"""
+        phash, dhash, descriptors = fingerprint
+        with self.lock:
+            self.entries[self.next_id] = {
+                'phash': phash, 'dhash': dhash, 'orb': descriptors, 'result': dict(result),
+            }
+            self.next_id += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.unsaved += 1
+            if self.unsaved >= self.SAVE_EVERY:
+                self._save()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'avg_lookup': self.lookup_time / lookups if lookups else 0.0,
+                'entries': len(self.entries),
+            }
+
+    def close(self):
+        with self.lock:
+            if self.unsaved:
+                self._save()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for item in data['entries'][-self.max_entries:]:
+                orb = np.frombuffer(bytes.fromhex(item['orb']), np.uint8).reshape(-1, 32)
+                self.entries[self.next_id] = {
+                    'phash': int(item['phash'], 16), 'dhash': int(item['dhash'], 16),
+                    'orb': orb, 'result': item['result'],
+                }
+                self.next_id += 1
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Cover cache {self.path} unreadable ({e}), starting empty")
+            self.entries.clear()
+
+    def _save(self):
+        data = {'entries': [
+            {'phash': f"{e['phash']:016x}", 'dhash': f"{e['dhash']:016x}",
+             'orb': e['orb'].tobytes().hex(), 'result': e['result']}
+            for e in self.entries.values()
+        ]}
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.unsaved = 0
+
+
+# ============================================================================
+# CATALOGUE
+# ============================================================================
+
+CATALOGUE_FILE = 'catalogue.db'
+LEGACY_LOG_FILE = 'ocr_results.csv'
+EXPORT_FIELDS = ('timestamp', 'title', 'author', 'publisher', 'confidence', 'isbn',
+                 'cover_hash', 'engine', 'image', 'raw_text')
+
+ISBN_RE = re.compile(r'(ISBN(?:-1[03])?:?\s*)?((?:97[89][\s-]?)?(?:\d[\s-]?){9}[\dXx])',
+                     re.IGNORECASE)
+
+
+def normalize_key(text):
+    """Catalogue lookup key: uppercase ASCII letters/digits, single spaces"""
+    if not text or text == '[not identified]':
+        return ''
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.sub(r'[^A-Z0-9]+', ' ', text.upper()).split())
+
+
+def _isbn_valid(digits):
+    if len(digits) == 10:
+        total = sum((10 - i) * (10 if c == 'X' else int(c)) for i, c in enumerate(digits))
+        return total % 11 == 0
+    if len(digits) == 13 and digits.isdigit():
+        total = sum(int(c) * (3 if i % 2 else 1) for i, c in enumerate(digits))
+        return total % 10 == 0
+    return False
+
+
+def extract_isbn(texts):
+    """
+    First ISBN with a valid check digit in the OCR texts ('' if none).
+    Bare 10-digit numbers (phone numbers, prices) only count after "ISBN".
+    """
+    for text in texts:
+        for match in ISBN_RE.finditer(text):
+            digits = re.sub(r'[\s-]', '', match.group(2)).upper()
+            if len(digits) == 10 and not match.group(1):
+                continue
+            if _isbn_valid(digits):
+                return digits
+    return ''
+
+
+class CatalogueStore:
+    """
+    Book catalogue in SQLite (WAL mode).
+
+    Scanned books are queued and written by a background thread in batched
+    transactions, so logging never blocks the scan. Normalized title/author,
+    ISBN and cover hash are indexed: duplicate checks and lookups are B-tree
+    searches however large the library grows. Raw OCR boxes are kept as JSON.
+    Readers get their own connection per thread (WAL lets them read while
+    the writer commits).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS books (
+            id          INTEGER PRIMARY KEY,
+            timestamp   TEXT NOT NULL,
+            title       TEXT,
+            author      TEXT,
+            publisher   TEXT,
+            confidence  REAL,
+            title_key   TEXT NOT NULL DEFAULT '',
+            author_key  TEXT NOT NULL DEFAULT '',
+            isbn        TEXT NOT NULL DEFAULT '',
+            cover_hash  TEXT NOT NULL DEFAULT '',
+            engine      TEXT,
+            image       TEXT,
+            raw_text    TEXT,
+            raw_boxes   TEXT
+        );
+        CREATE INDEX IF NOT EXISTS books_title_author ON books (title_key, author_key);
+        CREATE INDEX IF NOT EXISTS books_author ON books (author_key);
+        CREATE INDEX IF NOT EXISTS books_isbn ON books (isbn);
+        CREATE INDEX IF NOT EXISTS books_cover ON books (cover_hash);
+        CREATE INDEX IF NOT EXISTS books_timestamp ON books (timestamp);
+    """
+
+    def __init__(self, path=CATALOGUE_FILE, batch_size=32, flush_interval=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.local = threading.local()
+        self.readers = []
+        self.lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+
+        created = not os.path.exists(path)
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+        conn.commit()
+        if created and os.path.exists(LEGACY_LOG_FILE):
+            self.imported = self.import_csv(LEGACY_LOG_FILE, conn)
         else:
-            temp_path = 'temp_ocr_input.jpg'
-            cv2.imwrite(temp_path, image)
+            self.imported = 0
+        conn.close()
+
+        self.thread = threading.Thread(target=self._writer, name='catalogue-writer', daemon=True)
+        self.thread.start()
+
+    def _connect(self):
+        # Readers are closed by close(), from the scanner's thread
+        conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _reader(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = self._connect()
+            with self.lock:
+                self.readers.append(conn)
+        return conn
 
-        # Run OCR
-        print(f"   └─ Text detection & recognition...", end='', flush=True)
+    @staticmethod
+    def record(timestamp, book_info, text_boxes=(), cover_hash=None, engine=None, image=None):
+        """Catalogue row for a parsed book (book_info: scanner result dict)"""
+        texts = [b.text for b in text_boxes]
+        return {
+            'timestamp': timestamp,
+            'title': book_info['title'],
+            'author': book_info['author'],
+            'publisher': book_info['publisher'],
+            'confidence': float(book_info['confidence']),
+            'title_key': normalize_key(book_info['title']),
+            'author_key': normalize_key(book_info['author']),
+            'isbn': extract_isbn(texts),
+            'cover_hash': f'{cover_hash:016x}' if cover_hash is not None else '',
+            'engine': engine,
+            'image': image,
+            'raw_text': book_info.get('raw_text', ''),
+            'raw_boxes': json.dumps([
+                {'text': b.text, 'bbox': [float(v) for v in b.bbox],
+                 'confidence': float(b.confidence)} for b in text_boxes
+            ], ensure_ascii=False),
+        }
 
-        if self.model == 'tesseract':
-            text_boxes = run_ocr_tesseract(temp_path)
-        elif self.model == 'ppocr':
-            text_boxes = run_ocr_ppocr(temp_path)
-        else:  # easyocr
-            text_boxes = run_ocr_easyocr(temp_path)
+    def add(self, record):
+        """Queue a book for writing"""
+        self.queue.put(record)
+
+    def _insert(self, conn, records):
+        columns = list(records[0])
+        conn.executemany(
+            f"INSERT INTO books ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)})", records)
+
+    def _writer(self):
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            batch = []
+            deadline = time.time() + self.flush_interval
+            # Collect a batch: up to batch_size books or flush_interval seconds
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.time()))
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+            try:
+                with conn:  # one transaction per batch
+                    self._insert(conn, batch)
+                self.written += len(batch)
+            except sqlite3.Error as e:
+                self.failed += len(batch)
+                print(f"\n⚠️  Catalogue write failed ({len(batch)} book(s)): {e}")
+        conn.close()
+
+    def find(self, title=None, author=None, isbn=None, cover_hash=None, limit=10):
+        """Earlier scans with the same normalized title/author, ISBN or cover hash"""
+        clauses, params = [], []
+        if isbn:
+            clauses.append('isbn = ?')
+            params.append(isbn)
+        if cover_hash is not None:
+            clauses.append('cover_hash = ?')
+            params.append(f'{cover_hash:016x}' if isinstance(cover_hash, int) else cover_hash)
+        title_key, author_key = normalize_key(title), normalize_key(author)
+        if title_key and author_key:
+            clauses.append('(title_key = ? AND author_key = ?)')
+            params += [title_key, author_key]
+        elif title_key:
+            clauses.append('title_key = ?')
+            params.append(title_key)
+        elif author_key:
+            clauses.append('author_key = ?')
+            params.append(author_key)
+        if not clauses:
+            return []
+        # UNION of single-index lookups (an OR would scan the table)
+        query = ' UNION '.join(f'SELECT * FROM books WHERE {c}' for c in clauses)
+        rows = self._reader().execute(
+            f'SELECT * FROM ({query}) ORDER BY timestamp DESC LIMIT ?',
+            params + [limit]).fetchall()
+        return [dict(row) for row in rows]
+
+    def find_duplicates(self, record, limit=10):
+        """Earlier scans of the book in record (same ISBN, cover hash or title+author)"""
+        # A title or an author alone is not the same book (other books by the author)
+        named = record['title_key'] and record['author_key']
+        return self.find(title=record['title'] if named else None,
+                         author=record['author'] if named else None,
+                         isbn=record['isbn'] or None,
+                         cover_hash=record['cover_hash'] or None, limit=limit)
+
+    def count(self):
+        return self._reader().execute('SELECT COUNT(*) FROM books').fetchone()[0]
+
+    def import_csv(self, path, conn=None):
+        """Import a legacy ocr_results.csv log (timestamp,title,author,publisher,confidence)"""
+        own = conn is None
+        conn = conn or self._connect()
+        records = []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                try:
+                    book = {'title': row['title'], 'author': row['author'],
+                            'publisher': row['publisher'],
+                            'confidence': float(row['confidence'] or 0.0), 'raw_text': ''}
+                except (KeyError, ValueError):
+                    continue
+                records.append(self.record(row['timestamp'], book, engine='import'))
+        if records:
+            with conn:
+                self._insert(conn, records)
+        if own:
+            conn.close()
+        return len(records)
+
+    def export(self, path, output_format=None):
+        """Write the whole catalogue to CSV or JSONL (by extension unless given)"""
+        output_format = output_format or ('jsonl' if path.endswith('.jsonl') else 'csv')
+        cursor = self._reader().execute(
+            f"SELECT {', '.join(EXPORT_FIELDS)} FROM books ORDER BY timestamp, id")
+        count = 0
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            if output_format == 'jsonl':
+                for row in cursor:
+                    f.write(json.dumps(dict(row), ensure_ascii=False) + '\n')
+                    count += 1
+            else:
+                writer = csv.writer(f)
+                writer.writerow(EXPORT_FIELDS)
+                for row in cursor:
+                    writer.writerow(tuple(row))
+                    count += 1
+        return count
+
+    def close(self):
+        """Write queued books and stop the writer thread"""
+        self.queue.put(None)
+        self.thread.join()
+        with self.lock:
+            for conn in self.readers:
+                conn.close()
+            self.readers = []
+        self.local = threading.local()
 
-        print(" ✅")
 
+# ============================================================================
+# SCAN PIPELINE
+# ============================================================================
+
+@dataclass
+class ScanJob:
+    """One book travelling through the scan pipeline"""
+    seq: int
+    timestamp: str
+    image: np.ndarray
+    path: Optional[str] = None
+    ocr_input: Optional[np.ndarray] = None
+    text_boxes: List[TextBox] = field(default_factory=list)
+    book_info: Optional[BookInfo] = None
+    ocr_step: Optional[str] = None
+    fingerprint: Optional[tuple] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+
+
+class StageStats:
+    """Throughput, latency and queue depth of one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.busy_time = 0.0
+        self.wait_time = 0.0
+        self.max_depth = 0
+        self.inbox = None
+
+    def record(self, busy, wait=0.0):
+        with self.lock:
+            self.processed += 1
+            self.busy_time += busy
+            self.wait_time += wait
+
+    def record_depth(self, depth):
+        with self.lock:
+            self.max_depth = max(self.max_depth, depth)
+
+    def summary(self):
+        with self.lock:
+            n = self.processed
+            return {
+                'stage': self.name,
+                'processed': n,
+                'avg_latency': self.busy_time / n if n else 0.0,
+                'avg_wait': self.wait_time / n if n else 0.0,
+                'queue_depth': self.inbox.qsize() if self.inbox is not None else 0,
+                'max_queue_depth': self.max_depth,
+            }
+
+
+class PipelineStage:
+    """
+    Worker thread(s) taking jobs from a bounded inbox and passing them on.
+
+    A full inbox of the next stage blocks the workers (backpressure), so a slow stage stalls
+    the stages in front of it instead of letting queues grow without limit.
+    Jobs that failed in an earlier stage are forwarded untouched, unless the
+    stage handles errors itself.
+    """
+
+    def __init__(self, name, fn, next_stage: Optional['PipelineStage'] = None, workers=1,
+                 queue_size=2, handles_errors=False):
+        self.name = name
+        self.fn = fn
+        self.handles_errors = handles_errors
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.next_stage = next_stage
+        self.stats = StageStats(name)
+        self.stats.inbox = self.inbox
+        self.threads = [
+            threading.Thread(target=self._worker, name=f'{name}-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def put(self, job):
+        self.inbox.put((time.time(), job))
+        self.stats.record_depth(self.inbox.qsize())
+
+    def _worker(self):
+        while True:
+            item = self.inbox.get()
+            if item is None:
+                break
+            queued_at, job = item
+            start = time.time()
+            if job.error is None or self.handles_errors:
+                try:
+                    self.fn(job)
+                except Exception as e:
+                    job.error = f"{self.name}: {e}"
+            self.stats.record(time.time() - start, start - queued_at)
+            if self.next_stage is not None:
+                self.next_stage.put(job)
+
+    def close(self):
+        """Let workers finish queued jobs and stop"""
+        for _ in self.threads:
+            self.inbox.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+class ScanPipeline:
+    """
+    Staged scan pipeline: preprocessing pool → OCR worker(s) → parse/log.
+
+    Capture runs on the caller's thread (submit blocks when the pipeline is
+    full). Book N+1 is captured and preprocessed while book N is in
+    recognition; the final stage receives books in submission order.
+    """
+
+    def __init__(self, preprocess, recognize, finish, preprocess_workers=2, ocr_workers=1,
+                 queue_size=2):
+        self.capture_stats = StageStats('capture')
+        self.pending = {}
+        self.next_seq = 0
+        self.finish = finish
+
+        finish_stage = PipelineStage('parse+log', self._finish_in_order, None, 1, queue_size,
+                                     handles_errors=True)
+        ocr_stage = PipelineStage('ocr', recognize, finish_stage, ocr_workers, queue_size)
+        preprocess_stage = PipelineStage('preprocess', preprocess, ocr_stage,
+                                         preprocess_workers, queue_size)
+        self.stages = [preprocess_stage, ocr_stage, finish_stage]
+
+    def submit(self, job: ScanJob, capture_time=0.0):
+        """Queue captured book (blocks while the pipeline is full)"""
+        start = time.time()
+        self.stages[0].put(job)
+        self.capture_stats.record(capture_time, time.time() - start)
+
+    def _finish_in_order(self, job):
+        # Preprocessing workers may overtake each other: restore submission order
+        self.pending[job.seq] = job
+        while self.next_seq in self.pending:
+            ready = self.pending.pop(self.next_seq)
+            self.next_seq += 1
+            try:
+                self.finish(ready)
+            except Exception as e:
+                print(f"\n❌ Book #{ready.seq + 1} failed (parse+log: {e})")
+
+    def close(self):
+        """Drain all queued books and stop the workers"""
+        for stage in self.stages:
+            stage.close()
+
+    def stats(self):
+        return [self.capture_stats.summary()] + [stage.stats.summary() for stage in self.stages]
+
+
+# ============================================================================
+# SCANNERS
+# ============================================================================
+
+class BookScanner:
+    """
+    Book OCR processing chain shared by live and batch scanning:
+    preprocess → OCR → fuzzy correction → parse → postprocess → log.
+    """
+
+    # Cascade: OCR boxes below this confidence are re-read by the next engine
+    WEAK_BOX_CONFIDENCE = 0.6
+    # ...unless they cover more of the cover than this (a full pass is as cheap)
+    RECROP_MAX_AREA = 0.35
+    # Padding around a re-read box, relative to its height
+    RECROP_PADDING = 0.3
+    # Gated recognition: detected regions centred below this height ratio are
+    # recognized with the top-K (the parser looks for the publisher there)
+    PUBLISHER_BAND = 0.85
+
+    def __init__(self, model='easyocr', preprocessing=True, debug=False,
+                 preprocess_workers=2, workers=1, cascade=None, escalate_below=0.6,
+                 cache=False, cache_size=500, metrics_file=None, top_regions=0):
+        # Cascade of engines, fastest first; a single model is a one-level cascade
+        self.cascade = list(cascade) if cascade else [model]
+        model = self.cascade[0]
+        self.model = model
+        self.escalate_below = escalate_below
+        self.preprocessing = preprocessing
+        self.debug = debug
+        self.preprocess_workers = preprocess_workers
+        # The accelerator pipelines frames itself and is opened once per process
+        if 'metis-ppocr' in self.cascade and workers > 1:
+            print("⚠️  --workers is ignored with metis-ppocr (one accelerator stream)")
+            workers = 1
+        self.workers = workers
+        self.pipeline = None
+        self.book_count = 0
+        self.submitted = 0
+        self.session_start = datetime.now()
+        # Books finished at each cascade step, and how many stayed below the threshold
+        self.cascade_steps = collections.Counter()
+        self.cascade_unresolved = 0
+        self.cascade_lock = threading.Lock()
+        # Gated recognition: only the top_regions most prominent detected regions
+        # (plus the publisher band) are recognized first; 0 recognizes everything
+        self.top_regions = top_regions
+        self.regions_detected = 0
+        self.regions_recognized = 0
+        # Per-stage timings, dumped as JSON at the end of the session
+        self.metrics_file = metrics_file
+        if debug:
+            METRICS.logger = lambda message: print(f"   ⏱️  {message}")
+
+        # Initialize processors
+        self.preprocessor = BookCoverPreprocessor(debug=debug)
+        self.postprocessor = OCRPostProcessor(debug=debug)
+        self.parser = BookCoverParser()
+        # Re-scanned covers are answered from the cache without OCR
+        self.cache = CoverCache(max_entries=cache_size) if cache else None
+
+        # OCR engines are loaded once and kept warm for the whole session
+        # (one engine per worker process with --workers N)
+        if workers > 1:
+            self.engines = [OCRProcessPool(m, workers) for m in self.cascade]
+        else:
+            self.engines = [create_ocr_engine(m) for m in self.cascade]
+        self.engine = self.engines[0]
+        if top_regions and not any(e.supports_regions for e in self.engines):
+            print("⚠️  --top-regions needs easyocr or ppocr in-process (without --workers): "
+                  "recognizing every region")
+
+    @property
+    def model_label(self):
+        if len(self.cascade) == 1:
+            return self.model
+        return f"{' → '.join(self.cascade)} (escalate below {self.escalate_below:.2f})"
+
+    def _load_engine(self, image_shape):
+        """Load and warm up the OCR engine(s) with a dummy frame of the given size"""
+        for model, engine in zip(self.cascade, self.engines):
+            print(f"🔧 Loading OCR engine ({engine.name})...", end='', flush=True)
+            shape = tuple(image_shape[:2])
+            # Tesseract/PP-OCR preprocessing produces grayscale images
+            if not (self.preprocessing and model in ('tesseract', 'ppocr')):
+                shape += (3,)
+            engine.load()
+            engine.warm_up(shape)
+            print(f" ✅ (load {engine.load_time:.1f}s, warm-up {engine.warmup_time:.1f}s)")
+
+    def _close_engines(self):
+        for engine in self.engines:
+            engine.close()
+
+    def _create_pipeline(self, finish):
+        """Staged pipeline sized for the OCR workers"""
+        return ScanPipeline(
+            self._stage_preprocess, self._stage_ocr, finish,
+            preprocess_workers=self.preprocess_workers,
+            ocr_workers=self.workers,
+            queue_size=max(2, self.workers),
+        )
+
+    def _fuzzy_correct_with_databases(self, text):
+        """
+        Apply fuzzy matching with databases to automatically correct OCR errors
+
+        Instead of manually maintaining word corrections for every variant (OLMRQ, OLMDQ, OLMTQ, etc.),
+        this uses fuzzy matching to find similar words in author/publisher databases.
+
+        Example: "RIORD4N" → fuzzy match → "RIORDAN" (from database)
+        """
+        words = text.split()
+        corrected_words = []
+
+        for word in words:
+            if len(word) < 3:  # Skip very short words
+                corrected_words.append(word)
+                continue
+
+            word_upper = word.upper()
+
+            # Skip if word is a known imprint (exact match - will be handled by parser)
+            if word_upper in self.parser.publisher_imprints:
+                corrected_words.append(word)
+                continue
+
+            best_match = None
+            best_ratio = 0.80  # Minimum similarity threshold (OSEAR → OSCAR = 0.80)
+
+            # Imprints first (catch common OCR errors like OSEAR → OSCAR), then
+            # authors and publishers; each index only returns strictly better matches
+            for index in (self.parser.imprint_index,
+                          self.parser.author_index,
+                          self.parser.publisher_index):
+                match, ratio = index.best_match(word_upper, best_ratio)
+                if match:
+                    best_match, best_ratio = match, ratio
+
+            # Use best match if found, otherwise keep original
+            if best_match:
+                corrected_words.append(best_match.title())  # Title case for readability
+            else:
+                corrected_words.append(word)
+
+        return ' '.join(corrected_words)
+
+    def preprocess_image(self, image, model=None):
+        """Apply model-specific preprocessing (no-op if disabled)"""
+        if not self.preprocessing:
+            return image
+
+        with METRICS.time('preprocess'):
+            preprocessed = self._preprocess_for(model or self.model, image)
+
+        # Save debug image if debug mode (overwrite same file each time)
+        if self.debug:
+            cv2.imwrite('test_images/debug_preprocessed_last.jpg', preprocessed)
+
+        return preprocessed
+
+    def _preprocess_for(self, model, image):
+        if model == 'tesseract':
+            return self.preprocessor.preprocess_for_tesseract(image)
+        elif model == 'ppocr':
+            return self.preprocessor.preprocess_for_ppocr(image)
+        elif model == 'metis-ppocr':
+            # Resize and normalization run in the accelerator pipeline
+            return image
+        else:  # easyocr
+            return self.preprocessor.preprocess_for_easyocr(image)
+
+    def parse_book(self, text_boxes, image_shape) -> BookInfo:
+        """Correct OCR text and parse book information"""
         # Apply word corrections AND fuzzy matching before parsing
         # This ensures parser sees corrected text (OLIMPO not OLMRQ)
         corrected_text_boxes = []
-        for box in text_boxes:
-            # First apply exact word corrections
-            corrected_text = self.postprocessor._correct_words(box.text)
+        with METRICS.time('fuzzy_correction'):
+            for box in text_boxes:
+                # First apply exact word corrections
+                corrected_text = self.postprocessor._correct_words(box.text)
 
-            # Then apply fuzzy matching with databases
-            corrected_text = self._fuzzy_correct_with_databases(corrected_text)
+                # Then apply fuzzy matching with databases
+                corrected_text = self._fuzzy_correct_with_databases(corrected_text)
 
-            # Create new TextBox with corrected text
-            from collections import namedtuple
-            CorrectedBox = namedtuple('TextBox', ['text', 'confidence', 'bbox'])
-            corrected_box = CorrectedBox(corrected_text, box.confidence, box.bbox)
-            corrected_text_boxes.append(corrected_box)
+                # Create new TextBox with corrected text
+                from collections import namedtuple
+                CorrectedBox = namedtuple('TextBox', ['text', 'confidence', 'bbox'])
+                corrected_box = CorrectedBox(corrected_text, box.confidence, box.bbox)
+                corrected_text_boxes.append(corrected_box)
 
         # Parse
-        print(f"🧠 [4/5] Parsing book information...", end='', flush=True)
-        img_h, img_w = image.shape[:2]
-        book_info = self.parser.parse(corrected_text_boxes, img_h, img_w)
+        img_h, img_w = image_shape[:2]
+        with METRICS.time('parse'):
+            return self.parser.parse(corrected_text_boxes, img_h, img_w)
+
+    def parse_text_boxes(self, text_boxes, image_shape, book_info=None):
+        """Correct OCR text, parse book information and post-process it"""
+        if book_info is None:
+            book_info = self.parse_book(text_boxes, image_shape)
 
         # Convert to dict for postprocessing
         book_dict = {
@@ -1164,13 +3350,215 @@ class ContinuousScanner:
             'confidence': book_info.confidence,
             'raw_text': '\n'.join([f"{b.text}" for b in text_boxes])
         }
-        print(" ✅")
 
         # Post-processing
-        improved = self.postprocessor.improve_result(book_dict)
+        with METRICS.time('postprocess'):
+            return self.postprocessor.improve_result(book_dict)
+
+    # ------------------------------------------------------------------
+    # Gated recognition
+    # ------------------------------------------------------------------
+
+    def recognize_prominent(self, engine, ocr_input):
+        """
+        Recognize a cover, only as much of it as the parse needs.
+
+        With top_regions set and an engine that detects separately, the detected
+        regions are ranked by prominence (size, font height, position) and only
+        the top_regions best plus those in the publisher band are recognized;
+        blurbs, quotes and small print are left out. Further regions follow in
+        prominence order, top_regions at a time, while title, author or
+        publisher is still missing. Returns (text_boxes, book_info).
+        """
+        if not self.top_regions or not engine.supports_regions:
+            text_boxes = engine.recognize(ocr_input)
+            return text_boxes, self.parse_book(text_boxes, ocr_input.shape)
+
+        start = time.time()
+        first, rest = self._rank_regions(engine.detect(ocr_input), ocr_input.shape)
+        text_boxes = engine.recognize_regions(ocr_input, first)
+        book_info = self.parse_book(text_boxes, ocr_input.shape)
+        recognized = len(first)
+        while rest and not (book_info.title and book_info.author and book_info.publisher):
+            chunk, rest = rest[:self.top_regions], rest[self.top_regions:]
+            text_boxes += engine.recognize_regions(ocr_input, chunk)
+            book_info = self.parse_book(text_boxes, ocr_input.shape)
+            recognized += len(chunk)
+        engine.recognize_times.append(time.time() - start)
+
+        with self.cascade_lock:
+            self.regions_detected += recognized + len(rest)
+            self.regions_recognized += recognized
+        # Reading order, as the engines return full recognitions
+        text_boxes.sort(key=lambda b: (b.bbox[1], b.bbox[0]))
+        return text_boxes, book_info
+
+    def _rank_regions(self, regions, image_shape):
+        """(regions to recognize now, remaining regions by decreasing prominence)"""
+        img_h, img_w = image_shape[:2]
+        ranked = sorted(regions, reverse=True,
+                        key=lambda r: self.parser._calculate_prominence(r, img_h, img_w))
+        first, rest = ranked[:self.top_regions], []
+        for region in ranked[self.top_regions:]:
+            _, y1, _, y2 = region.bbox
+            if (y1 + y2) / 2 / img_h > self.PUBLISHER_BAND:
+                first.append(region)
+            else:
+                rest.append(region)
+        return first, rest
+
+    # ------------------------------------------------------------------
+    # Engine cascade
+    # ------------------------------------------------------------------
+
+    def recognize_cascade(self, image, ocr_input=None):
+        """
+        Recognize a cover with the fastest engine, escalating only while the parse
+        scores below escalate_below.
+
+        Each escalation first re-reads just the weak (low-confidence) boxes with
+        the next engine, and runs it on the whole cover only if that is not enough.
+        The best-scoring attempt wins. Returns (text_boxes, book_info, step).
+        """
+        if ocr_input is None:
+            ocr_input = self.preprocess_image(image)
+        text_boxes, book_info = self.recognize_prominent(self.engine, ocr_input)
+        best = (self.parser.score(book_info), text_boxes, book_info, self.cascade[0])
+
+        for model, engine in zip(self.cascade[1:], self.engines[1:]):
+            if best[0] >= self.escalate_below:
+                break
+
+            weak = self._weak_regions(best[1], image.shape)
+            if weak:
+                text_boxes = self._recrop(engine, model, image, best[1], weak)
+                best = self._keep_best(best, text_boxes, self.parse_book(text_boxes, image.shape),
+                                       f'{model} (re-crop)')
+            if best[0] < self.escalate_below:
+                text_boxes, book_info = self.recognize_prominent(
+                    engine, self.preprocess_image(image, model))
+                best = self._keep_best(best, text_boxes, book_info, model)
+
+        score, text_boxes, book_info, step = best
+        with self.cascade_lock:
+            self.cascade_steps[step] += 1
+            if score < self.escalate_below:
+                self.cascade_unresolved += 1
+        return text_boxes, book_info, step
+
+    def _keep_best(self, best, text_boxes, book_info, step):
+        """The better of best and a new attempt, as (score, text_boxes, book_info, step)"""
+        score = self.parser.score(book_info)
+        return (score, text_boxes, book_info, step) if score >= best[0] else best
+
+    def _weak_regions(self, text_boxes, image_shape):
+        """Padded bboxes of low-confidence boxes, or [] when a full pass is needed"""
+        weak = [b for b in text_boxes if b.confidence < self.WEAK_BOX_CONFIDENCE]
+        if not weak:
+            return []
+
+        img_h, img_w = image_shape[:2]
+        regions = []
+        area = 0
+        for box in weak:
+            x1, y1, x2, y2 = box.bbox
+            pad = max(8, int((y2 - y1) * self.RECROP_PADDING))
+            region = (max(0, int(x1) - pad), max(0, int(y1) - pad),
+                      min(img_w, int(x2) + pad), min(img_h, int(y2) + pad))
+            regions.append((box, region))
+            area += (region[2] - region[0]) * (region[3] - region[1])
+
+        if area > self.RECROP_MAX_AREA * img_w * img_h:
+            return []
+        return regions
+
+    def _recrop(self, engine, model, image, text_boxes, weak):
+        """Re-read the weak regions with engine; keep the other boxes as they are"""
+        replaced = {id(box) for box, _ in weak}
+        boxes = [b for b in text_boxes if id(b) not in replaced]
+
+        for box, (x1, y1, x2, y2) in weak:
+            crop = image[y1:y2, x1:x2]
+            reread = engine.recognize(self._preprocess_for(model, crop)
+                                      if self.preprocessing else crop)
+            confidence = (sum(b.confidence for b in reread) / len(reread)) if reread else 0.0
+            if confidence <= box.confidence:
+                boxes.append(box)
+                continue
+            for b in reread:
+                bx1, by1, bx2, by2 = b.bbox
+                boxes.append(TextBox(b.text, (bx1 + x1, by1 + y1, bx2 + x1, by2 + y1),
+                                     b.confidence))
+
+        return boxes
+
+    def run_ocr(self, image, timestamp=None):
+        """Run OCR with preprocessing and postprocessing (single book, sequential)"""
+        # Preprocess
+        if self.preprocessing:
+            print(f"   └─ Preprocessing image...", end='', flush=True)
+            preprocessed = self.preprocess_image(image)
+            if self.debug:
+                print(" ✅ (debug: test_images/debug_preprocessed_last.jpg)")
+            else:
+                print(" ✅")
+        else:
+            preprocessed = image
+
+        # Run OCR (input is handed to the engine in memory)
+        print(f"   └─ Text detection & recognition...", end='', flush=True)
+        with METRICS.time('ocr'):
+            if len(self.engines) > 1:
+                text_boxes, book_info, step = self.recognize_cascade(image, preprocessed)
+            elif self.top_regions:
+                (text_boxes, book_info), step = \
+                    self.recognize_prominent(self.engine, preprocessed), None
+            else:
+                text_boxes, book_info, step = self.engine.recognize(preprocessed), None, None
+        print(f" ✅ ({step})" if step else " ✅")
+
+        # Parse
+        print(f"🧠 [4/5] Parsing book information...", end='', flush=True)
+        improved = self.parse_text_boxes(text_boxes, image.shape, book_info)
+        print(" ✅")
 
         return improved
 
+    # ------------------------------------------------------------------
+    # Pipeline stages
+    # ------------------------------------------------------------------
+
+    def _stage_preprocess(self, job: ScanJob):
+        if self.cache is not None:
+            with METRICS.time('cache'):
+                job.fingerprint = self.cache.fingerprint(job.image)
+                job.result = self.cache.lookup(job.fingerprint)
+            if job.result is not None:
+                job.ocr_step = 'cache'
+                return
+        job.ocr_input = self.preprocess_image(job.image)
+
+    def _stage_ocr(self, job: ScanJob):
+        if job.result is not None:  # cached cover
+            return
+        with METRICS.time('ocr'):
+            if len(self.engines) > 1:
+                job.text_boxes, job.book_info, job.ocr_step = \
+                    self.recognize_cascade(job.image, job.ocr_input)
+            elif self.top_regions:
+                job.text_boxes, job.book_info = self.recognize_prominent(self.engine, job.ocr_input)
+            else:
+                job.text_boxes = self.engine.recognize(job.ocr_input)
+        job.ocr_input = None
+
+    def _job_result(self, job: ScanJob):
+        """Parsed result of a recognized job (cached covers already have one)"""
+        if job.result is None:
+            job.result = self.parse_text_boxes(job.text_boxes, job.image.shape, job.book_info)
+            if self.cache is not None and job.result['title'] != '[not identified]':
+                self.cache.put(job.fingerprint, job.result)
+        return job.result
+
     def display_result(self, book_info, show_raw=True):
         """Display OCR result"""
         print("\n" + "="*70)
@@ -1205,18 +3593,230 @@ class ContinuousScanner:
         if self.book_count > 0:
             print(f"Avg time/book:   {elapsed/self.book_count:.1f}s")
             print(f"Throughput:      {self.book_count/(elapsed/60):.1f} books/min")
+
+        # Per-stage pipeline statistics
+        if self.pipeline:
+            print("-"*70)
+            print(f"{'Stage':<12}{'Done':>6}{'Avg latency':>14}{'Avg wait':>11}{'Queue now/max':>16}")
+            for st in self.pipeline.stats():
+                print(f"{st['stage']:<12}{st['processed']:>6}{st['avg_latency']:>13.2f}s"
+                      f"{st['avg_wait']:>10.2f}s{st['queue_depth']:>10}/{st['max_queue_depth']}")
+
+        # Where the cascade settled (fast path vs escalations)
+        if len(self.engines) > 1:
+            finished = sum(self.cascade_steps.values())
+            print("-"*70)
+            print(f"Cascade (escalate below {self.escalate_below:.2f}):")
+            for model in self.cascade:
+                for step in (f'{model} (re-crop)', model):
+                    count = self.cascade_steps.get(step, 0)
+                    if count:
+                        print(f"  {step:<22}{count:>5} ({count / finished:.0%})")
+            if self.cascade_unresolved:
+                print(f"  {'still below threshold':<22}{self.cascade_unresolved:>5}")
+
+        if self.regions_detected:
+            print("-"*70)
+            print(f"Gated recognition: {self.regions_recognized} of {self.regions_detected} "
+                  f"detected regions recognized "
+                  f"({self.regions_recognized / self.regions_detected:.0%}, top {self.top_regions})")
+
+        if self.cache is not None:
+            cache = self.cache.stats()
+            print("-"*70)
+            print(f"Cover cache:     {cache['hits']} hits / {cache['misses']} misses "
+                  f"({cache['hit_rate']:.0%}), {cache['entries']} covers, "
+                  f"lookup {cache['avg_lookup'] * 1000:.1f}ms")
+
+        # Startup vs steady-state OCR timings
+        for engine in self.engines:
+            report = engine.timing_report()
+            print("-"*70)
+            if len(self.engines) > 1:
+                print(f"[{engine.name}]")
+            print(f"OCR startup:     {report['startup']:.1f}s "
+                  f"(load {report['load']:.1f}s + warm-up {report['warmup']:.1f}s)")
+            if report['recognitions'] > 0:
+                print(f"OCR first book:  {report['first_recognize']:.2f}s")
+                print(f"OCR steady:      {report['steady_recognize']:.2f}s/book "
+                      f"({report['recognitions']} recognitions)")
+
+        # Rolling per-stage latency percentiles
+        stages = METRICS.snapshot()
+        if stages:
+            print("-"*70)
+            print(f"{'Timing':<18}{'Count':>7}{'p50':>11}{'p95':>11}{'p99':>11}{'max':>11}")
+            for stage, st in stages.items():
+                print(f"{stage:<18}{st['count']:>7}" +
+                      ''.join(f"{st[k] * 1000:>9.1f}ms" for k in ('p50', 'p95', 'p99', 'max')))
         print("="*70)
 
+    def metrics_report(self):
+        """Session counters stored next to the stage timings in the metrics dump"""
+        return {
+            'model': self.model_label,
+            'workers': self.workers,
+            'preprocessing': self.preprocessing,
+            'books': self.book_count,
+            'session_time': (datetime.now() - self.session_start).total_seconds(),
+            'pipeline': self.pipeline.stats() if self.pipeline else [],
+            'cascade': dict(self.cascade_steps),
+            'regions': {'detected': self.regions_detected, 'recognized': self.regions_recognized},
+            'cache': self.cache.stats() if self.cache is not None else None,
+            'engines': {engine.name: engine.timing_report() for engine in self.engines},
+        }
+
+    def write_metrics(self):
+        """Dump stage timings and session counters to metrics_file (if set)"""
+        if not self.metrics_file:
+            return
+        try:
+            METRICS.dump(self.metrics_file, self.metrics_report())
+            print(f"📈 Metrics: {self.metrics_file}")
+        except OSError as e:
+            print(f"⚠️  Cannot write metrics to {self.metrics_file}: {e}")
+
+    def _log_result(self, timestamp, book_info, log_file='ocr_results.csv'):
+        """Log result to CSV file"""
+
+        # Create header if needed
+        if not os.path.exists(log_file):
+            with open(log_file, 'w') as f:
+                f.write("timestamp,title,author,publisher,confidence\n")
+
+        # Append result
+        with open(log_file, 'a') as f:
+            title = book_info['title'].replace(',', ';')
+            author = book_info['author'].replace(',', ';')
+            publisher = book_info['publisher'].replace(',', ';')
+            confidence = book_info['confidence']
+
+            f.write(f"{timestamp},{title},{author},{publisher},{confidence:.2f}\n")
+
+
+class ContinuousScanner(BookScanner):
+    """Continuous book OCR scanner"""
+
+    def __init__(self, model='easyocr', auto_mode=False, preprocessing=True, debug=False,
+                 archive=True, stable_time=0.5, preprocess_workers=2, workers=1,
+                 cascade=None, escalate_below=0.6, cache=True, cache_size=500,
+                 catalogue=CATALOGUE_FILE, metrics_file=None, capture='gstreamer',
+                 capture_scale=1.0, top_regions=0):
+        super().__init__(model=model, preprocessing=preprocessing, debug=debug,
+                         preprocess_workers=preprocess_workers, workers=workers,
+                         cascade=cascade, escalate_below=escalate_below,
+                         cache=cache, cache_size=cache_size, metrics_file=metrics_file,
+                         top_regions=top_regions)
+        self.auto_mode = auto_mode
+        self.archive = ArchiveWriter() if archive else None
+        # Results go to the SQLite catalogue (written in background)
+        self.catalogue = CatalogueStore(catalogue)
+        if self.catalogue.imported:
+            print(f"📥 Imported {self.catalogue.imported} book(s) from {LEGACY_LOG_FILE} "
+                  f"into {catalogue}")
+        self.last_timestamp = None
+
+        # Cleanup old temporary files
+        self._cleanup_temp_files()
+
+        # Load calibration
+        self.loading_area = self._load_loading_area()
+        if self.loading_area is None:
+            print("❌ Error: Loading area not calibrated!")
+            print("   Run: python3 calibrate.py")
+            sys.exit(1)
+
+        # Open camera (hardware decoding and crop in a GStreamer pipeline if available)
+        self.rtsp_url = RTSPConfig.get_url()
+        self.cap, cropped = open_camera(self.rtsp_url, self.loading_area, capture_scale, capture)
+        if not self.cap.isOpened():
+            print(f"❌ Error: Cannot open camera: {self.rtsp_url}")
+            sys.exit(1)
+        self.capture_label = ('GStreamer (hardware decode, cropped in pipeline)' if cropped
+                              else 'OpenCV (software decode, cropped in Python)')
+        if capture_scale != 1.0:
+            self.capture_label += f', scaled x{capture_scale:g}'
+
+        # Background capture (auto mode triggers on a newly placed, still book)
+        detector = BookPresenceDetector(stable_time=stable_time) if auto_mode else None
+        self.grabber = FrameGrabber(self.cap, None if cropped else self.loading_area, detector,
+                                    scale=capture_scale)
+
+        # Load OCR engine once and keep it warm for the whole session
+        width, height = _scaled_size(self.loading_area, capture_scale)
+        self._load_engine((height, width))
+
+    def _cleanup_temp_files(self):
+        """Remove old temporary and debug files"""
+        temp_files = [
+            'temp_ocr_input.jpg',
+            'test_images/debug_preprocessed_last.jpg'
+        ]
+        for f in temp_files:
+            if os.path.exists(f):
+                os.remove(f)
+
+    def _load_loading_area(self):
+        """Load loading area coordinates"""
+        config_file = 'test_images/loading_area.txt'
+        if not os.path.exists(config_file):
+            return None
+
+        with open(config_file, 'r') as f:
+            coords = f.readline().strip()
+            return tuple(map(int, coords.split(',')))
+
+    def capture_and_crop(self, frame=None):
+        """Crop a FRESH frame (captured after this call, or the given one) to loading area"""
+        if frame is None:
+            # Waits out frames already buffered (the flush) until a fresh one arrives
+            with METRICS.time('capture'):
+                frame = self.grabber.latest(newer_than=time.time())
+        if frame is None:
+            return None, None
+
+        with METRICS.time('crop'):
+            return frame, self.grabber.crop(frame)
+
+    def _stage_finish(self, job: ScanJob):
+        if job.error:
+            print(f"\n❌ Book #{job.seq + 1} failed ({job.error})")
+            return
+
+        self._job_result(job)
+        self.book_count += 1
+        self.display_result(job.result)
+        via = f" (via {job.ocr_step})" if job.ocr_step else ""
+        print(f"⏱️  {time.time() - job.created:.1f}s from capture to result{via}")
+        with METRICS.time('log'):
+            self._catalogue_result(job)
+
+    def _catalogue_result(self, job: ScanJob):
+        """Queue the book for the catalogue, reporting earlier scans of it"""
+        cover_hash = job.fingerprint[0] if job.fingerprint else CoverCache.hashes(job.image)[0]
+        image = f"test_images/book_{job.timestamp}.jpg" if self.archive else None
+        record = CatalogueStore.record(job.timestamp, job.result, job.text_boxes,
+                                       cover_hash=cover_hash, engine=job.ocr_step or self.model,
+                                       image=image)
+        earlier = self.catalogue.find_duplicates(record, limit=1)
+        if earlier:
+            print(f"📚 Already in catalogue (scanned {earlier[0]['timestamp']}: "
+                  f"{earlier[0]['title']} | {earlier[0]['author']})")
+        self.catalogue.add(record)
+
     def run(self):
         """Main continuous loop"""
         print("="*70)
         print("   📚 CONTINUOUS BOOK SCANNER")
         print("="*70)
-        print(f"Model:         {self.model}")
+        print(f"Model:         {self.model_label}")
+        print(f"OCR workers:   {self.workers}")
         print(f"Preprocessing: {'Enabled' if self.preprocessing else 'Disabled'}")
         print(f"Debug mode:    {'Enabled' if self.debug else 'Disabled'}")
         print(f"Auto mode:     {'Yes' if self.auto_mode else 'No (manual)'}")
         print(f"Loading area:  {self.loading_area[2]-self.loading_area[0]}x{self.loading_area[3]-self.loading_area[1]}px")
+        print(f"Capture:       {self.capture_label}")
+        print(f"Catalogue:     {self.catalogue.path} ({self.catalogue.count()} books)")
         print("="*70)
         print()
 
@@ -1228,77 +3828,212 @@ class ContinuousScanner:
             print("   4. Type 'q' + ENTER to quit")
             print()
 
+        self.pipeline = self._create_pipeline(self._stage_finish)
+
         try:
             while True:
                 if not self.auto_mode:
-                    user_input = input(f"\n[Book #{self.book_count + 1}] Press ENTER to scan (or 'q' to quit, 's' for stats): ").strip().lower()
+                    user_input = input(f"\n[Book #{self.submitted + 1}] Press ENTER to scan (or 'q' to quit, 's' for stats): ").strip().lower()
 
                     if user_input == 'q':
                         break
                     elif user_input == 's':
                         self.show_stats()
+                        self.write_metrics()
                         continue
 
                 # Capture
-                print("\n📷 [1/5] Flushing camera buffer...", end='', flush=True)
-                full_frame, cropped = self.capture_and_crop()
+                trigger_frame = None
+                if self.auto_mode:
+                    print("\n👀 Waiting for next book... (Ctrl+C to stop)")
+                    while trigger_frame is None:
+                        trigger_frame = self.grabber.next_trigger(timeout=0.5)
+                capture_start = time.time()
+                full_frame, cropped = self.capture_and_crop(trigger_frame)
 
                 if cropped is None:
-                    print(" ❌ Failed")
+                    print("\n📷 Capture failed ❌")
                     continue
 
-                print(" ✅")
-                print(f"📐 [2/5] Cropping to {cropped.shape[1]}x{cropped.shape[0]}px...", end='', flush=True)
-
-                # Save capture
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                os.makedirs('test_images', exist_ok=True)
-                capture_path = f"test_images/book_{timestamp}.jpg"
-                cv2.imwrite(capture_path, cropped)
-                print(" ✅")
-
-                # OCR
-                print(f"🔍 [3/5] Running OCR ({self.model})...")
-                book_info = self.run_ocr(cropped, timestamp)
-                print("✅ [5/5] OCR completed")
-
-                # Display
-                self.book_count += 1
-                self.display_result(book_info)
+                # Archive capture (written in background)
+                timestamp = self._new_timestamp()
+                if self.archive:
+                    self.archive.submit(f"test_images/book_{timestamp}.jpg", cropped)
 
-                # Save to log
-                self._log_result(timestamp, book_info)
-
-                # Auto mode delay
-                if self.auto_mode:
-                    print("\nWaiting 3 seconds... (Ctrl+C to stop)")
-                    time.sleep(3)
+                # Hand over to the pipeline (blocks while it is full)
+                job = ScanJob(seq=self.submitted, timestamp=timestamp, image=cropped)
+                self.submitted += 1
+                print(f"\n📷 Book #{self.submitted} captured "
+                      f"({cropped.shape[1]}x{cropped.shape[0]}px) → OCR ({self.model_label}) queued")
+                self.pipeline.submit(job, time.time() - capture_start)
 
         except KeyboardInterrupt:
             print("\n\n👋 Interrupted by user")
 
         finally:
+            if self.submitted > self.book_count:
+                print(f"\n⏳ Finishing {self.submitted - self.book_count} queued book(s)...")
+            self.pipeline.close()
+            self.grabber.stop()
             self.cap.release()
             self.show_stats()
+            self.write_metrics()
+            self._close_engines()
+            if self.cache is not None:
+                self.cache.close()
+            self.catalogue.close()
+            if self.archive:
+                self.archive.close()
             print("\n✅ Session ended")
 
-    def _log_result(self, timestamp, book_info):
-        """Log result to CSV file"""
-        log_file = 'ocr_results.csv'
+    def _new_timestamp(self):
+        """Capture timestamp, unique within the session"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if self.last_timestamp and self.last_timestamp.startswith(timestamp):
+            suffix = self.last_timestamp[len(timestamp) + 1:]
+            timestamp = f"{timestamp}_{int(suffix or 0) + 1}"
+        self.last_timestamp = timestamp
+        return timestamp
 
-        # Create header if needed
-        if not os.path.exists(log_file):
-            with open(log_file, 'w') as f:
-                f.write("timestamp,title,author,publisher,confidence\n")
 
-        # Append result
-        with open(log_file, 'a') as f:
-            title = book_info['title'].replace(',', ';')
-            author = book_info['author'].replace(',', ';')
-            publisher = book_info['publisher'].replace(',', ';')
-            confidence = book_info['confidence']
+class BatchScanner(BookScanner):
+    """
+    Offline re-cataloguing of archived cover crops (test_images/book_*.jpg).
 
-            f.write(f"{timestamp},{title},{author},{publisher},{confidence:.2f}\n")
+    Streams images from disk through the same preprocess → OCR → parse chain
+    as the live scanner, with parallel workers. Every finished image is
+    recorded in a checkpoint file next to the output, so an interrupted run
+    resumes where it stopped.
+    """
+
+    IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+    # Generated files living next to the book crops
+    SKIP_PREFIXES = ('debug_', 'calibration_')
+
+    def __init__(self, output='batch_results.csv', output_format=None, restart=False, **kwargs):
+        super().__init__(**kwargs)
+        self.output = output
+        self.output_format = output_format or ('jsonl' if output.endswith('.jsonl') else 'csv')
+        self.checkpoint = output + '.checkpoint'
+        self.restart = restart
+        self.failed = 0
+        self.total = 0
+
+    @classmethod
+    def collect_images(cls, inputs):
+        """Expand directories and glob patterns into a sorted list of image paths"""
+        paths = set()
+        for item in inputs:
+            if os.path.isdir(item):
+                candidates = [os.path.join(item, f) for f in os.listdir(item)]
+            else:
+                candidates = glob.glob(item)
+            for path in candidates:
+                name = os.path.basename(path)
+                if name.lower().endswith(cls.IMAGE_EXTENSIONS) and \
+                        not name.startswith(cls.SKIP_PREFIXES):
+                    paths.add(os.path.abspath(path))
+        return sorted(paths)
+
+    @staticmethod
+    def timestamp_for(path):
+        """Capture timestamp from book_<timestamp>.jpg, else file modification time"""
+        match = re.search(r'book_(\d{8}_\d{6}(?:_\d+)?)', os.path.basename(path))
+        if match:
+            return match.group(1)
+        return datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y%m%d_%H%M%S")
+
+    def _load_checkpoint(self):
+        if self.restart:
+            for f in (self.output, self.checkpoint):
+                if os.path.exists(f):
+                    os.remove(f)
+            return set()
+        if not os.path.exists(self.checkpoint):
+            return set()
+        with open(self.checkpoint, 'r', encoding='utf-8') as f:
+            return {line.rstrip('\n') for line in f if line.strip()}
+
+    def _write_result(self, path, timestamp, book_info):
+        if self.output_format == 'jsonl':
+            record = {'timestamp': timestamp, 'image': path}
+            record.update({k: book_info.get(k) for k in
+                           ('title', 'author', 'publisher', 'confidence', 'raw_text')})
+            with open(self.output, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            self._log_result(timestamp, book_info, self.output)
+
+        # Record completion only after the result is written
+        with open(self.checkpoint, 'a', encoding='utf-8') as f:
+            f.write(path + '\n')
+
+    def _stage_finish(self, job: ScanJob):
+        name = os.path.basename(job.path)
+        if job.error:
+            self.failed += 1
+            print(f"❌ [{job.seq + 1}/{self.total}] {name}: {job.error}")
+            return
+
+        self._job_result(job)
+        job.image = None
+        with METRICS.time('log'):
+            self._write_result(job.path, job.timestamp, job.result)
+        self.book_count += 1
+        r = job.result
+        print(f"✅ [{job.seq + 1}/{self.total}] {name} → {r['title']} | {r['author']} | "
+              f"{r['publisher']} ({r['confidence']:.2f})")
+
+    def run(self, inputs):
+        """Process all images (skipping those already in the checkpoint)"""
+        images = self.collect_images(inputs)
+        done = self._load_checkpoint()
+        todo = [p for p in images if p not in done]
+        self.total = len(todo)
+
+        print("="*70)
+        print("   📚 BATCH BOOK SCANNER")
+        print("="*70)
+        print(f"Model:         {self.model_label}")
+        print(f"OCR workers:   {self.workers}")
+        print(f"Preprocessing: {'Enabled' if self.preprocessing else 'Disabled'}")
+        print(f"Images:        {len(images)} found, {len(images) - len(todo)} already done")
+        print(f"Output:        {self.output} ({self.output_format})")
+        print("="*70)
+
+        if not todo:
+            print("\n✅ Nothing to do")
+            return
+
+        first = cv2.imread(todo[0])
+        self._load_engine(first.shape if first is not None else (480, 640))
+        self.session_start = datetime.now()
+        self.pipeline = self._create_pipeline(self._stage_finish)
+
+        try:
+            for path in todo:
+                read_start = time.time()
+                image = cv2.imread(path)
+                if image is None:
+                    print(f"⚠️  Cannot read {path}, skipped")
+                    self.total -= 1
+                    continue
+                job = ScanJob(seq=self.submitted, timestamp=self.timestamp_for(path),
+                              image=image, path=path)
+                self.submitted += 1
+                self.pipeline.submit(job, time.time() - read_start)
+
+        except KeyboardInterrupt:
+            print("\n\n👋 Interrupted by user (finishing queued images, run again to resume)")
+
+        finally:
+            self.pipeline.close()
+            self.show_stats()
+            self.write_metrics()
+            if self.failed:
+                print(f"⚠️  {self.failed} image(s) failed")
+            self._close_engines()
+            print(f"\n✅ Results: {self.output}")
 
 
 # ============================================================================
@@ -1312,22 +4047,70 @@ def main():
         epilog="""
 Examples:
   python3 scan_books.py                    # Manual mode with EasyOCR
-  python3 scan_books.py --auto             # Auto mode (3s delay)
+  python3 scan_books.py --auto             # Auto mode (scan when a new book is placed)
   python3 scan_books.py --model tesseract  # Use Tesseract
   python3 scan_books.py --model ppocr      # Use PP-OCR
+  python3 scan_books.py --model metis-ppocr  # Use PP-OCR on the Metis accelerator
+  python3 scan_books.py --cascade ppocr,easyocr  # PP-OCR, EasyOCR only for hard covers
   python3 scan_books.py --no-preprocessing # Skip preprocessing
+  python3 scan_books.py batch test_images --workers 4        # Re-process archive
+  python3 scan_books.py batch 'test_images/book_202601*.jpg' --output jan.jsonl
+  python3 scan_books.py export catalogue.csv  # Export the catalogue (.csv or .jsonl)
+  python3 scan_books.py --metrics metrics.json --metrics-port 9464  # Stage timings
         """
     )
+    parser.add_argument(
+        'command',
+        nargs='?',
+        choices=['scan', 'batch', 'export'],
+        default='scan',
+        help="scan: live camera scanning (default); batch: process images from disk; "
+             "export: write the catalogue to a .csv or .jsonl file"
+    )
+    parser.add_argument(
+        'inputs',
+        nargs='*',
+        help="batch: image directories, files or glob patterns; export: output file"
+    )
     parser.add_argument(
         '--model',
-        choices=['tesseract', 'ppocr', 'easyocr'],
+        choices=list(OCR_ENGINES),
         default='easyocr',
         help="OCR model (default: easyocr)"
     )
+    parser.add_argument(
+        '--cascade',
+        metavar='MODELS',
+        help="Comma-separated OCR models, fastest first (e.g. ppocr,easyocr): a cover goes "
+             "to the next model only if its parse scores below --escalate-below "
+             "(overrides --model)"
+    )
+    parser.add_argument(
+        '--escalate-below',
+        type=float,
+        default=0.6,
+        help="Cascade: parse score (0-1, from OCR confidence, author and publisher "
+             "database hits) below which the next model is tried (default: 0.6)"
+    )
+    parser.add_argument(
+        '--top-regions',
+        type=int,
+        default=0,
+        metavar='K',
+        help="Recognize only the K most prominent detected text regions (plus the bottom "
+             "publisher band), and more only while title, author or publisher is missing "
+             "(easyocr/ppocr; default: 0, recognize everything)"
+    )
     parser.add_argument(
         '--auto',
         action='store_true',
-        help="Auto mode (3s delay between scans)"
+        help="Auto mode (scan automatically when a new book is placed and still)"
+    )
+    parser.add_argument(
+        '--stable-time',
+        type=float,
+        default=0.5,
+        help="Auto mode: seconds a book must be still before scanning (default: 0.5)"
     )
     parser.add_argument(
         '--no-preprocessing',
@@ -1339,14 +4122,150 @@ Examples:
         action='store_true',
         help="Enable debug mode (save intermediate images)"
     )
+    parser.add_argument(
+        '--capture',
+        choices=['gstreamer', 'opencv'],
+        default='gstreamer',
+        help="scan: camera decoding; gstreamer decodes in hardware and crops to the loading "
+             "area inside the pipeline (falls back to opencv if unavailable) (default: gstreamer)"
+    )
+    parser.add_argument(
+        '--capture-scale',
+        type=float,
+        default=1.0,
+        help="scan: downscale the loading area by this factor at capture (e.g. 0.5, default: 1.0)"
+    )
+    parser.add_argument(
+        '--no-archive',
+        action='store_true',
+        help="Do not archive captured crops to test_images/"
+    )
+    parser.add_argument(
+        '--catalogue',
+        default=CATALOGUE_FILE,
+        help=f"scan/export: SQLite catalogue of scanned books (default: {CATALOGUE_FILE})"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f"scan: always run OCR, even for covers already in {COVER_CACHE_FILE}"
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=500,
+        help="scan: covers kept in the cover cache (least recently used dropped, default: 500)"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help="OCR worker processes, each with its own model (default: 1, in-process)"
+    )
+    parser.add_argument(
+        '--output',
+        default='batch_results.csv',
+        help="batch: output file, .csv (same schema as ocr_results.csv) or .jsonl "
+             "(default: batch_results.csv)"
+    )
+    parser.add_argument(
+        '--restart',
+        action='store_true',
+        help="batch: ignore checkpoint and overwrite output instead of resuming"
+    )
+    parser.add_argument(
+        '--metrics',
+        metavar='PATH',
+        help="scan/batch: write per-stage timings (p50/p95/p99) and session counters "
+             "to a JSON file at the end of the session (and on 's' in manual mode)"
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        metavar='PORT',
+        help="scan/batch: serve per-stage timings in OpenMetrics format on "
+             "http://127.0.0.1:PORT/metrics"
+    )
+    parser.add_argument(
+        '--build-lexicon',
+        action='store_true',
+        help=f"Compile author/publisher/imprint databases into {LEXICON_FILE} and exit"
+    )
 
     args = parser.parse_args()
 
+    cascade = None
+    if args.cascade:
+        cascade = [m.strip() for m in args.cascade.split(',') if m.strip()]
+        unknown = [m for m in cascade if m not in OCR_ENGINES]
+        if not cascade:
+            parser.error("--cascade needs at least one model")
+        if unknown:
+            parser.error(f"--cascade: unknown model(s) {', '.join(unknown)} "
+                         f"(choose from {', '.join(OCR_ENGINES)})")
+
+    if args.build_lexicon:
+        start = time.time()
+        lexicon = load_lexicon(rebuild=True)
+        print(f"✅ Lexicon compiled in {time.time() - start:.2f}s: "
+              f"{len(lexicon.authors.entries)} authors, "
+              f"{len(lexicon.publishers.entries)} publishers, "
+              f"{len(lexicon.imprints.entries)} imprints → {LEXICON_FILE}")
+        return
+
+    if args.command == 'export':
+        if len(args.inputs) != 1:
+            parser.error("export needs one output file (.csv or .jsonl)")
+        if not os.path.exists(args.catalogue):
+            parser.error(f"no catalogue at {args.catalogue}")
+        catalogue = CatalogueStore(args.catalogue)
+        count = catalogue.export(args.inputs[0])
+        catalogue.close()
+        print(f"✅ Exported {count} book(s) from {args.catalogue} → {args.inputs[0]}")
+        return
+
+    if args.metrics_port:
+        try:
+            host, port = METRICS.serve(args.metrics_port)
+        except OSError as e:
+            parser.error(f"--metrics-port: cannot listen on port {args.metrics_port} ({e})")
+        print(f"📈 Metrics endpoint: http://{host}:{port}/metrics")
+
+    if args.command == 'batch':
+        if not args.inputs:
+            parser.error("batch needs at least one image directory, file or glob pattern")
+        scanner = BatchScanner(
+            output=args.output,
+            restart=args.restart,
+            model=args.model,
+            preprocessing=not args.no_preprocessing,
+            debug=args.debug,
+            workers=max(1, args.workers),
+            cascade=cascade,
+            escalate_below=args.escalate_below,
+            metrics_file=args.metrics,
+            top_regions=max(0, args.top_regions)
+        )
+        scanner.run(args.inputs)
+        return
+
     scanner = ContinuousScanner(
         model=args.model,
         auto_mode=args.auto,
         preprocessing=not args.no_preprocessing,
-        debug=args.debug
+        debug=args.debug,
+        archive=not args.no_archive,
+        stable_time=args.stable_time,
+        workers=max(1, args.workers),
+        cascade=cascade,
+        escalate_below=args.escalate_below,
+        cache=not args.no_cache,
+        cache_size=max(1, args.cache_size),
+        catalogue=args.catalogue,
+        metrics_file=args.metrics,
+        capture=args.capture,
+        capture_scale=args.capture_scale,
+        top_regions=max(0, args.top_regions)
     )
 
     scanner.run()
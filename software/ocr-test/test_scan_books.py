@@ -0,0 +1,478 @@
+"""
+Regression tests for scan_books.py
+
+Run with: python -m pytest test_scan_books.py
+"""
+
+import concurrent.futures
+import csv
+import json
+import os
+import queue
+import threading
+import time
+import types
+
+import cv2
+import numpy as np
+import pytest
+
+import scan_books
+from scan_books import (BookCoverParser, BookInfo, Lexicon, OCRPostProcessor, TextBox, TextRegion,
+                        load_lexicon)
+
+
+@pytest.fixture(scope='module')
+def parser(tmp_path_factory):
+    cache_path = tmp_path_factory.mktemp('lexicon') / scan_books.LEXICON_FILE
+    return BookCoverParser(load_lexicon(cache_path=str(cache_path)))
+
+
+def _write_imprints(data_dir, lines):
+    (data_dir / scan_books.LEXICON_SOURCES['imprints']).write_text('\n'.join(lines) + '\n')
+
+
+def test_lexicon_keeps_imprint_file_order(tmp_path):
+    _write_imprints(tmp_path, ['OSCAR MONDADORI=MONDADORI', 'TOR=MACMILLAN', 'BUR=RIZZOLI'])
+    lexicon = Lexicon.build(str(tmp_path))
+    assert list(lexicon.imprint_map) == ['OSCAR MONDADORI', 'TOR', 'BUR']
+
+    cache_path = str(tmp_path / scan_books.LEXICON_FILE)
+    lexicon.save(cache_path)
+    assert list(Lexicon.load(cache_path).imprint_map) == ['OSCAR MONDADORI', 'TOR', 'BUR']
+
+
+@pytest.mark.parametrize('text, publisher', [
+    ("Newton Compton Editori Roma", 'NEWTON COMPTON'),
+    ("ET SCRITTORI EINAUDI", 'EINAUDI'),
+    ("BEST SELLERS OSCAR", 'MONDADORI'),
+])
+def test_resolve_imprint_to_publisher(parser, text, publisher):
+    assert parser._resolve_imprint_to_publisher(text) == publisher
+
+
+@pytest.mark.parametrize('lines, publisher', [
+    (['ET SCRITTORI=EINAUDI', 'TOR=MACMILLAN'], 'EINAUDI'),
+    (['TOR=MACMILLAN', 'ET SCRITTORI=EINAUDI'], 'MACMILLAN'),
+])
+def test_resolve_substring_imprints_by_file_order(tmp_path, lines, publisher):
+    # TOR also matches inside SCRITTORI: the imprint listed first wins, not the shortest
+    _write_imprints(tmp_path, lines)
+    parser = BookCoverParser(Lexicon.build(str(tmp_path)))
+    assert parser._resolve_imprint_to_publisher("COLLANA ET SCRITTORI") == publisher
+
+
+@pytest.mark.parametrize('text, text_type, corrected', [
+    ('ARAG0NÈS', 'publisher', 'ARAGONÈS'),
+    ('G@RCÍA MÁRQUEZ', 'author', 'García Márquez'),
+    ('ÉD|T!ONS', 'title', 'Éditions'),
+    ('C|TTÀ', 'title', 'Città'),
+    ('N1ÑO', 'publisher', 'NIÑO'),
+    ('M@C©H1', 'publisher', 'MACCHI'),
+    ('HELP!', 'publisher', 'HELP!'),
+    ('Ferná!dez', 'author', 'Ferná!dez'),
+    ('10TH ANNIVERSARY EDITION', 'title', '10th Anniversary Edition'),
+    ('THE 101ST AIRBORNE', 'title', 'The 101st Airborne'),
+    ('50TH ANNIVERSARY', 'title', '50th Anniversary'),
+    ('21 LESSONS FOR THE 21ST CENTURY', 'publisher', '21 LESSONS FOR THE 21ST CENTURY'),
+    ('ROOM 101', 'publisher', 'ROOM 101'),
+])
+def test_correct_misread_characters(text, text_type, corrected):
+    assert OCRPostProcessor().correct_text(text, text_type) == corrected
+
+
+def test_catalogue_duplicates_need_title_and_author(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # no legacy CSV log to import
+    store = scan_books.CatalogueStore(str(tmp_path / 'catalogue.db'))
+
+    def record(title, author, timestamp='20250101_120000'):
+        book = {'title': title, 'author': author, 'publisher': 'EINAUDI', 'confidence': 0.9}
+        return scan_books.CatalogueStore.record(timestamp, book)
+
+    store.add(record('Il nome della rosa', 'Umberto Eco'))
+    store.close()
+    store = scan_books.CatalogueStore(str(tmp_path / 'catalogue.db'))
+    try:
+        assert store.find_duplicates(record('Il nome della rosa', 'Umberto Eco'))
+        assert not store.find_duplicates(record('[not identified]', 'Umberto Eco'))
+        assert not store.find_duplicates(record('Il nome della rosa', '[not identified]'))
+        assert store.find(author='Umberto Eco')
+    finally:
+        store.close()
+
+
+def test_worker_timings_are_recorded_by_the_pool():
+    worker_metrics = scan_books.ScanMetrics()
+    worker_metrics.forward = []
+    with worker_metrics.time('detection'):
+        pass
+    worker_metrics.record('recognition', 0.25)
+    timings = worker_metrics.forwarded()
+    assert [stage for stage, _ in timings] == ['detection', 'recognition']
+    assert worker_metrics.forwarded() == []
+
+    pool = scan_books.OCRProcessPool('easyocr', 1)
+    pool.results = queue.Queue()
+    pool.in_flight = [1]
+    future = concurrent.futures.Future()
+    pool.futures[0] = (future, 0, None)
+    pool.results.put((0, [('TEXT', (0.0, 0.0, 1.0, 1.0), 0.9)], 0.3, timings))
+    pool.results.put(None)
+    count = scan_books.METRICS.snapshot().get('recognition', {}).get('count', 0)
+    pool._collect()
+    assert future.result()[0].text == 'TEXT'
+    assert scan_books.METRICS.snapshot()['recognition']['count'] == count + 1
+
+
+class FakeRegionEngine(scan_books.OCREngine):
+    """Detects the given regions and 'recognizes' each as its label"""
+
+    name = 'fake'
+    supports_regions = True
+
+    def __init__(self, labels):
+        super().__init__()
+        self.labels = labels  # bbox -> text
+        self.calls = []
+
+    def _load(self):
+        pass
+
+    def _detect(self, image):
+        return [TextRegion(bbox) for bbox in self.labels]
+
+    def _recognize_regions(self, image, regions):
+        self.calls.append([self.labels[r.bbox] for r in regions])
+        return [TextBox(self.labels[r.bbox], r.bbox, 0.9) for r in regions]
+
+
+# A 1000x600 cover, labelled regions from most to least prominent (publisher at the bottom)
+COVER_REGIONS = {
+    (50, 300, 550, 420): 'TITLE',
+    (50, 150, 550, 230): 'BLURB 1',
+    (100, 500, 500, 560): 'BLURB 2',
+    (150, 600, 450, 640): 'AUTHOR',
+    (200, 700, 400, 720): 'SMALL PRINT',
+    (250, 900, 350, 920): 'PUBLISHER',
+}
+
+
+@pytest.fixture
+def region_scanner(parser, monkeypatch):
+    scanner = scan_books.BookScanner('tesseract', top_regions=2)
+    scanner.parser = parser
+
+    def parse_book(text_boxes, image_shape):
+        texts = {b.text for b in text_boxes}
+        return BookInfo(*(label if label in texts else ''
+                          for label in ('TITLE', 'AUTHOR', 'PUBLISHER')))
+
+    monkeypatch.setattr(scanner, 'parse_book', parse_book)
+    return scanner
+
+
+def test_rank_regions_keeps_top_k_and_publisher_band(region_scanner):
+    regions = [TextRegion(bbox) for bbox in reversed(list(COVER_REGIONS))]
+    first, rest = region_scanner._rank_regions(regions, (1000, 600))
+    assert [COVER_REGIONS[r.bbox] for r in first] == ['TITLE', 'BLURB 1', 'PUBLISHER']
+    assert [COVER_REGIONS[r.bbox] for r in rest] == ['BLURB 2', 'AUTHOR', 'SMALL PRINT']
+
+
+def test_recognize_prominent_follows_up_until_parsed(region_scanner):
+    engine = FakeRegionEngine(COVER_REGIONS)
+    text_boxes, book_info = region_scanner.recognize_prominent(
+        engine, np.zeros((1000, 600), np.uint8))
+    # the author is missing after the top-K, one more chunk finds it; small print is never read
+    assert engine.calls == [['TITLE', 'BLURB 1', 'PUBLISHER'], ['BLURB 2', 'AUTHOR']]
+    assert (book_info.title, book_info.author, book_info.publisher) == \
+        ('TITLE', 'AUTHOR', 'PUBLISHER')
+    assert [b.text for b in text_boxes] == \
+        ['BLURB 1', 'TITLE', 'BLURB 2', 'AUTHOR', 'PUBLISHER']
+    assert (region_scanner.regions_detected, region_scanner.regions_recognized) == (6, 5)
+
+
+def test_ppocr_recognizes_every_region():
+    class FakePaddleOCR:
+        def text_classifier(self, crops):
+            return crops, [('0', 1.0)] * len(crops), 0.0
+
+        def text_recognizer(self, crops):
+            return [('ONE', 0.9), ('TWO', 0.3), ('THREE', 0.8)][:len(crops)], 0.0
+
+    engine = scan_books.PPOCREngine()
+    engine.ocr, engine.loaded = FakePaddleOCR(), True
+    regions = [TextRegion((0, y, 100, y + 20),
+                          shape=[(0, y), (100, y), (100, y + 20), (0, y + 20)])
+               for y in (0, 40, 80)]
+    text_boxes = engine.recognize_regions(np.zeros((120, 100), np.uint8), regions)
+    # the low-score line is dropped, the others keep their own region
+    assert [(b.text, b.bbox) for b in text_boxes] == \
+        [('ONE', (0, 0, 100, 20)), ('THREE', (0, 80, 100, 100))]
+
+
+COVER = np.zeros((1000, 600, 3), np.uint8)
+
+
+class FakeCascadeEngine(scan_books.OCREngine):
+    """Returns fixed boxes for the whole cover and for crops, and logs what it read"""
+
+    def __init__(self, name, full, crop=()):
+        super().__init__()
+        self.name, self.full, self.crop = name, list(full), list(crop)
+        self.reads = []
+
+    def _load(self):
+        pass
+
+    def _recognize(self, image):
+        kind = 'full' if image.shape == COVER.shape else 'crop'
+        self.reads.append(kind)
+        return list(self.full if kind == 'full' else self.crop)
+
+
+def _cascade_scanner(monkeypatch, *engines):
+    scanner = scan_books.BookScanner(cascade=[e.name for e in engines], preprocessing=False)
+    scanner.engines, scanner.engine = list(engines), engines[0]
+    # the parse scores as its least confident box
+    monkeypatch.setattr(scanner, 'parse_book', lambda text_boxes, image_shape: BookInfo(
+        confidence=min((b.confidence for b in text_boxes), default=0.0)))
+    monkeypatch.setattr(scanner.parser, 'score', lambda book_info: book_info.confidence)
+    return scanner
+
+
+STRONG = TextBox('STRONG', (100, 300, 500, 400), 0.9)
+WEAK = TextBox('WEAK', (100, 100, 200, 130), 0.3)
+
+
+def test_cascade_stops_at_first_good_engine(monkeypatch):
+    fast, slow = FakeCascadeEngine('tesseract', [STRONG]), FakeCascadeEngine('easyocr', [])
+    scanner = _cascade_scanner(monkeypatch, fast, slow)
+    assert scanner.recognize_cascade(COVER)[2] == 'tesseract'
+    assert slow.reads == []
+
+
+def test_cascade_recrops_weak_boxes_first(monkeypatch):
+    fixed = TextBox('WEAK', (0, 0, 100, 30), 0.8)
+    fast = FakeCascadeEngine('tesseract', [STRONG, WEAK])
+    slow = FakeCascadeEngine('easyocr', [], crop=[fixed])
+    scanner = _cascade_scanner(monkeypatch, fast, slow)
+    text_boxes, _, step = scanner.recognize_cascade(COVER)
+    assert step == 'easyocr (re-crop)'
+    assert slow.reads == ['crop']
+    # the re-read box is moved back to cover coordinates
+    assert sorted(b.bbox for b in text_boxes) == [(91, 91, 191, 121), STRONG.bbox]
+
+
+def test_cascade_runs_full_pass_when_weak_area_is_large(monkeypatch):
+    blurry = TextBox('BLURRY', (0, 0, 600, 700), 0.3)
+    fast = FakeCascadeEngine('tesseract', [blurry])
+    slow = FakeCascadeEngine('easyocr', [STRONG], crop=[STRONG])
+    scanner = _cascade_scanner(monkeypatch, fast, slow)
+    assert scanner.recognize_cascade(COVER)[2] == 'easyocr'
+    assert slow.reads == ['full']
+
+
+def test_cascade_escalates_in_order_and_keeps_best(monkeypatch):
+    blurry = TextBox('BLURRY', (0, 0, 600, 700), 0.3)
+    engines = [FakeCascadeEngine('tesseract', [blurry]),
+               FakeCascadeEngine('easyocr', [TextBox('BLURRY', blurry.bbox, 0.5)]),
+               FakeCascadeEngine('ppocr', [TextBox('BLURRY', blurry.bbox, 0.2)])]
+    scanner = _cascade_scanner(monkeypatch, *engines)
+    _, book_info, step = scanner.recognize_cascade(COVER)
+    assert [e.reads for e in engines] == [['full'], ['full'], ['full']]
+    assert (step, book_info.confidence) == ('easyocr', 0.5)
+    assert scanner.cascade_unresolved == 1
+
+
+def test_scan_pipeline_finishes_in_order_and_forwards_errors():
+    recognized, finished = [], []
+
+    def preprocess(job):
+        # later books overtake earlier ones in the preprocessing pool
+        time.sleep(0.02 * (3 - job.seq % 4) / 3)
+        if job.seq == 2:
+            raise ValueError('bad crop')
+
+    def recognize(job):
+        recognized.append(job.seq)
+        if job.seq == 5:
+            raise RuntimeError('engine failed')
+
+    pipeline = scan_books.ScanPipeline(preprocess, recognize,
+                                       lambda job: finished.append((job.seq, job.error)),
+                                       preprocess_workers=4, ocr_workers=2, queue_size=2)
+    for seq in range(8):
+        pipeline.submit(scan_books.ScanJob(seq, '', COVER))
+    pipeline.close()
+
+    assert [seq for seq, _ in finished] == list(range(8))
+    assert dict(finished)[2] == 'preprocess: bad crop'
+    assert dict(finished)[5] == 'ocr: engine failed'
+    assert sorted(recognized) == [0, 1, 3, 4, 5, 6, 7]  # a failed job skips later stages
+    assert [s['processed'] for s in pipeline.stats()] == [8, 8, 8, 8]
+
+
+class SlowDigitEngine(scan_books.OCREngine):
+    """Reads the number in the first pixel, taking longer for small numbers"""
+
+    name = 'digits'
+
+    def _load(self):
+        pass
+
+    def _recognize(self, image):
+        time.sleep(0.01 * (8 - int(image[0, 0])))
+        return [TextBox(str(int(image[0, 0])), (0, 0, 1, 1), 1.0)]
+
+
+class ThreadProcess(threading.Thread):
+    def terminate(self):
+        pass
+
+
+def test_ocr_pool_map_keeps_submission_order(monkeypatch):
+    # worker threads instead of processes, so that they can use an engine defined here
+    monkeypatch.setitem(scan_books.OCR_ENGINES, 'digits', SlowDigitEngine)
+    context = types.SimpleNamespace(Queue=queue.Queue, Process=ThreadProcess)
+    monkeypatch.setattr(scan_books.multiprocessing, 'get_context', lambda method: context)
+    monkeypatch.setattr(scan_books.METRICS, 'forward', scan_books.METRICS.forward)
+
+    pool = scan_books.OCRProcessPool('digits', 3)
+    try:
+        images = [np.full((4, 4), n, np.uint8) for n in range(8)]
+        assert [boxes[0].text for boxes in pool.map(images)] == [str(n) for n in range(8)]
+        assert pool.in_flight == [0, 0, 0]
+    finally:
+        pool.close()
+
+
+def test_batch_collect_images_filters_generated_files(tmp_path):
+    for name in ('book_20250101_120000.jpg', 'cover.PNG', 'debug_preprocessed_last.jpg',
+                 'calibration_markers.jpg', 'notes.txt'):
+        (tmp_path / name).write_bytes(b'')
+    (tmp_path / 'nested').mkdir()
+    (tmp_path / 'nested' / 'book_20250101_130000.jpg').write_bytes(b'')
+
+    images = scan_books.BatchScanner.collect_images(
+        [str(tmp_path), str(tmp_path / 'nested' / '*.jpg'), str(tmp_path / 'cover.PNG')])
+    nested = os.path.join('nested', 'book_20250101_130000.jpg')
+    assert [os.path.relpath(p, tmp_path) for p in images] == \
+        ['book_20250101_120000.jpg', 'cover.PNG', nested]
+
+
+def test_batch_resumes_from_checkpoint(tmp_path):
+    paths = [str(tmp_path / f'book_20250101_12000{n}.jpg') for n in range(3)]
+    for path in paths:
+        cv2.imwrite(path, np.full((60, 40, 3), 255, np.uint8))
+    output = str(tmp_path / 'results.jsonl')
+
+    def run():
+        scanner = scan_books.BatchScanner(output=output, model='tesseract', preprocessing=False)
+        scanner.engines[0] = scanner.engine = FakeCascadeEngine('tesseract', [], crop=[STRONG])
+        scanner.run([str(tmp_path)])
+        return scanner.book_count
+
+    # an interrupted run recorded the first image only
+    with open(output + '.checkpoint', 'w') as f:
+        f.write(paths[0] + '\n')
+    assert run() == 2
+    with open(output) as f:
+        assert [json.loads(line)['image'] for line in f] == paths[1:]
+    assert run() == 0  # nothing left to do
+
+
+def _fingerprint(phash, seed):
+    descriptors = np.random.default_rng(seed).integers(0, 256, (16, 32), dtype=np.uint8)
+    return phash, phash, descriptors
+
+
+def test_cover_cache_evicts_least_recently_used(tmp_path):
+    a, b, c = (_fingerprint(h, n) for n, h in
+               enumerate((0, 0xFFFFFFFF00000000, 0x00000000FFFFFFFF)))
+    cache = scan_books.CoverCache(str(tmp_path / 'cache.json'), max_entries=2)
+    cache.put(a, {'title': 'A'})
+    cache.put(b, {'title': 'B'})
+    assert cache.lookup(a) == {'title': 'A'}  # a is now more recent than b
+    cache.put(c, {'title': 'C'})
+    assert len(cache) == 2
+    assert cache.lookup(b) is None
+    assert [cache.lookup(fp)['title'] for fp in (a, c)] == ['A', 'C']
+    assert cache.stats()['hits'] == 3 and cache.stats()['misses'] == 1
+
+
+def test_cover_cache_json_round_trip(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    fingerprints = [_fingerprint(h, n) for n, h in
+                    enumerate((0, 0xFFFFFFFF00000000, 0x00000000FFFFFFFF))]
+    cache = scan_books.CoverCache(path)
+    for n, fp in enumerate(fingerprints):
+        cache.put(fp, {'title': f'Book {n}', 'confidence': 0.5 + n / 10})
+    cache.close()
+
+    reloaded = scan_books.CoverCache(path)
+    assert [reloaded.lookup(fp) for fp in fingerprints] == \
+        [{'title': f'Book {n}', 'confidence': 0.5 + n / 10} for n in range(3)]
+    # a smaller cache keeps the most recent entries
+    small = scan_books.CoverCache(path, max_entries=2)
+    assert small.lookup(fingerprints[0]) is None
+    assert small.lookup(fingerprints[2])['title'] == 'Book 2'
+
+
+@pytest.mark.parametrize('digits, valid', [
+    ('9780306406157', True),
+    ('0306406152', True),
+    ('080442957X', True),
+    ('9780306406158', False),
+    ('0306406153', False),
+    ('978030640615X', False),
+    ('12345', False),
+])
+def test_isbn_check_digit(digits, valid):
+    assert scan_books._isbn_valid(digits) == valid
+
+
+@pytest.mark.parametrize('texts, isbn', [
+    (['978-0-306-40615-7'], '9780306406157'),
+    (['ISBN-10: 0-8044-2957-x'], '080442957X'),
+    (['Tel. 0306406152'], ''),  # bare 10-digit numbers need an ISBN label
+    (['Tel. 0306406152', 'ISBN 0-306-40615-2'], '0306406152'),
+    (['ISBN 978-0-306-40615-8', 'ISBN 9780306406157'], '9780306406157'),
+    (['EUR 12,90'], ''),
+])
+def test_extract_isbn(texts, isbn):
+    assert scan_books.extract_isbn(texts) == isbn
+
+
+def test_catalogue_writes_in_batches_and_exports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # no legacy CSV log to import
+    store = scan_books.CatalogueStore(str(tmp_path / 'catalogue.db'), batch_size=4,
+                                      flush_interval=5.0)
+    batches = []
+    insert = store._insert
+
+    def record_batch(conn, records):
+        batches.append(len(records))
+        insert(conn, records)
+
+    monkeypatch.setattr(store, '_insert', record_batch)
+    for n in range(10):
+        book = {'title': f'Book {n}', 'author': 'Umberto Eco', 'publisher': 'BOMPIANI',
+                'confidence': 0.8, 'raw_text': ''}
+        store.add(scan_books.CatalogueStore.record(f'20250101_1200{9 - n:02d}', book))
+    store.close()
+    assert batches == [4, 4, 2]
+    assert store.written == 10 and store.failed == 0
+
+    store = scan_books.CatalogueStore(str(tmp_path / 'catalogue.db'))
+    try:
+        assert store.count() == 10
+        assert store.export(str(tmp_path / 'books.csv')) == 10
+        with open(tmp_path / 'books.csv', newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert list(rows[0]) == list(scan_books.EXPORT_FIELDS)
+        assert [row['title'] for row in rows] == [f'Book {n}' for n in range(9, -1, -1)]
+        assert store.export(str(tmp_path / 'books.jsonl')) == 10
+        with open(tmp_path / 'books.jsonl') as f:
+            assert [json.loads(line)['title'] for line in f] == [row['title'] for row in rows]
+    finally:
+        store.close()
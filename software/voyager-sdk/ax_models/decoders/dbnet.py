@@ -0,0 +1,266 @@
+# Copyright Axelera AI, 2025
+# DB (Differentiable Binarization) text detection decoder, e.g. for PP-OCR det models
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from axelera import types
+from axelera.app import gst_builder, logging_utils
+from axelera.app.meta import BBoxState, ObjectDetectionMeta, ObjectDetectionMetaOBB
+from axelera.app.operators import AxOperator, PipelineContext
+from axelera.app.torch_utils import torch
+
+LOG = logging_utils.getLogger(__name__)
+
+
+def _rect_corners(centers, sizes, angles):
+    """Corners of rotated rectangles (cv2.minAreaRect convention, angles in degrees).
+
+    Returns [N, 4, 2] corners ordered top-left, top-right, bottom-right, bottom-left.
+    """
+    theta = np.deg2rad(angles)
+    cos, sin = np.cos(theta), np.sin(theta)
+    half_w, half_h = sizes[:, 0] / 2, sizes[:, 1] / 2
+    # unit corners in rectangle space
+    ux = np.array([-1, 1, 1, -1], np.float32)
+    uy = np.array([-1, -1, 1, 1], np.float32)
+    dx = ux[None, :] * half_w[:, None]
+    dy = uy[None, :] * half_h[:, None]
+    corners = np.empty((len(centers), 4, 2), np.float32)
+    corners[..., 0] = centers[:, None, 0] + dx * cos[:, None] - dy * sin[:, None]
+    corners[..., 1] = centers[:, None, 1] + dx * sin[:, None] + dy * cos[:, None]
+
+    # order as PP-OCR does: two left-most points by y, then two right-most by y
+    by_x = np.argsort(corners[..., 0], axis=1, kind='stable')
+    corners = np.take_along_axis(corners, by_x[..., None], axis=1)
+    left, right = corners[:, :2], corners[:, 2:]
+    left = np.take_along_axis(left, np.argsort(left[..., 1], axis=1)[..., None], axis=1)
+    right = np.take_along_axis(right, np.argsort(right[..., 1], axis=1)[..., None], axis=1)
+    return np.stack([left[:, 0], right[:, 0], right[:, 1], left[:, 1]], axis=1)
+
+
+def decode_db_map(
+    prob: np.ndarray,
+    bin_threshold: float = 0.3,
+    box_threshold: float = 0.6,
+    unclip_ratio: float = 1.5,
+    min_size: int = 3,
+    max_candidates: int = 1000,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Decode a DB probability map into rotated text rectangles.
+
+    The map is binarized at bin_threshold, each connected text region is scored by its
+    mean probability (computed for all regions at once), and its min-area rectangle is
+    grown by the DB unclip offset area * unclip_ratio / perimeter. For a rectangle the
+    offset polygon's min-area rectangle is the rectangle grown by that offset on every side.
+    As in PP-OCR, regions nested inside the hole of another region are found too, and the
+    corners are clipped to the map.
+
+    Args:
+        prob: [H, W] text probability map
+        bin_threshold: probability above which a pixel is text
+        box_threshold: minimum mean probability of a region
+        unclip_ratio: DB unclip ratio
+        min_size: minimum short side of a region before unclip, in map pixels
+        max_candidates: maximum number of regions considered
+
+    Returns:
+        quads: [N, 8] corners (x1, y1, ..., x4, y4) in map pixels, clockwise from top-left
+        scores: [N] mean probability of each region
+    """
+    prob = np.asarray(prob, np.float32)
+    bitmap = (prob > bin_threshold).astype(np.uint8)
+    num_regions, labels = cv2.connectedComponents(bitmap, connectivity=8)
+    if num_regions <= 1:
+        return np.empty((0, 8), np.float32), np.empty((0,), np.float32)
+
+    flat_labels = labels.ravel()
+    counts = np.bincount(flat_labels, minlength=num_regions)
+    sums = np.bincount(flat_labels, weights=prob.ravel(), minlength=num_regions)
+    region_scores = (sums / np.maximum(counts, 1)).astype(np.float32)
+
+    contours, _ = cv2.findContours(bitmap, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    # hole borders (positive oriented area) are not text regions
+    contours = [c for c in contours if cv2.contourArea(c, oriented=True) <= 0]
+    contours = contours[:max_candidates]
+    if not contours:
+        return np.empty((0, 8), np.float32), np.empty((0,), np.float32)
+    first_points = np.array([c[0, 0] for c in contours])
+    scores = region_scores[labels[first_points[:, 1], first_points[:, 0]]]
+
+    rects = [cv2.minAreaRect(c) for c in contours]
+    centers = np.array([r[0] for r in rects], np.float32)
+    sizes = np.array([r[1] for r in rects], np.float32)
+    angles = np.array([r[2] for r in rects], np.float32)
+
+    keep = (sizes.min(axis=1) >= min_size) & (scores >= box_threshold)
+    centers, sizes, angles, scores = centers[keep], sizes[keep], angles[keep], scores[keep]
+
+    area = sizes[:, 0] * sizes[:, 1]
+    perimeter = 2 * (sizes[:, 0] + sizes[:, 1])
+    distance = area * unclip_ratio / perimeter
+    sizes = sizes + 2 * distance[:, None]
+
+    keep = sizes.min(axis=1) >= min_size + 2
+    quads = _rect_corners(centers[keep], sizes[keep], angles[keep])
+    quads[..., 0] = np.clip(quads[..., 0], 0, prob.shape[1])
+    quads[..., 1] = np.clip(quads[..., 1], 0, prob.shape[0])
+    return quads.reshape(-1, 8), scores[keep]
+
+
+class DecodeDBNet(AxOperator):
+    """
+    Decode the DB probability map of a text detector into text boxes.
+
+    Output is ObjectDetectionMeta with the axis-aligned bounds of each text line, which
+    InputFromROI can crop for a recognition model, or ObjectDetectionMetaOBB with the
+    rotated rectangles (xyxyxyxy) when oriented is set.
+    """
+
+    bin_threshold: float = 0.3
+    box_threshold: float = 0.6
+    unclip_ratio: float = 1.5
+    min_size: int = 3
+    max_candidates: int = 1000
+    oriented: bool = False
+
+    def _post_init(self):
+        if not 0.0 < self.bin_threshold < 1.0:
+            raise ValueError(f"bin_threshold must be in (0, 1), got {self.bin_threshold}")
+        if self.unclip_ratio <= 0:
+            raise ValueError(f"unclip_ratio must be positive, got {self.unclip_ratio}")
+        if isinstance(self.oriented, int):
+            self.oriented = bool(self.oriented)
+        self._deq_scales, self._deq_zeropoints = (), ()
+        super()._post_init()
+
+    def configure_model_and_context_info(
+        self,
+        model_info: types.ModelInfo,
+        context: PipelineContext,
+        task_name: str,
+        taskn: int,
+        compiled_model_dir: Path | None,
+        task_graph,
+    ):
+        super().configure_model_and_context_info(
+            model_info, context, task_name, taskn, compiled_model_dir, task_graph
+        )
+        if model_info.manifest and model_info.manifest.is_compiled():
+            self._deq_scales, self._deq_zeropoints = zip(*model_info.manifest.dequantize_params)
+        self.scaled = context.resize_status
+        self.model_width = model_info.input_width
+        self.model_height = model_info.input_height
+        self.labels = model_info.labels
+        self._association = context.association or None
+
+    def build_gst(self, gst: gst_builder.Builder, stream_idx: str):
+        master_key = str()
+        if self._where:
+            master_key = f'master_meta:{self._where};'
+        association_key = str()
+        if self._association:
+            association_key = f'association_meta:{self._association};'
+        dequantize = str()
+        if self._deq_scales:
+            scales = ','.join(str(s) for s in self._deq_scales)
+            zeros = ','.join(str(s) for s in self._deq_zeropoints)
+            dequantize = f'scales:{scales};zero_points:{zeros};'
+
+        gst.decode_muxer(
+            name=f'decoder_task{self._taskn}{stream_idx}',
+            lib='libdecode_dbnet.so',
+            mode='read',
+            options=f'meta_key:{str(self.task_name)};'
+            f'{master_key}'
+            f'{association_key}'
+            f'{dequantize}'
+            f'bin_threshold:{self.bin_threshold};'
+            f'box_threshold:{self.box_threshold};'
+            f'unclip_ratio:{self.unclip_ratio};'
+            f'min_size:{self.min_size};'
+            f'max_candidates:{self.max_candidates};'
+            f'oriented:{int(self.oriented)};'
+            f'model_width:{self.model_width};'
+            f'model_height:{self.model_height};'
+            f'scale_up:{int(self.scaled==types.ResizeMode.LETTERBOX_FIT)};'
+            f'letterbox:{int(self.scaled in [types.ResizeMode.LETTERBOX_FIT, types.ResizeMode.LETTERBOX_CONTAIN])}',
+        )
+
+    def exec_torch(self, image, predict, meta):
+        if isinstance(predict, (list, tuple)):
+            predict = predict[0]
+        if isinstance(predict, torch.Tensor):
+            predict = predict.cpu().detach().numpy()
+        prob = np.squeeze(predict)
+        if prob.ndim != 2:
+            raise ValueError(f"Expected a single-channel probability map, got {predict.shape}")
+
+        quads, scores = decode_db_map(
+            prob,
+            self.bin_threshold,
+            self.box_threshold,
+            self.unclip_ratio,
+            self.min_size,
+            self.max_candidates,
+        )
+        # the map may be smaller than the model input (e.g. a stride-4 head)
+        quads[:, 0::2] *= self.model_width / prob.shape[1]
+        quads[:, 1::2] *= self.model_height / prob.shape[0]
+        if self.oriented:
+            boxes, box_format = quads, types.BoxFormat.XYXYXYXY
+        else:
+            boxes = np.stack(
+                [
+                    quads[:, 0::2].min(axis=1),
+                    quads[:, 1::2].min(axis=1),
+                    quads[:, 0::2].max(axis=1),
+                    quads[:, 1::2].max(axis=1),
+                ],
+                axis=1,
+            )
+            box_format = types.BoxFormat.XYXY
+
+        if self._where:
+            master_meta = meta[self._where]
+            # get boxes of the last secondary frame index
+            base_box = master_meta.boxes[
+                master_meta.get_next_secondary_frame_index(self.task_name)
+            ]
+            src_img_width = base_box[2] - base_box[0]
+            src_img_height = base_box[3] - base_box[1]
+        else:
+            src_img_width = image.size[0]
+            src_img_height = image.size[1]
+
+        state = BBoxState(
+            self.model_width,
+            self.model_height,
+            src_img_width,
+            src_img_height,
+            box_format,
+            False,
+            self.scaled,
+            output_top_k=self.max_candidates,
+            labels=self.labels,
+        )
+        boxes, scores, classes = state.organize_bboxes(
+            boxes, scores, np.zeros(len(scores), np.int32)
+        )
+
+        if self._where:
+            boxes[:, state.x_indexes] += base_box[0]
+            boxes[:, state.y_indexes] += base_box[1]
+
+        MetaCls = ObjectDetectionMetaOBB if self.oriented else ObjectDetectionMeta
+        model_meta = MetaCls.create_immutable_meta(
+            boxes=boxes,
+            scores=scores,
+            class_ids=classes,
+            labels=self.labels,
+        )
+        meta.add_instance(self.task_name, model_meta, self._where)
+        return image, predict, meta
@@ -12,7 +12,7 @@ import numpy as np
 from axelera import types
 from axelera.app import compile, gst_builder, logging_utils
 from axelera.app.meta import BBoxState, ObjectDetectionMeta, ObjectDetectionMetaOBB
-from axelera.app.model_utils.box import batch_probiou
+from axelera.app.model_utils import nms
 from axelera.app.operators import AxOperator, PipelineContext, utils
 from axelera.app.torch_utils import torch
 
@@ -663,7 +663,7 @@ def _guess_yolo_model(depadded_shapes, num_classes):
 
 def nms_obb(boxes_xywhr, scores, classes=None, iou_thr=0.5, max_det=300, agnostic=False):
     """
-    NumPy fast-NMS using probabilistic IoU.
+    NumPy greedy NMS using probabilistic IoU.
 
     Args:
         boxes_xywhr: (N, 5) array of [x, y, w, h, r] boxes.
@@ -679,32 +679,14 @@ def nms_obb(boxes_xywhr, scores, classes=None, iou_thr=0.5, max_det=300, agnosti
     """
     if boxes_xywhr.size == 0:
         return np.zeros((0,), dtype=np.int64)
-
-    order = np.argsort(-scores.astype(np.float64))
-    b = boxes_xywhr[order].astype(np.float64)
-
-    # Pairwise probabilistic IoU
-    ious = batch_probiou(b, b).astype(np.float64)
-
-    # Class-aware masking (only same-class overlaps can suppress)
-    if classes is not None and not agnostic:
-        cls = classes[order].reshape(-1, 1)
-        same_class = cls == cls.T
-        # Zero out IoUs between different classes so they never suppress
-        ious = ious * same_class.astype(np.float64)
-
-    # Only consider higher-scored boxes suppressing lower-scored ones
-    ious = np.triu(ious, k=1)
-
-    # Keep boxes that are not overlapped >= thr by any higher-scored box
-    keep_mask = (ious >= float(iou_thr)).sum(axis=0) == 0
-    pick = np.nonzero(keep_mask)[0]
-
-    if pick.size > max_det:
-        pick = pick[:max_det]
-
-    keep = order[pick]
-    return keep.astype(np.int64)
+    return nms.nms(
+        boxes_xywhr,
+        scores,
+        iou_thr,
+        None if agnostic else classes,
+        top_k=max_det,
+        iou_type='probiou',
+    )
 
 
 def decode_raw_obb(
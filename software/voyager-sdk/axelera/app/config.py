@@ -1995,6 +1995,9 @@ class PipelineConfig(BaseConfig):
     """Configuration for tiled inference."""
     render_config: RenderConfig | None = None
     """Initial render configuration for the pipeline."""
+    copy_tensors: bool = False
+    """If True then FrameResult.tensor is a writable copy of the model outputs, made as each frame
+    is produced. By default it is a read-only view, converted only when first accessed."""
 
     @property
     def eval_mode(self) -> bool:
@@ -326,6 +326,25 @@ class Environment:
         '''
         return True
 
+    @_var
+    def appsink_queue_size(self) -> int:
+        '''Number of output samples queued per appsink before the consumer reads them.
+
+        Samples from all appsinks of a pipeline are collected as they arrive and served
+        round-robin, so a busy stream cannot hold back the others. When the queue of an appsink
+        is full the pipeline waits for the application, unless appsink_drop_oldest is set.
+        '''
+        return 4
+
+    @_var
+    def appsink_drop_oldest(self) -> bool:
+        '''Set to 1 to drop the oldest queued sample of an appsink when its queue is full.
+
+        This keeps live (e.g. multi-camera) streams at the latest frames when the application
+        cannot keep up, instead of slowing down the pipeline.
+        '''
+        return False
+
     @_var
     def torch_device(self) -> str:
         '''The device to use for torch operations.
@@ -392,6 +411,19 @@ class Environment:
         '''
         return 'gl,3,3'
 
+    @_var
+    def torch_roi_batch_size(self) -> int:
+        '''Maximum number of ROIs of a cascade task inferenced in one call by the torch pipes.
+
+        The ROIs of a secondary task (e.g. text lines of an OCR recognizer, objects of a
+        classifier) are stacked into batches up to this size when the model accepts a batch
+        dimension: torch models without pre/postprocess graphs and ONNX models with a dynamic
+        (or larger fixed, zero-padded) batch size. Set to 1 to inference ROIs one at a time.
+        The AIPU is not batched: compiled models in the torch-aipu pipe run one ROI at a time,
+        and the gst pipe does not use this setting.
+        '''
+        return 16
+
     @_var
     def rtsp_protocol(self) -> str:
         '''The network protocol to use for RTSP streams.
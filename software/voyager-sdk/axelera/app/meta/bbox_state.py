@@ -10,7 +10,7 @@ from axelera import types
 
 from .. import logging_utils, utils
 from ..model_utils.box import convert
-from ..torch_utils import torch
+from ..model_utils.nms import nms as non_max_suppression
 
 LOG = logging_utils.getLogger(__name__)
 
@@ -657,36 +657,15 @@ class BBoxState:
         if not self._boxes.size:
             return
 
-        from torchvision import ops
+        class_ids = None
+        if not self.nms_class_agnostic and len(self._class_ids) == len(self._boxes):
+            class_ids = self._class_ids
+        # boxes are sorted by score, so the kept indices are in ascending order
+        final_indices = non_max_suppression(
+            self._boxes, self._scores, self.nms_iou_threshold, class_ids, self.output_top_k
+        )
 
-        boxes = torch.tensor(self._boxes).float()
-        scores = torch.tensor(self._scores).float()
-
-        final_indices = []
-
-        if self.nms_class_agnostic:
-            # Apply NMS directly without considering classes
-            keep_indices = ops.nms(boxes, scores, self.nms_iou_threshold)
-            final_indices.extend(keep_indices.tolist())
-        else:
-            # Perform NMS per class
-            classes = torch.tensor(self._class_ids)
-            for cls_id in torch.unique(classes):
-                cls_mask = classes == cls_id
-                cls_boxes = boxes[cls_mask]
-                cls_scores = scores[cls_mask]
-                if cls_boxes.shape[0] > 0:
-                    keep_indices = ops.nms(cls_boxes, cls_scores, self.nms_iou_threshold)
-                    # Map indices back to the original set of boxes
-                    original_indices = cls_mask.nonzero().squeeze(-1)
-                    mapped_indices = original_indices[keep_indices]
-                    final_indices.extend(mapped_indices.tolist())
-
-        final_indices = torch.unique(torch.tensor(final_indices))  # Remove duplicates
-
-        if final_indices.numel() > 0:
-            final_indices = final_indices[: self.output_top_k]  # Limit to top K results
-            final_indices = final_indices.numpy()  # Convert back to NumPy array
+        if final_indices.size > 0:
             self._boxes = self._boxes[final_indices]
             self._scores = self._scores[final_indices]
             if is_kpts and len(self._kpts) > 0:
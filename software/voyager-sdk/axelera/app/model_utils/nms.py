@@ -0,0 +1,189 @@
+# Copyright Axelera AI, 2025
+# NumPy non-maximum suppression for host side postprocessing
+
+import numpy as np
+
+from .box import batch_probiou
+
+IOU_TYPES = ('iou', 'diou', 'probiou')
+SOFT_NMS_METHODS = ('linear', 'gaussian')
+
+
+def _check_iou_type(boxes: np.ndarray, iou_type: str) -> None:
+    if iou_type not in IOU_TYPES:
+        raise ValueError(f"Unsupported IoU type {iou_type!r}, expected one of {IOU_TYPES}")
+    columns = 5 if iou_type == 'probiou' else 4
+    if boxes.ndim != 2 or boxes.shape[1] != columns:
+        raise ValueError(f"{iou_type} NMS expects (N, {columns}) boxes, got shape {boxes.shape}")
+
+
+def _offset_by_class(boxes: np.ndarray, class_ids: np.ndarray, iou_type: str) -> np.ndarray:
+    '''Move the boxes of each class to their own region, so that classes never overlap.
+
+    This lets one suppression pass over all the boxes behave as a separate pass per class.
+    '''
+    if iou_type == 'probiou':
+        # xywhr, offset the centres by more than the extent of any box
+        centres = boxes[:, :2]
+        span = centres.max() - centres.min() + 4 * boxes[:, 2:4].max() + 1
+        offset = class_ids.astype(np.float64)[:, None] * span
+        return np.concatenate([centres + offset, boxes[:, 2:]], axis=1)
+    span = boxes.max() - boxes.min() + 1
+    return boxes + class_ids.astype(np.float64)[:, None] * span
+
+
+def _areas(boxes: np.ndarray, iou_type: str) -> np.ndarray | None:
+    if iou_type == 'probiou':
+        return None
+    return (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+
+
+def _iou(boxes: np.ndarray, areas: np.ndarray | None, i: int, others: np.ndarray, iou_type: str):
+    '''IoU of box i with the boxes at indexes others.'''
+    if iou_type == 'probiou':
+        return batch_probiou(boxes[i : i + 1], boxes[others])[0]
+    box, rest = boxes[i], boxes[others]
+    w = np.minimum(box[2], rest[:, 2]) - np.maximum(box[0], rest[:, 0])
+    h = np.minimum(box[3], rest[:, 3]) - np.maximum(box[1], rest[:, 1])
+    inter = np.maximum(w, 0.0) * np.maximum(h, 0.0)
+    union = areas[i] + areas[others] - inter
+    iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    if iou_type == 'diou':
+        # penalise by the distance between the centres relative to the enclosing box diagonal
+        cw = np.maximum(box[2], rest[:, 2]) - np.minimum(box[0], rest[:, 0])
+        ch = np.maximum(box[3], rest[:, 3]) - np.minimum(box[1], rest[:, 1])
+        diagonal = cw * cw + ch * ch
+        dx = (rest[:, 0] + rest[:, 2]) - (box[0] + box[2])
+        dy = (rest[:, 1] + rest[:, 3]) - (box[1] + box[3])
+        distance = (dx * dx + dy * dy) / 4.0
+        iou -= np.divide(distance, diagonal, out=np.zeros_like(distance), where=diagonal > 0)
+    return iou
+
+
+def _prepare(boxes, scores, class_ids, iou_type):
+    boxes = np.asarray(boxes, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+    if len(boxes) != len(scores):
+        raise ValueError(f"Shapes do not match: boxes {len(boxes)}, scores {len(scores)}")
+    if len(boxes) == 0:
+        return boxes, scores, None
+    _check_iou_type(boxes, iou_type)
+    if class_ids is not None:
+        class_ids = np.asarray(class_ids).reshape(-1)
+        if len(class_ids) != len(boxes):
+            raise ValueError(
+                f"Shapes do not match: boxes {len(boxes)}, class_ids {len(class_ids)}"
+            )
+        boxes = _offset_by_class(boxes, class_ids, iou_type)
+    return boxes, scores, _areas(boxes, iou_type)
+
+
+def nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float,
+    class_ids: np.ndarray | None = None,
+    top_k: int = 0,
+    iou_type: str = 'iou',
+) -> np.ndarray:
+    '''Greedy non-maximum suppression.
+
+    Args:
+        boxes: (N, 4) xyxy boxes, or (N, 5) xywhr boxes for iou_type 'probiou'
+        scores: (N,) box scores
+        iou_threshold: boxes overlapping a kept box by more than this are suppressed
+        class_ids: (N,) class ids; if given, only boxes of the same class suppress each other
+        top_k: stop once this many boxes are kept, 0 for no limit
+        iou_type: 'iou', 'diou' (distance IoU) or 'probiou' (probabilistic IoU of oriented boxes)
+
+    Returns:
+        (M,) int64 indexes of the kept boxes, in descending score order.
+    '''
+    boxes, scores, areas = _prepare(boxes, scores, class_ids, iou_type)
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+    order = np.argsort(-scores, kind='stable')
+    if iou_type == 'probiou':
+        # gaussian boxes can overlap without touching, compare with all remaining boxes
+        keep = []
+        while order.size:
+            i = order[0]
+            keep.append(i)
+            if len(keep) == top_k:
+                break
+            order = order[1:]
+            order = order[_iou(boxes, areas, i, order, iou_type) <= iou_threshold]
+        return np.array(keep, dtype=np.int64)
+
+    # Only boxes that overlap in x can suppress each other, and with the classes offset apart
+    # these are few, so each kept box is compared with a window of the boxes sorted by x1.
+    by_x1 = np.argsort(boxes[:, 0], kind='stable')
+    x1 = boxes[by_x1, 0]
+    max_width = max(float((boxes[:, 2] - boxes[:, 0]).max()), 0.0)
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    alive = np.ones(len(order), dtype=bool)
+    keep = []
+    for i in order:
+        if not alive[i]:
+            continue
+        keep.append(i)
+        if len(keep) == top_k:
+            break
+        lo = np.searchsorted(x1, boxes[i, 0] - max_width, 'left')
+        hi = np.searchsorted(x1, boxes[i, 2], 'left')
+        others = by_x1[lo:hi]
+        others = others[alive[others] & (rank[others] > rank[i])]
+        if others.size:
+            alive[others[_iou(boxes, areas, i, others, iou_type) > iou_threshold]] = False
+    return np.array(keep, dtype=np.int64)
+
+
+def soft_nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float,
+    class_ids: np.ndarray | None = None,
+    top_k: int = 0,
+    iou_type: str = 'iou',
+    method: str = 'gaussian',
+    sigma: float = 0.5,
+    score_threshold: float = 0.001,
+) -> tuple[np.ndarray, np.ndarray]:
+    '''Soft non-maximum suppression, decaying the scores of overlapping boxes.
+
+    Args:
+        boxes, scores, iou_threshold, class_ids, top_k, iou_type: as for nms
+        method: 'linear' decays the score by (1 - IoU) above iou_threshold, 'gaussian' by
+            exp(-IoU^2 / sigma) regardless of iou_threshold
+        sigma: spread of the gaussian decay
+        score_threshold: boxes whose decayed score falls below this are dropped
+
+    Returns:
+        (M,) int64 indexes of the kept boxes and (M,) their decayed scores, in the order the
+        boxes were kept (descending decayed score).
+    '''
+    if method not in SOFT_NMS_METHODS:
+        raise ValueError(f"Unsupported soft-NMS method {method!r}, expected {SOFT_NMS_METHODS}")
+    boxes, scores, areas = _prepare(boxes, scores, class_ids, iou_type)
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    scores = scores.copy()
+    remaining = np.flatnonzero(scores > score_threshold)
+    keep = []
+    while remaining.size:
+        best = np.argmax(scores[remaining])
+        i = remaining[best]
+        keep.append(i)
+        if len(keep) == top_k:
+            break
+        remaining = np.delete(remaining, best)
+        iou = np.maximum(_iou(boxes, areas, i, remaining, iou_type), 0.0)
+        if method == 'linear':
+            decay = np.where(iou > iou_threshold, 1.0 - iou, 1.0)
+        else:
+            decay = np.exp(-(iou * iou) / sigma)
+        scores[remaining] *= decay
+        remaining = remaining[scores[remaining] > score_threshold]
+    keep = np.array(keep, dtype=np.int64)
+    return keep, scores[keep]
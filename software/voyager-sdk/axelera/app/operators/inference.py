@@ -342,6 +342,28 @@ def build_onnx_inferencer(model: str):
     return session, post_input_names, post_output_names, post_input_shapes
 
 
+def _split_batch(outputs, batch_size):
+    """Split batched model outputs into per-input outputs with a batch size of 1.
+
+    Args:
+        outputs: tensor, or list of tensors, each with the batch as its first dimension
+        batch_size: number of inputs in the batch (including any zero padding)
+
+    Returns:
+        List of batch_size outputs of the same structure as outputs, or None if an output
+        does not have batch_size as its first dimension and cannot be split.
+    """
+    tensors = outputs if isinstance(outputs, list) else [outputs]
+    if not tensors or any(
+        not isinstance(t, torch.Tensor) or t.dim() == 0 or t.shape[0] != batch_size
+        for t in tensors
+    ):
+        return None
+    if isinstance(outputs, list):
+        return [[t[i : i + 1] for t in tensors] for i in range(batch_size)]
+    return [outputs[i : i + 1] for i in range(batch_size)]
+
+
 def _run_onnx_session(session, input_names, output_names, inputs):
     """Run ONNX inference session with proper input handling.
 
@@ -749,6 +771,7 @@ class Inference:
         self._core_model_output_shapes_cached = None
         self._low_latency = low_latency
         self.devices = []
+        self._batch_capacity = None
 
         self.device = _determine_device(self.model)
         input_tensor_layout = model_info.input_tensor_layout
@@ -1044,6 +1067,71 @@ class Inference:
             raise ValueError(f"Unsupported model type: {type(self.model)}")
         return image, result, meta
 
+    def _get_batch_capacity(self):
+        '''(maximum batch, fixed batch or None) that exec_torch_batch can stack inputs into.
+
+        A maximum of 1 means the model runs one input at a time: compiled (AIPU) models run
+        batch 1 in the torch pipes, and pre/postprocess graphs have fixed input shapes.
+        '''
+        if self._batch_capacity is None:
+            self._batch_capacity = (1, None)
+            if self.model_info.input_tensor_layout == types.TensorLayout.CHWN:
+                pass
+            elif isinstance(self.model, torch.nn.Module):
+                if not (self.pre_ort_sess or self.post_ort_sess):
+                    self._batch_capacity = (sys.maxsize, None)
+            elif isinstance(self.model, types.ONNXModel):
+                inputs = self.ort_sess.get_inputs()
+                batch = inputs[0].shape[0] if len(inputs) == 1 and inputs[0].shape else 1
+                if not isinstance(batch, int):
+                    self._batch_capacity = (sys.maxsize, None)  # dynamic batch dimension
+                elif batch > 1:
+                    self._batch_capacity = (batch, batch)
+        return self._batch_capacity
+
+    def exec_torch_batch(self, image, results, meta, max_batch):
+        '''exec_torch for several inputs of the same task, e.g. the ROIs of a cascade.
+
+        Inputs of the same shape are stacked into batches of up to max_batch inputs when the
+        model accepts a batch dimension (see _get_batch_capacity), one inference call per
+        batch. Returns the model output of every input, in order, as exec_torch would
+        return it for that input alone.
+        '''
+        limit, fixed = self._get_batch_capacity()
+        limit = min(limit, max_batch)
+        if limit <= 1 or len(results) <= 1:
+            return [self.exec_torch(image, result, meta)[1] for result in results]
+
+        layout = self.model_info.input_tensor_layout
+        groups = {}
+        for n, result in enumerate(results):
+            result = _add_batch_channel(result, layout)
+            groups.setdefault(tuple(result.shape), []).append((n, result))
+
+        outputs = [None] * len(results)
+        for group in groups.values():
+            for start in range(0, len(group), limit):
+                chunk = group[start : start + limit]
+                if len(chunk) == 1:
+                    n, result = chunk[0]
+                    outputs[n] = self.exec_torch(image, result, meta)[1]
+                    continue
+                batch = torch.cat([result for _, result in chunk])
+                size = fixed or len(chunk)
+                if size > len(chunk):
+                    padding = batch.new_zeros((size - len(chunk),) + tuple(batch.shape[1:]))
+                    batch = torch.cat([batch, padding])
+                split = _split_batch(self.exec_torch(image, batch, meta)[1], size)
+                if split is None:
+                    LOG.debug(f"{self.model_name}: outputs have no batch dimension, not batching")
+                    self._batch_capacity = (1, None)
+                    for n, result in chunk:
+                        outputs[n] = self.exec_torch(image, result, meta)[1]
+                    continue
+                for (n, _), output in zip(chunk, split):
+                    outputs[n] = output
+        return outputs
+
     def _process_model_outputs(self, outputs):
         """
         Process model outputs by applying post-processing or reshaping.
@@ -4,26 +4,86 @@ from __future__ import annotations
 
 import dataclasses
 import enum
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-if TYPE_CHECKING:
-    import numpy as np
+import numpy as np
 
+if TYPE_CHECKING:
     from axelera import types
 
     from ..meta import AxMeta
 
 
-@dataclasses.dataclass
+def _readonly_array(element, copy: bool):
+    if hasattr(element, 'cpu'):
+        element = element.detach().cpu().numpy()
+    if not isinstance(element, np.ndarray):
+        return element
+    array = element.copy() if copy else element.view()
+    array.flags.writeable = copy
+    return array
+
+
+class LazyTensor:
+    """Output tensors of the last model of a frame, converted to numpy when first read.
+
+    The model outputs are kept as they are (torch tensors or numpy arrays) and only converted
+    when FrameResult.tensor is accessed. The conversion is zero-copy for host tensors, so the
+    arrays share memory with the model outputs and are read-only; use materialize(copy=True)
+    (or the copy_tensors pipeline option) for writable arrays.
+    """
+
+    def __init__(self, outputs: Any):
+        self._outputs = outputs
+
+    def materialize(self, copy: bool = False) -> np.ndarray | list[np.ndarray]:
+        tensor = [_readonly_array(element, copy) for element in self._outputs]
+        return tensor[0] if len(tensor) == 1 else tensor
+
+
+@dataclasses.dataclass(init=False)
 class FrameResult:
     image: Optional[types.Image] = None
-    tensor: Optional[np.ndarray] = None
     meta: Optional[AxMeta] = None
     stream_id: int = 0
     src_timestamp: int = 0
     sink_timestamp: int = 0
     inferences: int = 0
     render_timestamp: int = 0
+    _tensor: Optional[np.ndarray] | LazyTensor = dataclasses.field(default=None, repr=False)
+
+    def __init__(
+        self,
+        image: Optional[types.Image] = None,
+        tensor: Optional[np.ndarray] | LazyTensor = None,
+        meta: Optional[AxMeta] = None,
+        stream_id: int = 0,
+        src_timestamp: int = 0,
+        sink_timestamp: int = 0,
+        inferences: int = 0,
+        render_timestamp: int = 0,
+        _tensor: Optional[np.ndarray] | LazyTensor = None,
+    ):
+        # _tensor is accepted so that dataclasses.replace keeps the tensor
+        self.image = image
+        self._tensor = _tensor if tensor is None else tensor
+        self.meta = meta
+        self.stream_id = stream_id
+        self.src_timestamp = src_timestamp
+        self.sink_timestamp = sink_timestamp
+        self.inferences = inferences
+        self.render_timestamp = render_timestamp
+
+    @property
+    def tensor(self) -> Optional[np.ndarray]:
+        """Output tensor(s) of the last model, materialized from a LazyTensor on first access."""
+        if isinstance(self._tensor, LazyTensor):
+            self._tensor = self._tensor.materialize()
+        return self._tensor
+
+    @tensor.setter
+    def tensor(self, tensor: Optional[np.ndarray] | LazyTensor) -> None:
+        self._tensor = tensor
 
     @property
     def source_id(self) -> int:
@@ -31,6 +91,8 @@ class FrameResult:
         return self.stream_id
 
     def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(f"'FrameResult' object has no attribute '{attr}'")
         try:
             return self.meta[attr].objects
         except KeyError:
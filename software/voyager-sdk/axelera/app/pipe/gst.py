@@ -19,6 +19,7 @@ try:
 except ModuleNotFoundError:
     pass
 
+import numpy as np
 import yaml
 
 from axelera import types
@@ -36,6 +37,93 @@ if TYPE_CHECKING:
 LOG = logging_utils.getLogger(__name__)
 
 
+# Longest wait for a sample before the bus is checked again, in case no bus message arrives
+_BUS_POLL_INTERVAL = 0.1
+
+
+class _SampleQueue:
+    '''Bounded queue of appsink samples with per-stream fairness.
+
+    Each stream holds up to `size` samples, and get returns them round-robin across the streams
+    with pending samples. When the queue of a stream is full, put drops its oldest sample if
+    drop_oldest is set, otherwise it blocks the (streaming) thread until there is space, which
+    is the back-pressure that appsink applies itself with drop=false. on_drop(stream_id, sample)
+    is called (with the queue locked) for every dropped sample, and its results are returned by
+    get along with the next sample of that stream, so the consumer sees the drops in order.
+    '''
+
+    def __init__(
+        self,
+        size: int,
+        drop_oldest: bool,
+        on_drop: Callable[[int, Any], None] | None = None,
+    ):
+        self._size = max(1, size)
+        self._drop_oldest = drop_oldest
+        self._on_drop = on_drop
+        self._streams: dict[int, collections.deque] = collections.defaultdict(collections.deque)
+        self._ready: collections.deque[int] = collections.deque()
+        self._drops: dict[int, list] = collections.defaultdict(list)
+        self._cond = threading.Condition()
+        self._woken = False
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, stream_id: int, sample: Any) -> bool:
+        '''Queue a sample, return False if the queue has been closed.'''
+        with self._cond:
+            samples = self._streams[stream_id]
+            if not self._drop_oldest:
+                self._cond.wait_for(lambda: len(samples) < self._size or self._closed)
+            if self._closed:
+                return False
+            if len(samples) >= self._size:
+                dropped = samples.popleft()
+                self.dropped += 1
+                if self._on_drop:
+                    self._drops[stream_id].append(self._on_drop(stream_id, dropped))
+            elif not samples:
+                self._ready.append(stream_id)
+            samples.append(sample)
+            self._cond.notify_all()
+        return True
+
+    def get(self, timeout: float | None = None) -> tuple[int, Any, list] | None:
+        '''Return the next (stream_id, sample, drops), or None on timeout, wake or close.
+
+        drops holds the on_drop results of the samples of the stream that were dropped between
+        the previous sample returned and this one.
+        '''
+        with self._cond:
+            self._cond.wait_for(lambda: self._ready or self._woken or self._closed, timeout)
+            self._woken = False
+            if not self._ready:
+                return None
+            stream_id = self._ready.popleft()
+            samples = self._streams[stream_id]
+            sample = samples.popleft()
+            if samples:
+                self._ready.append(stream_id)
+            drops = self._drops.pop(stream_id, [])
+            self._cond.notify_all()
+            return stream_id, sample, drops
+
+    def wake(self) -> None:
+        '''Make a waiting get return, e.g. to handle a bus message.'''
+        with self._cond:
+            self._woken = True
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        '''Discard queued samples and release any blocked threads.'''
+        with self._cond:
+            self._closed = True
+            self._streams.clear()
+            self._ready.clear()
+            self._drops.clear()
+            self._cond.notify_all()
+
+
 class GstStream:
     '''
     GstStream is a wrapper around a GStreamer pipeline that
@@ -66,6 +154,15 @@ class GstStream:
         self.agg_pads = gst_helper.get_agg_pads(self.pipeline)
         self.hardware_caps = hardware_caps
         self._appsinks = gst_helper.list_all_by_element_factory_name(pipeline, 'appsink')
+        self._samples = _SampleQueue(
+            config.env.appsink_queue_size, config.env.appsink_drop_oldest, self._dropped_stream_id
+        )
+        for stream_id, sink in enumerate(self._appsinks):
+            sink.set_property('emit-signals', True)
+            sink.connect('new-sample', self._on_new_sample, stream_id)
+        bus = self.pipeline.get_bus()
+        bus.enable_sync_message_emission()
+        bus.connect('sync-message', self._on_sync_message)
         self.decoder = meta.GstDecoder()
         self._removed_sources: set[str] = set()
         self._pending_events: collections.deque[FrameEvent] = collections.deque()
@@ -92,6 +189,22 @@ class GstStream:
         handler = self._handlers.get(sid)
         return bool(handler) and handler.is_pair_validation
 
+    def _on_new_sample(self, sink, stream_id):
+        '''Called in the streaming thread of an appsink when a sample is available.'''
+        sample = sink.emit('pull-sample')
+        if sample is not None and not self._samples.put(stream_id, sample):
+            return Gst.FlowReturn.FLUSHING
+        return Gst.FlowReturn.OK
+
+    def _dropped_stream_id(self, stream_id, sample):
+        '''Called in the streaming thread for a dropped sample, see _frame_from_sample.'''
+        stream_data = self.decoder.extract_all_meta(sample.get_buffer()).get(self.stream_meta_key)
+        return self._unpack_stream_data(stream_data, stream_id)[0]
+
+    def _on_sync_message(self, bus, message):
+        # wake the iterator so that the message is handled without waiting for a sample
+        self._samples.wake()
+
     def _at_eos(self):
         if not self.pipeline:
             return True
@@ -139,6 +252,7 @@ class GstStream:
                 return CONTINUE
             else:
                 LOG.warning("Unable to identify error source, stopping pipeline")
+            self._samples.close()  # release any streaming thread waiting to queue a sample
             try:
                 gst_helper.set_state_and_wait(self.pipeline, Gst.State.NULL)
             except Exception as e:
@@ -157,29 +271,37 @@ class GstStream:
         # we send the first frame through the pipeline to ensure all elemnets are
         # fully constructed, this means errors in the pipeline are detected early
         while not self._at_eos():
-            for stream_id, sink in enumerate(self._appsinks):
-                sample = sink.try_pull_sample(Gst.MSECOND)
-                if sample:
-                    LOG.debug("Received first frame from gstreamer")
-                    return stream_id, sample
+            if (item := self._samples.get(_BUS_POLL_INTERVAL)) is not None:
+                LOG.debug("Received first frame from gstreamer")
+                return item
+
+    @staticmethod
+    def _unpack_stream_data(stream_data, stream_id) -> tuple[int, int, int]:
+        '''Return (stream_id, timestamp, inferences) from the decoded stream meta, if any.'''
+        if stream_data is None:
+            return stream_id, 0, 0
+        if isinstance(stream_data, tuple):
+            return stream_data
+        return (
+            stream_data.get('stream_id', stream_id),
+            stream_data.get('timestamp', 0),
+            stream_data.get('inferences', 0),
+        )
 
-    def _frame_from_sample(self, sample, stream_id) -> tuple[FrameEvent, GstTaskMeta]:
+    def _frame_from_sample(self, sample, stream_id, drops=()) -> tuple[FrameEvent, GstTaskMeta]:
         now = time.time()
+        # discard the image ids of the samples dropped before this one, in this thread so that
+        # the ids stay in step with the samples that are delivered
+        for dropped_id in drops:
+            if (mq := self._handlers.get(dropped_id)) is not None:
+                mq.get()
         buf = sample.get_buffer()
         image = types.Image.fromgst(sample)
 
         gst_task_meta = self.decoder.extract_all_meta(buf)
         # pop here so that the stream_id is not treated as a normal meta element
-        stream_data = gst_task_meta.pop(self.stream_meta_key, (stream_id, 0, 0))
-        stream_id, ts, inferences = (
-            stream_data
-            if isinstance(stream_data, tuple)
-            else (
-                stream_data.get('stream_id', stream_id),
-                stream_data.get('timestamp', 0),
-                stream_data.get('inferences', 0),
-            )
-        )
+        stream_data = gst_task_meta.pop(self.stream_meta_key, None)
+        stream_id, ts, inferences = self._unpack_stream_data(stream_data, stream_id)
 
         tensor = None  # TODO where do we get tensor from?
         mq = self._handlers.get(stream_id)
@@ -191,18 +313,21 @@ class GstStream:
     def __iter__(self) -> Iterable[tuple[FrameEvent, dict[str, Any] | None]]:
         try:
             if self._pre_sample is not None:
-                stream_id, sample = self._pre_sample
+                stream_id, sample, drops = self._pre_sample
                 self._pre_sample = None
                 if sample:
-                    yield self._frame_from_sample(sample, stream_id)
+                    yield self._frame_from_sample(sample, stream_id, drops)
 
             while not self._at_eos():
                 while self._pending_events:
                     yield (self._pending_events.popleft(), None)
-                for stream_id, sink in enumerate(self._appsinks):
-                    sample = sink.try_pull_sample(Gst.MSECOND)
-                    if sample:
-                        yield self._frame_from_sample(sample, stream_id)
+                if (item := self._samples.get(_BUS_POLL_INTERVAL)) is not None:
+                    stream_id, sample, drops = item
+                    yield self._frame_from_sample(sample, stream_id, drops)
+            # samples are queued as they arrive, so some may still be waiting at end of stream
+            while self.pipeline and (item := self._samples.get(0)) is not None:
+                stream_id, sample, drops = item
+                yield self._frame_from_sample(sample, stream_id, drops)
         except Exception as e:
             LOG.error(f"Error in GstStream iteration: {e!r}")
             self.stop()
@@ -217,6 +342,9 @@ class GstStream:
             for t in self._handlers.values():
                 t.join()
             self._stop_event.clear()
+        self._samples.close()
+        if self._samples.dropped:
+            LOG.debug(f"Dropped {self._samples.dropped} samples from full appsink queues")
         if pipeline := self.pipeline:
             self.pipeline = None
             self.agg_pads = {}
@@ -228,16 +356,56 @@ class GstStream:
             del pipeline
 
 
+# GStreamer video format and number of channels of the color formats fed to appsrc
+_APPSRC_FORMATS = {
+    types.ColorFormat.RGB: ('RGB', 3),
+    types.ColorFormat.BGR: ('BGR', 3),
+    types.ColorFormat.GRAY: ('GRAY8', 1),
+    types.ColorFormat.RGBA: ('RGBA', 4),
+    types.ColorFormat.BGRA: ('BGRA', 4),
+}
+# Formats to convert to when downstream does not accept the native format of an image
+_APPSRC_FALLBACK_FORMATS = {
+    types.ColorFormat.RGB: types.ColorFormat.RGBA,
+    types.ColorFormat.BGR: types.ColorFormat.BGRA,
+}
+
+
+def _copy_to_buffer(buffer: Gst.Buffer, array: np.ndarray, info: GstVideo.VideoInfo):
+    '''Copy an (h, w[, c]) uint8 image into buffer, honouring the stride of info.'''
+    h = info.height
+    rows = array.reshape(h, -1)
+    stride, offset = info.stride[0], info.offset[0]
+    ok, mapinfo = buffer.map(Gst.MapFlags.WRITE)
+    if not ok:
+        raise RuntimeError("Unable to map appsrc buffer for writing")
+    try:
+        dst = np.frombuffer(mapinfo.data, np.uint8)
+        if dst.flags.writeable:
+            dst[offset : offset + h * stride].reshape(h, stride)[:, : rows.shape[1]] = rows
+            return
+    finally:
+        buffer.unmap(mapinfo)
+    # older gst-python maps read-only, fill the padded frame in one call instead
+    padded = np.zeros((h, stride), np.uint8)
+    padded[:, : rows.shape[1]] = rows
+    buffer.fill(offset, padded.tobytes())
+
+
 class _AppSrcHandler:
     def __init__(self, appsrc, frame_generator, stop_event):
         self._mq = queue.Queue()
         self._enough_data = False
+        self._cond = threading.Condition()
         appsrc.connect("need-data", self._on_need_data)
         appsrc.connect("enough-data", self._on_enough_data)
         self._mq = queue.Queue()
         self._thr = utils.ExceptionThread(target=self._feed_data, args=(appsrc, frame_generator))
         self._stop_event = stop_event
         self._pair_validation = None  # until we know otherwise
+        self._native_formats: dict[types.ColorFormat, bool] = {}
+        self._info = None
+        self._pool = None
 
     def get(self):
         return self._mq.get()
@@ -246,6 +414,8 @@ class _AppSrcHandler:
         self._thr.start()
 
     def join(self):
+        with self._cond:
+            self._cond.notify_all()  # the stop event is set, wake the feeding thread
         self._thr.join()
 
     @property
@@ -253,10 +423,13 @@ class _AppSrcHandler:
         return bool(self._pair_validation)
 
     def _on_need_data(self, appsrc, length):
-        self._enough_data = False
+        with self._cond:
+            self._enough_data = False
+            self._cond.notify_all()
 
     def _on_enough_data(self, appsrc):
-        self._enough_data = True
+        with self._cond:
+            self._enough_data = True
 
     def _feed_data(self, appsrc, frame_generator):
         '''
@@ -264,24 +437,66 @@ class _AppSrcHandler:
         It calls the data src to get the next image and pushes it to the appsrc
         If the loader raises StopIteration, it will emit an end-of-stream signal
         '''
-        # we need this limitation for VAAPI+GPU pipeline which runs too fast at preprocessing
-        delay = 0.001
+
+        def can_feed():
+            return not self._enough_data or self._stop_event.is_set()
+
         try:
             while not self._stop_event.is_set():
-                if not self._enough_data:
-                    delay = self._feed_data_once(appsrc, frame_generator)
-                    delay = 0.001 if delay is None else 0.01
-                else:
-                    time.sleep(delay)
+                with self._cond:
+                    # the timeout is a safeguard for a stop event set without a notification
+                    if not self._cond.wait_for(can_feed, timeout=0.1):
+                        continue
+                if not self._stop_event.is_set():
+                    self._feed_data_once(appsrc, frame_generator)
         except StopIteration:
             LOG.debug("Frame generator raised StopIteration, stopping feeding thread")
         except Exception as e:
             LOG.error(f"Frame generator raised an error: {e}, stopping feeding thread")
             LOG.error(traceback.format_exc())
         appsrc.end_of_stream()
+        if self._pool is not None:
+            self._pool.set_active(False)
         self._stop_event.set()
         LOG.trace("Feeding thread stopped")
 
+    def _accepts_format(self, appsrc, color_format: types.ColorFormat) -> bool:
+        '''True if the elements after appsrc accept images in color_format without conversion.'''
+        if (accepted := self._native_formats.get(color_format)) is None:
+            gst_format, _ = _APPSRC_FORMATS[color_format]
+            peer_caps = appsrc.get_static_pad('src').peer_query_caps(None)
+            # ANY means that downstream did not tell, so keep to the formats fed until now
+            accepted = not peer_caps.is_any() and peer_caps.can_intersect(
+                Gst.Caps.from_string(f'video/x-raw,format={gst_format}')
+            )
+            self._native_formats[color_format] = accepted
+            LOG.debug(f"appsrc {'accepts' if accepted else 'converts'} {color_format.name} images")
+        return accepted
+
+    def _acquire_buffer(self, appsrc, format: types.ColorFormat, w: int, h: int):
+        gst_format, _ = _APPSRC_FORMATS[format]
+        info = self._info
+        if info is None or (info.width, info.height, info.finfo.name) != (w, h, gst_format):
+            info = GstVideo.VideoInfo()
+            info.set_format(GstVideo.VideoFormat.from_string(gst_format), w, h)
+            info.fps_n = 120
+            info.fps_d = 1
+            caps = info.to_caps()
+            appsrc.set_caps(caps)
+            # buffers are reused once downstream has released them, instead of allocated per frame
+            if self._pool is not None:
+                self._pool.set_active(False)
+            self._pool = Gst.BufferPool()
+            pool_config = self._pool.get_config()
+            Gst.BufferPool.config_set_params(pool_config, caps, info.size, 0, 0)
+            self._pool.set_config(pool_config)
+            self._pool.set_active(True)
+            self._info = info
+        ret, buffer = self._pool.acquire_buffer(None)
+        if ret != Gst.FlowReturn.OK:
+            raise RuntimeError(f"Unable to acquire appsrc buffer: {ret.value_nick}")
+        return buffer, info
+
     def _feed_data_once(self, appsrc, frame_generator):
         data = next(frame_generator)
         assert isinstance(data, types.FrameInput), f"Expected FrameInput, got {type(data)}"
@@ -295,35 +510,14 @@ class _AppSrcHandler:
         if self._pair_validation and len(image_source) != 2:
             LOG.warning(f"Pair validation requires 2 images, got {len(image_source)}")
         for image in image_source:
+            format = image.color_format
+            if format not in _APPSRC_FORMATS:
+                raise NotImplementedError(f"Unsupported color format: {format}")
+            if format in _APPSRC_FALLBACK_FORMATS and not self._accepts_format(appsrc, format):
+                format = _APPSRC_FALLBACK_FORMATS[format]
             w, h = image.size
-            num_channels = 4
-            if image.color_format == types.ColorFormat.RGB:
-                format = types.ColorFormat.RGBA
-            elif image.color_format == types.ColorFormat.BGR:
-                format = types.ColorFormat.BGRA
-            elif image.color_format == types.ColorFormat.GRAY:
-                num_channels = 1
-                format = types.ColorFormat.GRAY
-            else:
-                raise NotImplementedError(f"Unsupported color format: {image.color_format}")
-            frame = image.tobytes(format)
-            format_int = image.get_gst_format(format)
-            in_info = GstVideo.VideoInfo()
-            in_info.set_format(format_int, w, h)
-            in_info.fps_n = 120
-            in_info.fps_d = 1
-            caps = in_info.to_caps()
-            appsrc.set_caps(caps)
-            if in_info.stride[0] == w * num_channels:
-                buffer = Gst.Buffer.new_wrapped(frame)
-            else:
-                buffer = Gst.Buffer.new_allocate(None, in_info.size, None)
-                for i in range(h):
-                    frame_offset = i * w * num_channels
-                    buffer_offset = in_info.offset[0] + i * in_info.stride[0]
-                    buffer.fill(
-                        buffer_offset, frame[frame_offset : frame_offset + w * num_channels]
-                    )
+            buffer, info = self._acquire_buffer(appsrc, format, w, h)
+            _copy_to_buffer(buffer, np.asarray(image.asarray(format), np.uint8), info)
             appsrc.push_buffer(buffer)
             self._mq.put((data.img_id, data.ground_truth))
         return data
@@ -2,7 +2,6 @@
 # Construct torch application pipeline
 from __future__ import annotations
 
-from copy import deepcopy
 import time
 import traceback
 from typing import Callable
@@ -10,7 +9,7 @@ from typing import Callable
 from axelera import types
 
 from . import base, frame_data
-from .. import logging_utils, torch_utils, utils
+from .. import config, logging_utils, torch_utils, utils
 from ..meta import AxMeta
 from ..torch_utils import torch
 
@@ -45,28 +44,25 @@ class TorchPipe(base.Pipe):
                             image, image_list, meta = model_pipe.input.exec_torch(
                                 image, [], meta, data.stream_id
                             )
+                            inputs = []
                             for result in image_list:
                                 for op in model_pipe.preprocess:
                                     result = op.exec_torch(result)
+                                inputs.append(result)
+                            # ROIs of a cascade task are stacked into batches
+                            outputs = model_pipe.inference.exec_torch_batch(
+                                image, inputs, meta, config.env.torch_roi_batch_size
+                            )
+                            for result in outputs:
                                 inferences += 1
-                                image, result, meta = model_pipe.inference.exec_torch(
-                                    image, result, meta
-                                )
                                 for op in model_pipe.postprocess:
                                     image, result, meta = op.exec_torch(image, result, meta)
 
                             if not is_pair_validation:
                                 # always return tensor from the last model if having multiple models in a network
-                                tensor = [
-                                    deepcopy(
-                                        element.cpu().detach().numpy()
-                                        if hasattr(element, 'cpu')
-                                        else element
-                                    )
-                                    for element in result
-                                ]
-                                if len(tensor) == 1:
-                                    tensor = tensor[0]
+                                tensor = frame_data.LazyTensor(result)
+                                if self.config.copy_tensors:
+                                    tensor = tensor.materialize(copy=True)
                             else:
                                 tensor = None
                     now = time.time()
@@ -0,0 +1,326 @@
+// Copyright Axelera AI, 2025
+// DB (Differentiable Binarization) text detection decoder, e.g. for PP-OCR det models
+
+#include <opencv2/opencv.hpp>
+#include "AxDataInterface.h"
+#include "AxLog.hpp"
+#include "AxMetaObjectDetection.hpp"
+#include "AxOpUtils.hpp"
+#include "AxUtils.hpp"
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <unordered_set>
+#include <vector>
+
+namespace dbnet_decode
+{
+
+struct properties {
+  std::vector<float> zero_points{};
+  std::vector<float> scales{};
+  float bin_threshold{ 0.3F };
+  float box_threshold{ 0.6F };
+  float unclip_ratio{ 1.5F };
+  int min_size{ 3 };
+  int max_candidates{ 1000 };
+  bool oriented{ false };
+  std::string meta_name{};
+  std::string master_meta{};
+  std::string association_meta{};
+  bool scale_up{ true };
+  bool letterbox{ false };
+  int model_width{};
+  int model_height{};
+};
+
+struct text_region {
+  cv::RotatedRect rect;
+  float score;
+};
+
+/// @brief Get the probability map as a float matrix, accepting NCHW or NHWC single
+///        channel tensors, either float or int8 (dequantized with scales/zero_points)
+/// @param tensor - The detector output tensor
+/// @param prop - The properties of the decoder
+/// @return - The probability map [H, W]
+cv::Mat
+probability_map(const AxTensorInterface &tensor, const properties &prop)
+{
+  const auto &sizes = tensor.sizes;
+  if (sizes.size() < 2) {
+    throw std::runtime_error("dbnet_decode : probability map must have at least 2 dims");
+  }
+  const bool nhwc = sizes.size() == 4 && sizes[3] == 1;
+  const int height = nhwc ? sizes[1] : sizes[sizes.size() - 2];
+  const int width = nhwc ? sizes[2] : sizes[sizes.size() - 1];
+  if (static_cast<size_t>(height) * width != tensor.total()) {
+    throw std::runtime_error("dbnet_decode : expected a single channel probability map");
+  }
+
+  if (tensor.bytes == 4) {
+    return cv::Mat(height, width, CV_32F, tensor.data);
+  }
+  if (tensor.bytes != 1 || prop.scales.empty()) {
+    throw std::runtime_error(
+        "dbnet_decode : int8 probability map needs scales and zero_points");
+  }
+  cv::Mat quantized(height, width, CV_8S, tensor.data);
+  cv::Mat prob;
+  quantized.convertTo(prob, CV_32F, prop.scales[0], -prop.zero_points[0] * prop.scales[0]);
+  return prob;
+}
+
+/// @brief Find text regions in the probability map
+/// @param prob - The probability map
+/// @param prop - The properties of the decoder
+/// @return - Unclipped min-area rectangles and their mean probability
+std::vector<text_region>
+find_regions(const cv::Mat &prob, const properties &prop)
+{
+  cv::Mat bitmap = prob > prop.bin_threshold;
+  std::vector<std::vector<cv::Point>> contours;
+  // As PP-OCR: RETR_LIST also finds regions nested inside the hole of another region
+  cv::findContours(bitmap, contours, cv::RETR_LIST, cv::CHAIN_APPROX_SIMPLE);
+
+  std::vector<text_region> regions;
+  regions.reserve(std::min<size_t>(contours.size(), prop.max_candidates));
+  cv::Mat mask;
+  int num_candidates = 0;
+  for (size_t i = 0; i != contours.size() && num_candidates < prop.max_candidates; ++i) {
+    // Hole borders (positive oriented area) are not text regions
+    if (cv::contourArea(contours[i], true) > 0) {
+      continue;
+    }
+    ++num_candidates;
+    auto rect = cv::minAreaRect(contours[i]);
+    if (std::min(rect.size.width, rect.size.height) < prop.min_size) {
+      continue;
+    }
+
+    auto bounds = cv::boundingRect(contours[i]) & cv::Rect(0, 0, prob.cols, prob.rows);
+    mask = cv::Mat::zeros(bounds.size(), CV_8U);
+    cv::drawContours(mask, contours, static_cast<int>(i), cv::Scalar(1), cv::FILLED,
+        cv::LINE_8, cv::noArray(), 0, -bounds.tl());
+    const auto score = static_cast<float>(cv::mean(prob(bounds), mask)[0]);
+    if (score < prop.box_threshold) {
+      continue;
+    }
+
+    // Offsetting a rectangle by d grows both sides by 2d
+    const auto area = rect.size.width * rect.size.height;
+    const auto perimeter = 2.0F * (rect.size.width + rect.size.height);
+    const auto distance = area * prop.unclip_ratio / perimeter;
+    rect.size.width += 2.0F * distance;
+    rect.size.height += 2.0F * distance;
+    if (std::min(rect.size.width, rect.size.height) < prop.min_size + 2) {
+      continue;
+    }
+    regions.push_back({ rect, score });
+  }
+  return regions;
+}
+
+/// @brief Normalise map coordinates the way ax_utils::scale_boxes expects them
+struct normaliser {
+  float x;
+  float y;
+};
+
+normaliser
+make_normaliser(const cv::Mat &prob, const properties &prop)
+{
+  if (prop.letterbox) {
+    const auto recip = 1.0F / std::max(prob.cols, prob.rows);
+    return { recip, recip };
+  }
+  return { 1.0F / prob.cols, 1.0F / prob.rows };
+}
+
+std::vector<ax_utils::fbox>
+to_boxes(const std::vector<text_region> &regions, normaliser norm)
+{
+  std::vector<ax_utils::fbox> boxes;
+  boxes.reserve(regions.size());
+  for (const auto &region : regions) {
+    const auto bounds = region.rect.boundingRect2f();
+    boxes.push_back({
+        std::clamp(bounds.x * norm.x, 0.0F, 1.0F),
+        std::clamp(bounds.y * norm.y, 0.0F, 1.0F),
+        std::clamp((bounds.x + bounds.width) * norm.x, 0.0F, 1.0F),
+        std::clamp((bounds.y + bounds.height) * norm.y, 0.0F, 1.0F),
+    });
+  }
+  return boxes;
+}
+
+std::vector<ax_utils::fobox>
+to_oriented_boxes(const std::vector<text_region> &regions, normaliser norm)
+{
+  std::vector<ax_utils::fobox> boxes;
+  boxes.reserve(regions.size());
+  for (const auto &region : regions) {
+    const auto &rect = region.rect;
+    boxes.push_back({
+        rect.center.x * norm.x,
+        rect.center.y * norm.y,
+        rect.size.width * norm.x,
+        rect.size.height * norm.y,
+        static_cast<float>(rect.angle * M_PI / 180.0),
+    });
+  }
+  return boxes;
+}
+
+} // namespace dbnet_decode
+
+extern "C" void
+decode_to_meta(const AxTensorsInterface &in_tensors, const dbnet_decode::properties *prop,
+    unsigned int subframe_index, unsigned int number_of_subframes,
+    std::unordered_map<std::string, std::unique_ptr<AxMetaBase>> &map,
+    const AxDataInterface &video_interface, Ax::Logger &logger)
+{
+  auto start_time = std::chrono::high_resolution_clock::now();
+  if (!prop) {
+    logger(AX_ERROR) << "dbnet_decode : properties not set" << std::endl;
+    throw std::runtime_error("dbnet_decode : properties not set");
+  }
+  if (in_tensors.size() != 1) {
+    throw std::runtime_error("dbnet_decode : expected 1 probability map tensor, got "
+                             + std::to_string(in_tensors.size()));
+  }
+
+  auto prob = dbnet_decode::probability_map(in_tensors[0], *prop);
+  auto regions = dbnet_decode::find_regions(prob, *prop);
+  auto norm = dbnet_decode::make_normaliser(prob, *prop);
+
+  std::vector<float> scores;
+  scores.reserve(regions.size());
+  for (const auto &region : regions) {
+    scores.push_back(region.score);
+  }
+  std::vector<int> class_ids(regions.size(), 0);
+  std::vector<int> ids;
+
+  BboxXyxy master_box{};
+  if (!prop->master_meta.empty()) {
+    const auto &box_key = prop->association_meta.empty() ? prop->master_meta :
+                                                           prop->association_meta;
+    auto *master_meta = ax_utils::get_meta<AxMetaBbox>(box_key, map, "dbnet_decode");
+    master_box = master_meta->get_box_xyxy(subframe_index);
+  }
+
+  if (prop->oriented) {
+    auto boxes = dbnet_decode::to_oriented_boxes(regions, norm);
+    auto pixel_boxes = prop->master_meta.empty() ?
+                           ax_utils::scale_boxes(boxes, std::get<AxVideoInterface>(video_interface),
+                               prop->model_width, prop->model_height, prop->scale_up, prop->letterbox) :
+                           ax_utils::scale_shift_boxes(boxes, master_box, prop->model_width,
+                               prop->model_height, prop->scale_up, prop->letterbox);
+    ax_utils::insert_and_associate_meta<AxMetaObjDetectionOBB>(map, prop->meta_name,
+        prop->master_meta, subframe_index, number_of_subframes, prop->association_meta,
+        std::move(pixel_boxes), std::move(scores), std::move(class_ids), ids);
+  } else {
+    auto boxes = dbnet_decode::to_boxes(regions, norm);
+    auto pixel_boxes = prop->master_meta.empty() ?
+                           ax_utils::scale_boxes(boxes, std::get<AxVideoInterface>(video_interface),
+                               prop->model_width, prop->model_height, prop->scale_up, prop->letterbox) :
+                           ax_utils::scale_shift_boxes(boxes, master_box, prop->model_width,
+                               prop->model_height, prop->scale_up, prop->letterbox);
+    ax_utils::insert_and_associate_meta<AxMetaObjDetection>(map, prop->meta_name,
+        prop->master_meta, subframe_index, number_of_subframes, prop->association_meta,
+        std::move(pixel_boxes), std::move(scores), std::move(class_ids), ids);
+  }
+
+  auto end_time = std::chrono::high_resolution_clock::now();
+  auto duration = std::chrono::duration_cast<std::chrono::microseconds>(end_time - start_time);
+  logger(AX_DEBUG) << "dbnet_decode : Decoding " << regions.size() << " text regions took "
+                   << duration.count() << " microseconds" << std::endl;
+}
+
+extern "C" const std::unordered_set<std::string> &
+allowed_properties()
+{
+  static const std::unordered_set<std::string> allowed_properties{
+    "meta_key",
+    "master_meta",
+    "association_meta",
+    "zero_points",
+    "scales",
+    "bin_threshold",
+    "box_threshold",
+    "unclip_ratio",
+    "min_size",
+    "max_candidates",
+    "oriented",
+    "scale_up",
+    "letterbox",
+    "model_width",
+    "model_height",
+  };
+  return allowed_properties;
+}
+
+extern "C" std::shared_ptr<void>
+init_and_set_static_properties(
+    const std::unordered_map<std::string, std::string> &input, Ax::Logger &logger)
+{
+  auto props = std::make_shared<dbnet_decode::properties>();
+  props->meta_name = Ax::get_property(
+      input, "meta_key", "dbnet_decode_static_properties", props->meta_name);
+  props->master_meta = Ax::get_property(
+      input, "master_meta", "dbnet_decode_static_properties", props->master_meta);
+  props->association_meta = Ax::get_property(input, "association_meta",
+      "dbnet_decode_static_properties", props->association_meta);
+  props->zero_points = Ax::get_property(
+      input, "zero_points", "dbnet_decode_static_properties", props->zero_points);
+  props->scales = Ax::get_property(
+      input, "scales", "dbnet_decode_static_properties", props->scales);
+  if (props->zero_points.size() != props->scales.size()) {
+    logger(AX_ERROR) << "dbnet_decode_static_properties : zero_points and scales must have "
+                        "the same number of elements."
+                     << std::endl;
+    throw std::runtime_error(
+        "dbnet_decode_static_properties : zero_points and scales must be the same size");
+  }
+  props->unclip_ratio = Ax::get_property(
+      input, "unclip_ratio", "dbnet_decode_static_properties", props->unclip_ratio);
+  props->min_size = Ax::get_property(
+      input, "min_size", "dbnet_decode_static_properties", props->min_size);
+  props->max_candidates = Ax::get_property(
+      input, "max_candidates", "dbnet_decode_static_properties", props->max_candidates);
+  props->oriented = Ax::get_property(
+      input, "oriented", "dbnet_decode_static_properties", props->oriented);
+  props->scale_up = Ax::get_property(
+      input, "scale_up", "dbnet_decode_static_properties", props->scale_up);
+  props->letterbox = Ax::get_property(
+      input, "letterbox", "dbnet_decode_static_properties", props->letterbox);
+  props->model_width = Ax::get_property(
+      input, "model_width", "dbnet_decode_static_properties", props->model_width);
+  props->model_height = Ax::get_property(
+      input, "model_height", "dbnet_decode_static_properties", props->model_height);
+  if (props->model_height == 0 || props->model_width == 0) {
+    logger(AX_ERROR) << "dbnet_decode_static_properties : model_width and model_height must "
+                        "be provided"
+                     << std::endl;
+    throw std::runtime_error(
+        "dbnet_decode_static_properties : model_width and model_height must be provided");
+  }
+  if (props->unclip_ratio <= 0.0F) {
+    throw std::runtime_error("dbnet_decode_static_properties : unclip_ratio must be positive");
+  }
+  return props;
+}
+
+extern "C" void
+set_dynamic_properties(const std::unordered_map<std::string, std::string> &input,
+    dbnet_decode::properties *prop, Ax::Logger &logger)
+{
+  prop->bin_threshold = Ax::get_property(
+      input, "bin_threshold", "dbnet_decode_dynamic_properties", prop->bin_threshold);
+  prop->box_threshold = Ax::get_property(
+      input, "box_threshold", "dbnet_decode_dynamic_properties", prop->box_threshold);
+  logger(AX_DEBUG) << "prop->bin_threshold is " << prop->bin_threshold
+                   << ", prop->box_threshold is " << prop->box_threshold << std::endl;
+}
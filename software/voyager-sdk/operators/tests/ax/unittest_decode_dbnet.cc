@@ -0,0 +1,222 @@
+// Copyright Axelera AI, 2025
+#include "gtest/gtest.h"
+#include <gmodule.h>
+#include "gmock/gmock.h"
+#include "unittest_ax_common.h"
+
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
+
+#include "AxDataInterface.h"
+#include "AxLog.hpp"
+#include "AxMeta.hpp"
+#include "AxMetaObjectDetection.hpp"
+
+namespace
+{
+struct object_meta {
+  std::vector<int32_t> boxes;
+  std::vector<float> scores;
+  std::vector<int32_t> classes;
+};
+
+object_meta
+get_meta(const std::unordered_map<std::string, std::unique_ptr<AxMetaBase>> &map,
+    std::string meta_identifier)
+{
+  auto position = map.find(meta_identifier);
+  if (position == map.end()) {
+    return { {}, {} };
+  }
+  auto *meta = position->second.get();
+  EXPECT_NE(meta, nullptr);
+
+  auto actual_metadata = meta->get_extern_meta();
+  EXPECT_EQ(actual_metadata.size(), 3);
+
+  auto p_boxes = reinterpret_cast<const int32_t *>(actual_metadata[0].meta);
+  auto p_scores = reinterpret_cast<const float *>(actual_metadata[1].meta);
+  auto p_classes = reinterpret_cast<const int32_t *>(actual_metadata[2].meta);
+  auto actual_boxes = std::vector<int32_t>{ p_boxes,
+    p_boxes + actual_metadata[0].meta_size / sizeof(int32_t) };
+  auto actual_scores = std::vector<float>{ p_scores,
+    p_scores + actual_metadata[1].meta_size / sizeof(float) };
+  auto actual_classes = std::vector<int32_t>{ p_classes,
+    p_classes + actual_metadata[2].meta_size / sizeof(int32_t) };
+
+  return { actual_boxes, actual_scores, actual_classes };
+}
+
+template <typename T>
+AxTensorsInterface
+tensors_from_vector(std::vector<T> &tensors, std::vector<int> sizes)
+{
+  return {
+    { sizes, sizeof tensors[0], tensors.data() },
+  };
+}
+
+//  64x64 map with one filled rectangle of the given probability
+std::vector<float>
+map_with_rect(int x1, int y1, int x2, int y2, float value)
+{
+  std::vector<float> prob(64 * 64, 0.0F);
+  for (int y = y1; y != y2; ++y) {
+    for (int x = x1; x != x2; ++x) {
+      prob[y * 64 + x] = value;
+    }
+  }
+  return prob;
+}
+
+} // namespace
+
+TEST(dbnet_errors, model_size_must_be_provided)
+{
+  std::unordered_map<std::string, std::string> properties = {
+    { "meta_key", "text" },
+  };
+  EXPECT_THROW(Ax::LoadDecode("dbnet", properties), std::runtime_error);
+}
+
+TEST(dbnet_errors, different_scale_and_zero_point_sizes_throws)
+{
+  std::unordered_map<std::string, std::string> properties = {
+    { "model_width", "64" },
+    { "model_height", "64" },
+    { "zero_points", "0, 0" },
+    { "scales", "1" },
+  };
+  EXPECT_THROW(Ax::LoadDecode("dbnet", properties), std::runtime_error);
+}
+
+TEST(dbnet_errors, multi_channel_map_throws)
+{
+  std::unordered_map<std::string, std::string> properties = {
+    { "meta_key", "text" },
+    { "model_width", "64" },
+    { "model_height", "64" },
+  };
+  auto decoder = Ax::LoadDecode("dbnet", properties);
+  std::vector<float> prob(2 * 64 * 64, 0.0F);
+  AxVideoInterface video_info{ { 64, 64, 64, 0, AxVideoFormat::RGB }, nullptr };
+  std::unordered_map<std::string, std::unique_ptr<AxMetaBase>> map{};
+  auto tensors = tensors_from_vector(prob, { 1, 2, 64, 64 });
+  EXPECT_THROW(decoder->decode_to_meta(tensors, 0, 1, map, video_info), std::runtime_error);
+}
+
+TEST(dbnet_decode, empty_map_gives_no_boxes)
+{
+  std::unordered_map<std::string, std::string> properties = {
+    { "meta_key", "text" },
+    { "model_width", "64" },
+    { "model_height", "64" },
+  };
+  auto decoder = Ax::LoadDecode("dbnet", properties);
+  std::vector<float> prob(64 * 64, 0.0F);
+  AxVideoInterface video_info{ { 64, 64, 64, 0, AxVideoFormat::RGB }, nullptr };
+  std::unordered_map<std::string, std::unique_ptr<AxMetaBase>> map{};
+  auto tensors = tensors_from_vector(prob, { 1, 1, 64, 64 });
+  decoder->decode_to_meta(tensors, 0, 1, map, video_info);
+
+  auto [actual_boxes, actual_scores, actual_classes] = get_meta(map, "text");
+  EXPECT_EQ(actual_boxes, std::vector<int32_t>{});
+  EXPECT_EQ(actual_scores, std::vector<float>{});
+}
+
+TEST(dbnet_decode, low_probability_region_is_filtered)
+{
+  std::unordered_map<std::string, std::string> properties = {
+    { "meta_key", "text" },
+    { "model_width", "64" },
+    { "model_height", "64" },
+    { "box_threshold", "0.6" },
+  };
+  auto decoder = Ax::LoadDecode("dbnet", properties);
+  auto prob = map_with_rect(10, 10, 50, 20, 0.5F);
+  AxVideoInterface video_info{ { 64, 64, 64, 0, AxVideoFormat::RGB }, nullptr };
+  std::unordered_map<std::string, std::unique_ptr<AxMetaBase>> map{};
+  auto tensors = tensors_from_vector(prob, { 1, 1, 64, 64 });
+  decoder->decode_to_meta(tensors, 0, 1, map, video_info);
+
+  auto [actual_boxes, actual_scores, actual_classes] = get_meta(map, "text");
+  EXPECT_EQ(actual_scores, std::vector<float>{});
+}
+
+TEST(dbnet_decode, text_line_is_unclipped_and_scaled)
+{
+  std::unordered_map<std::string, std::string> properties = {
+    { "meta_key", "text" },
+    { "model_width", "64" },
+    { "model_height", "64" },
+    { "unclip_ratio", "1.5" },
+  };
+  auto decoder = Ax::LoadDecode("dbnet", properties);
+  auto prob = map_with_rect(10, 10, 50, 20, 0.9F);
+  //  Video is twice the model size, map is a plain resize
+  AxVideoInterface video_info{ { 128, 128, 128, 0, AxVideoFormat::RGB }, nullptr };
+  std::unordered_map<std::string, std::unique_ptr<AxMetaBase>> map{};
+  auto tensors = tensors_from_vector(prob, { 1, 1, 64, 64 });
+  decoder->decode_to_meta(tensors, 0, 1, map, video_info);
+
+  auto [actual_boxes, actual_scores, actual_classes] = get_meta(map, "text");
+  ASSERT_EQ(actual_scores.size(), 1);
+  EXPECT_NEAR(actual_scores[0], 0.9F, 1e-5);
+  EXPECT_EQ(actual_classes, std::vector<int32_t>{ 0 });
+  //  min-area rect of pixels 10..49 x 10..19 is 39x9 centred at (29.5, 14.5),
+  //  unclip distance = 39 * 9 * 1.5 / 96 ~= 5.48
+  ASSERT_EQ(actual_boxes.size(), 4);
+  EXPECT_NEAR(actual_boxes[0], 2 * (29.5 - 19.5 - 5.48), 2);
+  EXPECT_NEAR(actual_boxes[1], 2 * (14.5 - 4.5 - 5.48), 2);
+  EXPECT_NEAR(actual_boxes[2], 2 * (29.5 + 19.5 + 5.48), 2);
+  EXPECT_NEAR(actual_boxes[3], 2 * (14.5 + 4.5 + 5.48), 2);
+}
+
+TEST(dbnet_decode, oriented_output_is_obb_meta)
+{
+  std::unordered_map<std::string, std::string> properties = {
+    { "meta_key", "text" },
+    { "model_width", "64" },
+    { "model_height", "64" },
+    { "oriented", "1" },
+  };
+  auto decoder = Ax::LoadDecode("dbnet", properties);
+  auto prob = map_with_rect(10, 10, 50, 20, 0.9F);
+  AxVideoInterface video_info{ { 64, 64, 64, 0, AxVideoFormat::RGB }, nullptr };
+  std::unordered_map<std::string, std::unique_ptr<AxMetaBase>> map{};
+  auto tensors = tensors_from_vector(prob, { 1, 1, 64, 64 });
+  decoder->decode_to_meta(tensors, 0, 1, map, video_info);
+
+  auto position = map.find("text");
+  ASSERT_NE(position, map.end());
+  auto *meta = position->second.get();
+  EXPECT_EQ(typeid(*meta), typeid(AxMetaObjDetectionOBB));
+}
+
+TEST(dbnet_decode, int8_map_is_dequantized)
+{
+  std::unordered_map<std::string, std::string> properties = {
+    { "meta_key", "text" },
+    { "model_width", "64" },
+    { "model_height", "64" },
+    { "zero_points", "-128" },
+    { "scales", "0.00392156" },
+  };
+  auto decoder = Ax::LoadDecode("dbnet", properties);
+  std::vector<int8_t> prob(64 * 64, -128);
+  for (int y = 10; y != 20; ++y) {
+    for (int x = 10; x != 50; ++x) {
+      prob[y * 64 + x] = 101; //  (101 + 128) / 255 ~= 0.9
+    }
+  }
+  AxVideoInterface video_info{ { 64, 64, 64, 0, AxVideoFormat::RGB }, nullptr };
+  std::unordered_map<std::string, std::unique_ptr<AxMetaBase>> map{};
+  auto tensors = tensors_from_vector(prob, { 1, 64, 64, 1 });
+  decoder->decode_to_meta(tensors, 0, 1, map, video_info);
+
+  auto [actual_boxes, actual_scores, actual_classes] = get_meta(map, "text");
+  ASSERT_EQ(actual_scores.size(), 1);
+  EXPECT_NEAR(actual_scores[0], 0.9F, 1e-2);
+}
@@ -0,0 +1,163 @@
+# Copyright Axelera AI, 2025
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+import pytest
+
+from ax_models.decoders import dbnet
+from axelera import types
+from axelera.app import meta
+
+
+def _map_with_rect(x1, y1, x2, y2, value, size=64):
+    prob = np.zeros((size, size), np.float32)
+    prob[y1:y2, x1:x2] = value
+    return prob
+
+
+def _make_decoder(**kwargs):
+    decoder = dbnet.DecodeDBNet(**kwargs)
+    decoder._where = ''
+    decoder.task_name = 'text_detection'
+    decoder.model_width = 64
+    decoder.model_height = 64
+    decoder.scaled = types.ResizeMode.STRETCH
+    decoder.labels = ['text']
+    return decoder
+
+
+def test_decode_db_map_empty():
+    quads, scores = dbnet.decode_db_map(np.zeros((64, 64), np.float32))
+    assert quads.shape == (0, 8)
+    assert scores.shape == (0,)
+
+
+def test_decode_db_map_unclips_text_line():
+    quads, scores = dbnet.decode_db_map(_map_with_rect(10, 10, 50, 20, 0.9), unclip_ratio=1.5)
+    # min-area rect of pixels 10..49 x 10..19 is 39x9 centred at (29.5, 14.5)
+    d = 39 * 9 * 1.5 / (2 * (39 + 9))
+    x1, y1, x2, y2 = 29.5 - 19.5 - d, 14.5 - 4.5 - d, 29.5 + 19.5 + d, 14.5 + 4.5 + d
+    np.testing.assert_allclose(quads, [[x1, y1, x2, y1, x2, y2, x1, y2]], atol=1e-3)
+    np.testing.assert_allclose(scores, [0.9], atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    'kwargs',
+    [
+        {'box_threshold': 0.95},  # mean probability too low
+        {'min_size': 20},  # short side too small
+        {'bin_threshold': 0.95},  # nothing above threshold
+    ],
+)
+def test_decode_db_map_filters(kwargs):
+    quads, scores = dbnet.decode_db_map(_map_with_rect(10, 10, 50, 20, 0.9), **kwargs)
+    assert len(quads) == len(scores) == 0
+
+
+def test_decode_db_map_rotated_quad_is_clockwise_from_top_left():
+    prob = np.zeros((640, 640), np.float32)
+    corners = cv2.boxPoints(((300, 300), (200, 30), 30)).astype(np.int32)
+    cv2.fillPoly(prob, [corners], 0.8)
+    quads, _scores = dbnet.decode_db_map(prob)
+    assert len(quads) == 1
+    quad = quads[0].reshape(4, 2)
+    tl, tr, br, bl = quad
+    assert tl[0] < tr[0] and bl[0] < br[0]
+    assert tl[1] < bl[1] and tr[1] < br[1]
+    # positive signed area in image coordinates means clockwise on screen
+    x, y = quad[:, 0], quad[:, 1]
+    assert np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)) > 0
+    np.testing.assert_allclose(quad.mean(axis=0), [300, 300], atol=1.5)
+
+
+def test_decode_db_map_finds_region_nested_in_hole():
+    prob = np.zeros((64, 64), np.float32)
+    prob[4:60, 4:60] = 0.9
+    prob[14:50, 14:50] = 0.0
+    prob[28:36, 20:44] = 0.8
+    quads, scores = dbnet.decode_db_map(prob, unclip_ratio=0.1)
+    # the frame and the nested line, but no region for the hole of the frame
+    assert len(quads) == 2
+    np.testing.assert_allclose(sorted(scores), [0.8, 0.9], atol=1e-6)
+    nested = quads[np.argmin(scores)].reshape(4, 2)
+    assert nested[:, 0].min() > 14 and nested[:, 0].max() < 50
+
+
+def test_decode_db_map_clips_quads_to_map():
+    quads, _ = dbnet.decode_db_map(_map_with_rect(0, 0, 30, 10, 0.9), unclip_ratio=2.0)
+    assert len(quads) == 1
+    assert quads.min() == 0.0
+    assert quads[0, 0::2].max() <= 64 and quads[0, 1::2].max() <= 64
+
+
+def test_decode_db_map_max_candidates():
+    prob = np.zeros((64, 64), np.float32)
+    for y in range(0, 60, 10):
+        prob[y : y + 6, 5:40] = 0.9
+    quads, _ = dbnet.decode_db_map(prob, unclip_ratio=0.1, max_candidates=3)
+    assert len(quads) == 3
+
+
+@pytest.mark.parametrize(
+    'kwargs, error',
+    [
+        ({'bin_threshold': 0.0}, 'bin_threshold'),
+        ({'bin_threshold': 1.0}, 'bin_threshold'),
+        ({'unclip_ratio': 0}, 'unclip_ratio'),
+    ],
+)
+def test_decode_dbnet_invalid_params(kwargs, error):
+    with pytest.raises(ValueError, match=error):
+        dbnet.DecodeDBNet(**kwargs)
+
+
+def test_decode_dbnet_exec_torch_axis_aligned_scaled_to_image():
+    torch = pytest.importorskip("torch")
+    decoder = _make_decoder()
+    image = MagicMock()
+    image.size = (128, 256)
+    predict = torch.from_numpy(_map_with_rect(10, 10, 50, 20, 0.9)[None, None])
+    axmeta = meta.AxMeta('id')
+
+    image, predict, axmeta = decoder.exec_torch(image, predict, axmeta)
+    text = axmeta['text_detection']
+    assert isinstance(text, meta.ObjectDetectionMeta)
+    d = 39 * 9 * 1.5 / (2 * (39 + 9))
+    expected = [(10 - d) * 2, (10 - d) * 4, (49 + d) * 2, (19 + d) * 4]
+    np.testing.assert_allclose(text.boxes, [expected], atol=1e-3)
+    np.testing.assert_allclose(text.scores, [0.9], atol=1e-6)
+    np.testing.assert_array_equal(text.class_ids, [0])
+
+
+def test_decode_dbnet_exec_torch_oriented():
+    decoder = _make_decoder(oriented=True)
+    image = MagicMock()
+    image.size = (64, 64)
+    predict = _map_with_rect(10, 10, 50, 20, 0.9)[None, None]
+    axmeta = meta.AxMeta('id')
+
+    image, predict, axmeta = decoder.exec_torch(image, predict, axmeta)
+    text = axmeta['text_detection']
+    assert isinstance(text, meta.ObjectDetectionMetaOBB)
+    assert text.boxes.shape == (1, 8)
+
+
+def test_decode_dbnet_exec_torch_no_text():
+    decoder = _make_decoder()
+    image = MagicMock()
+    image.size = (64, 64)
+    axmeta = meta.AxMeta('id')
+
+    image, _predict, axmeta = decoder.exec_torch(
+        image, np.zeros((1, 1, 64, 64), np.float32), axmeta
+    )
+    assert len(axmeta['text_detection']) == 0
+
+
+def test_decode_dbnet_exec_torch_rejects_multi_channel():
+    decoder = _make_decoder()
+    image = MagicMock()
+    image.size = (64, 64)
+    with pytest.raises(ValueError, match='single-channel'):
+        decoder.exec_torch(image, np.zeros((1, 2, 64, 64), np.float32), meta.AxMeta('id'))
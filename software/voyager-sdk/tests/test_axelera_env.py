@@ -124,6 +124,19 @@ def test_rtsp_protocol():
     assert get(rtsp_protocol='all').rtsp_protocol == 'all'
 
 
+def test_appsink_queue():
+    assert get().appsink_queue_size == 4
+    assert get(appsink_queue_size='1').appsink_queue_size == 1
+    assert get().appsink_drop_oldest is False
+    assert get(appsink_drop_oldest='1').appsink_drop_oldest is True
+
+
+def test_torch_roi_batch_size():
+    assert get().torch_roi_batch_size == 16
+    assert get(torch_roi_batch_size='1').torch_roi_batch_size == 1
+    assert get(torch_roi_batch_size='64').torch_roi_batch_size == 64
+
+
 def test_help():
     assert get().help == False
     assert get(help='1').help == True
@@ -1,15 +1,19 @@
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+from axelera import types
 from axelera.types import Manifest, ModelInfo, OutputInfo
 import numpy as np
 import pytest
 
 from axelera.app.operators.inference import (
+    Inference,
     InferenceOpConfig,
     _match_arrays_to_shapes,
     _reshape_to_target_shapes,
+    _split_batch,
 )
+from axelera.app.torch_utils import torch
 
 
 class TestArrayShapeMatching:
@@ -186,6 +190,103 @@ class TestScalarOutputHelper:
         assert not config._is_scalar_output([1, 16, 224, 224, 3])  # 5D video
 
 
+class TestSplitBatch:
+    """Tests for the _split_batch helper used to batch the ROIs of cascade tasks."""
+
+    def test_split_single_output(self):
+        """Test that a batched tensor is split into batch size 1 tensors, in order."""
+        outputs = torch.arange(12).reshape(3, 4)
+        split = _split_batch(outputs, 3)
+        assert len(split) == 3
+        for i, out in enumerate(split):
+            assert out.shape == (1, 4)
+            assert torch.equal(out, outputs[i : i + 1])
+
+    def test_split_multiple_outputs(self):
+        """Test that every output of a multi-output model is split."""
+        outputs = [torch.zeros(2, 5), torch.ones(2, 3, 7)]
+        split = _split_batch(outputs, 2)
+        assert len(split) == 2
+        for out in split:
+            assert isinstance(out, list)
+            assert [tuple(t.shape) for t in out] == [(1, 5), (1, 3, 7)]
+
+    def test_unsplittable_outputs(self):
+        """Test that outputs without a batch dimension are not split."""
+        assert _split_batch(torch.zeros(4, 5), 3) is None
+        assert _split_batch([torch.zeros(3, 5), torch.zeros(1, 5)], 3) is None
+        assert _split_batch(torch.tensor(1.0), 1) is None
+        assert _split_batch([], 2) is None
+
+
+class _StubOnnxSession:
+    """ONNX session whose output is the sum of each input, with or without a batch dimension."""
+
+    def __init__(self, batch, batched_outputs=True):
+        self.batch = batch
+        self.batched_outputs = batched_outputs
+        self.calls = []
+
+    def get_inputs(self):
+        return [Mock(shape=[self.batch, 3, 4, 4])]
+
+    def run(self, output_names, inputs):
+        (array,) = inputs.values()
+        self.calls.append(len(array))
+        if self.batched_outputs:
+            return [array.reshape(len(array), -1).sum(axis=1, keepdims=True)]
+        return [np.array([array.sum()])]
+
+
+class TestExecTorchBatch:
+    """Tests for Inference.exec_torch_batch, which stacks the ROIs of a cascade task."""
+
+    def create_inference(self, session):
+        inference = Inference.__new__(Inference)
+        inference.model_name = 'stub'
+        inference.model = Mock(spec=types.ONNXModel)
+        inference.model_info = Mock(input_tensor_layout=types.TensorLayout.NCHW)
+        inference.ort_sess = session
+        inference.input_names = ['input']
+        inference.output_names = ['output']
+        inference.pre_ort_sess = inference.post_ort_sess = None
+        inference._permute_op = None
+        inference._batch_capacity = None
+        return inference
+
+    def rois(self, *shapes):
+        return [torch.full(shape, float(n + 1)) for n, shape in enumerate(shapes)]
+
+    def test_groups_inputs_by_shape(self):
+        """Test that only inputs of the same shape are stacked, max_batch at a time."""
+        session = _StubOnnxSession('batch')
+        rois = self.rois((3, 4, 4), (3, 2, 2), (3, 4, 4), (3, 2, 2), (3, 4, 4))
+        outputs = self.create_inference(session).exec_torch_batch(None, rois, None, 2)
+        assert session.calls == [2, 1, 2]
+        assert [out.shape for out in outputs] == [(1, 1)] * 5
+        assert [out.item() for out in outputs] == [roi.sum().item() for roi in rois]
+
+    def test_zero_pads_to_fixed_batch(self):
+        """Test that a partial batch is zero padded to the fixed batch size of the model."""
+        session = _StubOnnxSession(4)
+        rois = self.rois((3, 4, 4), (3, 4, 4), (3, 4, 4))
+        outputs = self.create_inference(session).exec_torch_batch(None, rois, None, 16)
+        assert session.calls == [4]
+        assert [out.item() for out in outputs] == [roi.sum().item() for roi in rois]
+
+    def test_falls_back_to_single_inputs_without_batch_dimension(self):
+        """Test that inputs are inferenced one at a time if the outputs cannot be split."""
+        session = _StubOnnxSession('batch', batched_outputs=False)
+        inference = self.create_inference(session)
+        rois = self.rois((3, 4, 4), (3, 4, 4), (3, 4, 4))
+        outputs = inference.exec_torch_batch(None, rois, None, 16)
+        assert session.calls == [3, 1, 1, 1]
+        assert [out.item() for out in outputs] == [roi.sum().item() for roi in rois]
+        # the model is not batched again
+        inference.exec_torch_batch(None, rois, None, 16)
+        assert session.calls == [3, 1, 1, 1, 1, 1, 1]
+
+
 class TestTransposeLogic:
     """Tests for the improved transpose logic using OutputInfo."""
 
@@ -11,6 +11,7 @@ from axelera.app.meta import (
     TrackerMeta,
 )
 from axelera.app.pipe import FrameResult
+from axelera.app.pipe.frame_data import LazyTensor
 
 
 @pytest.mark.parametrize(
@@ -46,3 +47,44 @@ def test_frame_result_getattr_multiple_unique():
     assert not hasattr(result, "keypoint_detections")
     assert not hasattr(result, "pair_validations")
     assert not hasattr(result, "tracked_objects")
+
+
+def test_frame_result_tensor_is_lazy_readonly_view():
+    torch = pytest.importorskip("torch")
+    output = torch.arange(6, dtype=torch.float32).reshape(1, 2, 3)
+    result = FrameResult(tensor=LazyTensor(output))
+    assert isinstance(result._tensor, LazyTensor)
+    tensor = result.tensor
+    assert tensor.shape == (2, 3)
+    assert not tensor.flags.writeable
+    assert np.shares_memory(tensor, output.numpy())
+    assert result.tensor is tensor
+    with pytest.raises(ValueError):
+        tensor[0, 0] = 1.0
+
+
+def test_frame_result_tensor_materialize_copy():
+    outputs = [np.zeros((1, 4)), np.ones((1, 2))]
+    tensor = LazyTensor(outputs).materialize(copy=True)
+    assert isinstance(tensor, list) and len(tensor) == 2
+    assert all(t.flags.writeable for t in tensor)
+    assert not any(np.shares_memory(t, o) for t, o in zip(tensor, outputs))
+
+
+def test_frame_result_tensor_plain_array():
+    array = np.zeros((3, 4))
+    assert FrameResult(tensor=array).tensor is array
+    assert FrameResult().tensor is None
+
+
+def test_frame_result_replace_and_asdict_keep_tensor():
+    import dataclasses
+
+    array = np.zeros((3, 4))
+    result = FrameResult(None, array, None, 2)
+    copy = dataclasses.replace(result, stream_id=3)
+    assert copy.tensor is array and copy.stream_id == 3
+    assert dataclasses.replace(result, tensor=None).tensor is array
+    other = np.ones(2)
+    assert dataclasses.replace(result, tensor=other).tensor is other
+    assert dataclasses.asdict(result)['_tensor'] is not None
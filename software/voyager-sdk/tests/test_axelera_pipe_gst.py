@@ -199,6 +199,133 @@ def test_handle_pair_validation():
         )
 
 
+@pytest.mark.parametrize(
+    'format, width, channels',
+    [('RGB', 8, 3), ('RGB', 5, 3), ('GRAY8', 6, 1), ('RGBA', 5, 4)],
+)
+def test_copy_to_buffer_honours_stride(format, width, channels):
+    import numpy as np
+
+    # isort: off
+    from gi.repository import GstVideo
+
+    # isort: on
+
+    if not Gst.is_initialized():
+        Gst.init(None)
+    height = 3
+    info = GstVideo.VideoInfo()
+    info.set_format(GstVideo.VideoFormat.from_string(format), width, height)
+    shape = (height, width, channels) if channels > 1 else (height, width)
+    image = np.arange(np.prod(shape), dtype=np.uint8).reshape(shape)
+    buffer = Gst.Buffer.new_allocate(None, info.size, None)
+    gst._copy_to_buffer(buffer, image, info)
+    data = np.frombuffer(buffer.extract_dup(0, info.size), np.uint8)
+    rows = data[info.offset[0] :].reshape(height, info.stride[0])[:, : width * channels]
+    np.testing.assert_array_equal(rows, image.reshape(height, -1))
+
+
+def test_sample_queue_round_robin():
+    q = gst._SampleQueue(4, drop_oldest=False)
+    for n in range(3):
+        q.put(0, f'a{n}')
+    q.put(1, 'b0')
+    q.put(2, 'c0')
+    got = [q.get(0) for _ in range(5)]
+    assert got == [(0, 'a0', []), (1, 'b0', []), (2, 'c0', []), (0, 'a1', []), (0, 'a2', [])]
+    assert q.get(0) is None
+
+
+def test_sample_queue_drop_oldest():
+    q = gst._SampleQueue(2, drop_oldest=True, on_drop=lambda sid, s: f'{sid}:{s}')
+    for n in range(4):
+        assert q.put(0, n)
+    q.put(1, 'b0')
+    assert q.dropped == 2
+    assert [q.get(0), q.get(0), q.get(0), q.get(0)] == [
+        (0, 2, ['0:0', '0:1']),
+        (1, 'b0', []),
+        (0, 3, []),
+        None,
+    ]
+
+
+def test_stream_image_ids_follow_dropped_samples():
+    import queue
+    from unittest.mock import MagicMock
+
+    # the source queues an image id per frame, a dropped frame's id must be skipped by the
+    # consumer, even when the drop happens while the previous sample is being processed
+    stream = object.__new__(gst.GstStream)
+    stream.stream_meta_key = 'stream_id'
+    stream.decoder = MagicMock()
+    stream.decoder.extract_all_meta.side_effect = lambda buf: {'stream_id': (buf, 0, 0)}
+    stream._handlers = {}
+    for sid in (0, 1):
+        stream._handlers[sid] = MagicMock()
+        ids = queue.Queue()
+        for n in range(5):
+            ids.put((f'{sid}-{n}', None))
+        stream._handlers[sid].get.side_effect = ids.get_nowait
+    stream._samples = gst._SampleQueue(2, True, stream._dropped_stream_id)
+
+    def sample(sid):
+        s = MagicMock()
+        s.get_buffer.return_value = sid  # the buffer carries the source stream id
+        return s
+
+    def frame_id(item):
+        stream_id, s, drops = item
+        with patch.object(gst.types.Image, 'fromgst'):
+            event, _ = stream._frame_from_sample(s, stream_id, drops)
+        return event.result.meta.image_id
+
+    # two muxed streams share appsink 0, their stream ids are in the buffer meta
+    stream._samples.put(0, sample(0))
+    stream._samples.put(0, sample(1))
+    first = stream._samples.get(0)  # dequeued, but not yet paired with its image id
+    stream._samples.put(0, sample(0))
+    stream._samples.put(0, sample(0))  # drops the frame of stream 1
+    assert stream._samples.dropped == 1
+    assert frame_id(first) == '0-0'
+    assert frame_id(stream._samples.get(0)) == '0-1'
+    assert frame_id(stream._samples.get(0)) == '0-2'
+    stream._samples.put(0, sample(1))
+    assert frame_id(stream._samples.get(0)) == '1-1'
+    assert stream._samples.get(0) is None
+
+
+def test_sample_queue_blocks_when_full():
+    import threading
+
+    q = gst._SampleQueue(1, drop_oldest=False)
+    q.put(0, 'first')
+    t = threading.Thread(target=q.put, args=(0, 'second'))
+    t.start()
+    t.join(0.05)
+    assert t.is_alive()
+    assert q.get(0) == (0, 'first', [])
+    t.join(1)
+    assert not t.is_alive()
+    assert q.get(0) == (0, 'second', [])
+
+
+def test_sample_queue_wake_and_close():
+    import threading
+
+    q = gst._SampleQueue(1, drop_oldest=False)
+    threading.Timer(0.01, q.wake).start()
+    assert q.get(5) is None
+    q.put(0, 'first')
+    t = threading.Thread(target=q.put, args=(0, 'second'))
+    t.start()
+    q.close()
+    t.join(1)
+    assert not t.is_alive()
+    assert q.get(0) is None
+    assert not q.put(0, 'third')
+
+
 def test_gstpipe_loop_with_pair_validation():
     """Test the _loop method's handling of pair validation within GstPipe."""
     from unittest.mock import MagicMock, patch
@@ -169,7 +169,6 @@ class TestBBoxState:
 
     # Tests that the nms method correctly performs class-based NMS and select the highest score
     def test_nms_with_class_based(self):
-        pytest.importorskip('torchvision')
         boxes = np.array(
             [
                 [10, 10, 50, 50],
@@ -210,7 +209,6 @@ class TestBBoxState:
 
     # Tests that the nms with nms_class_agnostic as True
     def test_nms_with_class_agnostic(self):
-        pytest.importorskip('torchvision')
         bbox_state = BBoxState(
             model_width=416,
             model_height=416,
@@ -241,7 +239,6 @@ class TestBBoxState:
         # Tests that non-maximum suppression is correctly applied with the specified output_top_k value, keeping only the top k boxes with the highest scores.
 
     def test_nms_with_nms_topk(self):
-        pytest.importorskip('torchvision')
         # Create a BBoxState object with some initial values
         bbox_state = BBoxState(
             model_width=416,
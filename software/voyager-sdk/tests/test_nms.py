@@ -0,0 +1,121 @@
+# Copyright Axelera AI, 2025
+import numpy as np
+import pytest
+
+from axelera.app.model_utils.nms import nms, soft_nms
+
+BOXES = np.array(
+    [
+        [10, 10, 50, 50],
+        [12, 12, 52, 52],
+        [100, 100, 150, 150],
+        [14, 14, 54, 54],
+        [104, 104, 154, 154],
+    ],
+    dtype=np.float64,
+)
+SCORES = np.array([0.9, 0.8, 0.7, 0.6, 0.5])
+
+
+def _random_boxes(n, num_classes, seed=0):
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0, 640, (n, 2))
+    wh = rng.uniform(10, 200, (n, 2))
+    boxes = np.concatenate([xy, xy + wh], axis=1)
+    return boxes, rng.uniform(0, 1, n), rng.integers(0, num_classes, n)
+
+
+def _reference_nms(boxes, scores, iou_threshold, class_ids=None):
+    '''Straightforward per-class greedy NMS to compare against.'''
+    area = lambda b: (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    keep = []
+    classes = np.zeros(len(boxes), int) if class_ids is None else class_ids
+    for c in np.unique(classes):
+        idx = np.flatnonzero(classes == c)
+        idx = idx[np.argsort(-scores[idx], kind='stable')]
+        while idx.size:
+            i, idx = idx[0], idx[1:]
+            keep.append(i)
+            x1 = np.maximum(boxes[i, 0], boxes[idx, 0])
+            y1 = np.maximum(boxes[i, 1], boxes[idx, 1])
+            x2 = np.minimum(boxes[i, 2], boxes[idx, 2])
+            y2 = np.minimum(boxes[i, 3], boxes[idx, 3])
+            inter = np.maximum(x2 - x1, 0) * np.maximum(y2 - y1, 0)
+            idx = idx[inter / (area(boxes[i]) + area(boxes[idx]) - inter) <= iou_threshold]
+    keep = np.array(keep, dtype=np.int64)
+    return keep[np.argsort(-scores[keep], kind='stable')]
+
+
+def test_nms_class_agnostic():
+    np.testing.assert_array_equal(nms(BOXES, SCORES, 0.5), [0, 2])
+
+
+def test_nms_class_aware():
+    class_ids = np.array([0, 1, 0, 0, 0])
+    np.testing.assert_array_equal(nms(BOXES, SCORES, 0.5, class_ids), [0, 1, 2])
+
+
+def test_nms_top_k():
+    np.testing.assert_array_equal(nms(BOXES, SCORES, 0.5, top_k=1), [0])
+
+
+def test_nms_empty():
+    assert nms(np.empty((0, 4)), np.empty(0), 0.5).shape == (0,)
+    keep, scores = soft_nms(np.empty((0, 4)), np.empty(0), 0.5)
+    assert keep.shape == scores.shape == (0,)
+
+
+@pytest.mark.parametrize('class_aware', [False, True])
+def test_nms_matches_reference(class_aware):
+    boxes, scores, class_ids = _random_boxes(2000, 20)
+    class_ids = class_ids if class_aware else None
+    expected = _reference_nms(boxes, scores, 0.45, class_ids)
+    np.testing.assert_array_equal(nms(boxes, scores, 0.45, class_ids), expected)
+    np.testing.assert_array_equal(nms(boxes, scores, 0.45, class_ids, top_k=50), expected[:50])
+
+
+def test_nms_diou():
+    # IoU 0.54, less the centre distance penalty 0.03 for DIoU
+    boxes = np.array([[0, 0, 10, 10], [3, 0, 13, 10]], dtype=np.float64)
+    scores = np.array([0.9, 0.8])
+    np.testing.assert_array_equal(nms(boxes, scores, 0.52), [0])
+    np.testing.assert_array_equal(nms(boxes, scores, 0.52, iou_type='diou'), [0, 1])
+    np.testing.assert_array_equal(nms(boxes, scores, 0.5, iou_type='diou'), [0])
+
+
+def test_nms_probiou():
+    boxes = np.array([[30, 30, 40, 20, 0.0], [31, 30, 40, 20, 0.05], [200, 200, 40, 20, 0.0]])
+    scores = np.array([0.9, 0.8, 0.7])
+    np.testing.assert_array_equal(nms(boxes, scores, 0.5, iou_type='probiou'), [0, 2])
+    np.testing.assert_array_equal(
+        nms(boxes, scores, 0.5, np.array([0, 1, 0]), iou_type='probiou'), [0, 1, 2]
+    )
+
+
+def test_nms_invalid_arguments():
+    with pytest.raises(ValueError, match='Unsupported IoU type'):
+        nms(BOXES, SCORES, 0.5, iou_type='giou')
+    with pytest.raises(ValueError, match=r'\(N, 5\) boxes'):
+        nms(BOXES, SCORES, 0.5, iou_type='probiou')
+    with pytest.raises(ValueError, match='Shapes do not match'):
+        nms(BOXES, SCORES[:3], 0.5)
+    with pytest.raises(ValueError, match='Unsupported soft-NMS method'):
+        soft_nms(BOXES, SCORES, 0.5, method='hard')
+
+
+@pytest.mark.parametrize('method', ['linear', 'gaussian'])
+def test_soft_nms_decays_overlapping_scores(method):
+    keep, scores = soft_nms(BOXES, SCORES, 0.5, method=method)
+    assert sorted(keep) == [0, 1, 2, 3, 4]
+    assert keep[0] == 0 and scores[0] == SCORES[0]
+    assert np.all(np.diff(scores) <= 0)
+    decayed = dict(zip(keep, scores))
+    assert decayed[1] < SCORES[1] and decayed[3] < SCORES[3]
+    assert decayed[2] == SCORES[2]
+
+
+def test_soft_nms_score_threshold_and_top_k():
+    keep, scores = soft_nms(BOXES, SCORES, 0.5, method='linear', score_threshold=0.4)
+    assert np.all(scores > 0.4)
+    keep, _ = soft_nms(BOXES, SCORES, 0.5, top_k=2)
+    assert len(keep) == 2
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# Copyright Axelera AI, 2025
+# Benchmark the NumPy NMS used by host side postprocessing
+# Usage:
+#   tools/benchmark_nms.py
+#   tools/benchmark_nms.py --boxes 1000,10000,30000 --classes 80 --top-k 300
+
+import argparse
+import functools
+import importlib.util
+import time
+
+import numpy as np
+
+from axelera.app.model_utils.nms import nms, soft_nms
+
+
+def random_boxes(n, num_classes, seed=0):
+    '''Boxes, scores and class ids sorted by descending score, as BBoxState holds them.'''
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0, 640, (n, 2))
+    wh = rng.uniform(10, 200, (n, 2))
+    boxes = np.concatenate([xy, xy + wh], axis=1)
+    scores = rng.uniform(0, 1, n)
+    order = np.argsort(-scores, kind='stable')
+    return boxes[order], scores[order], rng.integers(0, num_classes, n)
+
+
+def torchvision_nms(boxes, scores, iou_threshold, class_ids, top_k):
+    '''The previous BBoxState.nms: torchvision NMS once per class.'''
+    import torch
+    from torchvision import ops
+
+    tboxes = torch.tensor(boxes).float()
+    tscores = torch.tensor(scores).float()
+    if class_ids is None:
+        return ops.nms(tboxes, tscores, iou_threshold).numpy()[:top_k]
+    final_indices = []
+    classes = torch.tensor(class_ids)
+    for cls_id in torch.unique(classes):
+        cls_mask = classes == cls_id
+        keep = ops.nms(tboxes[cls_mask], tscores[cls_mask], iou_threshold)
+        final_indices.extend(cls_mask.nonzero().squeeze(-1)[keep].tolist())
+    return torch.unique(torch.tensor(final_indices)).numpy()[:top_k]
+
+
+def bench(fn, rounds):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return result, (time.perf_counter() - start) / rounds * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark host side NMS")
+    parser.add_argument('--boxes', default='1000,10000,30000', help="Candidate box counts")
+    parser.add_argument('--classes', type=int, default=80, help="Number of classes")
+    parser.add_argument('--iou', type=float, default=0.45, help="IoU threshold")
+    parser.add_argument('--top-k', type=int, default=300, help="Maximum boxes kept")
+    parser.add_argument('--rounds', type=int, default=5, help="Timed rounds")
+    args = parser.parse_args()
+
+    has_torchvision = importlib.util.find_spec('torchvision') is not None
+    if not has_torchvision:
+        print("torchvision is not installed, only the NumPy NMS is timed")
+
+    print(f"{'boxes':>6} {'mode':<12} {'numpy ms':>9} {'torchvision ms':>15} {'same':>5}")
+    mismatches = 0
+    for n in [int(x) for x in args.boxes.split(',')]:
+        boxes, scores, class_ids = random_boxes(n, args.classes)
+        for mode, classes in (('per-class', class_ids), ('agnostic', None)):
+            keep, ms = bench(
+                functools.partial(nms, boxes, scores, args.iou, classes, args.top_k), args.rounds
+            )
+            ref_ms, same = '', ''
+            if has_torchvision:
+                ref, ref_ms = bench(
+                    functools.partial(
+                        torchvision_nms, boxes, scores, args.iou, classes, args.top_k
+                    ),
+                    args.rounds,
+                )
+                # torchvision works in float32, so a box exactly at the threshold may differ
+                same = 'yes' if np.array_equal(np.sort(keep), np.sort(ref)) else 'no'
+                mismatches += same == 'no'
+                ref_ms = f'{ref_ms:.2f}'
+            print(f"{n:>6} {mode:<12} {ms:>9.2f} {ref_ms:>15} {same:>5}")
+        for mode, fn in (
+            (
+                'diou',
+                functools.partial(nms, boxes, scores, args.iou, class_ids, args.top_k, 'diou'),
+            ),
+            (
+                'soft-nms',
+                functools.partial(soft_nms, boxes, scores, args.iou, class_ids, args.top_k),
+            ),
+        ):
+            _, ms = bench(fn, args.rounds)
+            print(f"{n:>6} {mode:<12} {ms:>9.2f}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())